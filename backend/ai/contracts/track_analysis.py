@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from enum import Enum
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class AnalysisStatus(str, Enum):
@@ -52,19 +52,24 @@ class TrackAnalysisRequest(BaseModel):
 
 
 class TrackAnalysis(BaseModel):
+    # Results are frozen so caches can hand out the stored instance without copying it.
+    model_config = ConfigDict(frozen=True)
+
     genre: str
     mood: TrackMood
     energy_level: int = Field(ge=1, le=10)
     danceability: int = Field(ge=1, le=10)
     bpm_estimate: int = Field(ge=40, le=220)
     vocal_style: VocalStyle
-    best_for_time: list[str]
-    tags: list[str] = Field(default_factory=list)
+    best_for_time: tuple[str, ...]
+    tags: tuple[str, ...] = ()
     confidence_score: float = Field(ge=0.0, le=1.0)
     reasoning: str
     status: AnalysisStatus = AnalysisStatus.SUCCESS
 
 
 class TrackAnalysisResult(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     track_id: str
     analysis: TrackAnalysis
@@ -14,12 +14,17 @@ from backend.ai_service import (
     AICircuitOpenError,
     AIServiceError,
     HostScriptRequest,
+    TrackAnalysisBatchRequest,
+    TrackAnalysisBatchResponse,
 )
 from backend.security.auth import verify_api_key
 from backend.track_analysis_api import (
     LEGACY_TRACK_ANALYSIS_DEPRECATION,
     LEGACY_TRACK_ANALYSIS_WARNING,
+    TrackAnalysisCacheMetrics,
+    get_track_analysis_service,
 )
+from backend.track_analysis_service import TrackAnalysisService
 
 router = APIRouter(prefix="/api/v1/ai", tags=["ai"])
 _service = AIInferenceService()
@@ -119,17 +124,15 @@ def get_legacy_analyze_track_telemetry() -> dict[str, str | int | None]:
     return _legacy_route_telemetry.snapshot()
 
 
-def _run_track_analysis(request: TrackAnalysisRequest, correlation_id: str) -> AIResponseEnvelope:
+async def _run_track_analysis(request: TrackAnalysisRequest, correlation_id: str) -> AIResponseEnvelope:
     try:
-        result, latency_ms, cost_usd, cache_hit, status_value, prompt_profile_version = _service.analyze_track(
-            request,
-            correlation_id,
-        )
+        outcome = await _service.analyze_track_async(request, correlation_id)
     except AICircuitOpenError as exc:
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)) from exc
     except AIServiceError as exc:
         raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
 
+    result, latency_ms, cost_usd, cache_hit, status_value, prompt_profile_version = outcome
     return AIResponseEnvelope(
         success=True,
         status=status_value,
@@ -144,7 +147,7 @@ def _run_track_analysis(request: TrackAnalysisRequest, correlation_id: str) -> A
 
 
 @router.post("/track-analysis", response_model=AIResponseEnvelope)
-def analyze_track(
+async def analyze_track(
     request: TrackAnalysisRequest,
     response: Response,
     _: str = Depends(verify_api_key),
@@ -152,11 +155,95 @@ def analyze_track(
 ) -> AIResponseEnvelope:
     correlation_id = _resolve_correlation_id(x_correlation_id)
     response.headers["X-Correlation-ID"] = correlation_id
-    return _run_track_analysis(request, correlation_id)
+    return await _run_track_analysis(request, correlation_id)
+
+
+@router.get("/inference-metrics")
+def inference_metrics(_: str = Depends(verify_api_key)) -> dict[str, dict[str, int]]:
+    return _service.inference_gauges()
+
+
+@router.get("/inference-latency")
+def inference_latency(_: str = Depends(verify_api_key)) -> dict[str, dict[str, int | None]]:
+    return _service.latency_gauges()
+
+
+@router.get(
+    "/track-analysis/cache-metrics",
+    response_model=TrackAnalysisCacheMetrics,
+    response_model_exclude_none=True,
+)
+def track_analysis_cache_metrics(
+    _: str = Depends(verify_api_key),
+    service: TrackAnalysisService = Depends(get_track_analysis_service),
+) -> TrackAnalysisCacheMetrics:
+    return TrackAnalysisCacheMetrics.from_store_metrics(service.cache_metrics())
+
+
+@router.post("/track-analysis:batch", response_model=TrackAnalysisBatchResponse)
+async def analyze_track_batch(
+    request: TrackAnalysisBatchRequest,
+    response: Response,
+    _: str = Depends(verify_api_key),
+    x_correlation_id: str | None = Header(default=None, alias="X-Correlation-ID"),
+) -> TrackAnalysisBatchResponse:
+    """Analyze up to 200 tracks in one round trip.
+
+    Items are reported individually: a timeout degrades only its own item, and a
+    circuit-open or service error marks only that item ``failed``.
+    """
+    correlation_id = _resolve_correlation_id(x_correlation_id)
+    response.headers["X-Correlation-ID"] = correlation_id
+    prompt_profile_version, outcomes = await _service.analyze_tracks_async(
+        request.items,
+        correlation_id,
+        max_concurrency=request.max_concurrency,
+    )
+
+    items: list[AIResponseEnvelope] = []
+    for index, outcome in enumerate(outcomes):
+        item_correlation_id = f"{correlation_id}:{index}"
+        if isinstance(outcome, AIServiceError):
+            items.append(
+                AIResponseEnvelope(
+                    success=False,
+                    status="failed",
+                    correlation_id=item_correlation_id,
+                    data=None,
+                    error=str(outcome),
+                    latency_ms=0,
+                    cost_usd=0.0,
+                    cache_hit=False,
+                    prompt_profile_version=prompt_profile_version,
+                )
+            )
+            continue
+        result, latency_ms, cost_usd, cache_hit, status_value, _ = outcome
+        items.append(
+            AIResponseEnvelope(
+                success=True,
+                status=status_value,
+                correlation_id=item_correlation_id,
+                data=result,
+                error=None,
+                latency_ms=latency_ms,
+                cost_usd=cost_usd,
+                cache_hit=cache_hit,
+                prompt_profile_version=prompt_profile_version,
+            )
+        )
+
+    failed = sum(1 for item in items if not item.success)
+    return TrackAnalysisBatchResponse(
+        correlation_id=correlation_id,
+        succeeded=len(items) - failed,
+        failed=failed,
+        items=items,
+    )
 
 
 @router.post("/analyze-track", response_model=AIResponseEnvelope, deprecated=True)
-def analyze_track_compat(
+async def analyze_track_compat(
     request: TrackAnalysisRequest,
     response: Response,
     api_key: str = Depends(verify_api_key),
@@ -189,11 +276,11 @@ def analyze_track_compat(
             headers=_legacy_headers(cutoff),
         )
 
-    return _run_track_analysis(request, correlation_id)
+    return await _run_track_analysis(request, correlation_id)
 
 
 @router.post("/host-script", response_model=AIResponseEnvelope)
-def generate_host_script(
+async def generate_host_script(
     request: HostScriptRequest,
     response: Response,
     x_correlation_id: str | None = Header(default=None, alias="X-Correlation-ID"),
@@ -201,7 +288,7 @@ def generate_host_script(
     correlation_id = _resolve_correlation_id(x_correlation_id)
     response.headers["X-Correlation-ID"] = correlation_id
     try:
-        result, latency_ms, cost_usd, status_value, prompt_profile_version = _service.generate_host_script(
+        result, latency_ms, cost_usd, status_value, prompt_profile_version = await _service.generate_host_script_async(
             request,
             correlation_id,
         )
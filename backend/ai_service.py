@@ -1,13 +1,17 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import hashlib
+import math
 import threading
 import time
+from bisect import bisect_left
+from collections import OrderedDict, deque
 from pathlib import Path
 import os
-from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from typing import Any, Literal
 
@@ -22,6 +26,7 @@ from backend.ai.contracts.track_analysis import (
 )
 
 from backend.security.config_crypto import ConfigCryptoError, dump_config_json, load_config_json
+from backend.structured_events import StructuredEventEmitter, get_event_emitter
 
 logger = logging.getLogger(__name__)
 
@@ -50,12 +55,53 @@ class AIResponseEnvelope(BaseModel):
     prompt_profile_version: str
 
 
+class TrackAnalysisBatchRequest(BaseModel):
+    items: list[TrackAnalysisRequest] = Field(min_length=1, max_length=200)
+    max_concurrency: int = Field(default=8, ge=1, le=32)
+
+
+class TrackAnalysisBatchResponse(BaseModel):
+    correlation_id: str
+    succeeded: int = Field(ge=0)
+    failed: int = Field(ge=0)
+    items: list[AIResponseEnvelope]
+
+
 @dataclass
 class _GuardrailPrompts:
     track_analysis: str
     host_script: str
 
 
+@dataclass(frozen=True)
+class _PromptProfileSnapshot:
+    """Canonical prompt profile plus the (mtime_ns, size, inode) of the file it came from."""
+
+    stat_key: tuple[int, int, int] | None
+    version: str
+    serialized: str
+    digest: str
+
+    @classmethod
+    def from_payload(cls, stat_key: tuple[int, int, int] | None, payload: dict[str, Any]) -> _PromptProfileSnapshot:
+        version = str(payload.get("version", "default")).strip() or "default"
+        deterministic_payload = {
+            "version": version,
+            "variable_settings": payload.get("variable_settings", {}),
+            "custom_variables": payload.get("custom_variables", {}),
+        }
+        serialized = json.dumps(deterministic_payload, sort_keys=True, separators=(",", ":"))
+        return cls(
+            stat_key=stat_key,
+            version=version,
+            serialized=serialized,
+            digest=hashlib.sha256(serialized.encode("utf-8")).hexdigest(),
+        )
+
+
+_DEFAULT_PROMPT_VARIABLES_PATH = Path(__file__).parent.parent / "config" / "prompt_variables.json"
+
+
 
 
 class LegacyAITrackAnalysisRequest(BaseModel):
@@ -128,6 +174,304 @@ class AICircuitBreaker:
                 self._opened_at = time.monotonic()
 
 
+class _Bulkhead:
+    """Concurrency limit for one inference mode.
+
+    A permit is held from submission until the worker actually finishes, so
+    calls abandoned after a timeout keep counting against the limit while
+    they are still running instead of letting stuck threads pile up. Sync
+    callers wait on the semaphore; async callers wait on a loop future that
+    ``release`` wakes, so they queue for the same permits without blocking
+    their event loop.
+    """
+
+    def __init__(self, limit: int) -> None:
+        if limit <= 0:
+            raise ValueError("bulkhead limit must be greater than zero")
+        self.limit = limit
+        self._permits = threading.BoundedSemaphore(limit)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._waiting = 0
+        self._abandoned = 0
+        self._rejected = 0
+        self._async_waiters: deque[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+
+    def acquire(self, timeout: float) -> bool:
+        with self._lock:
+            self._waiting += 1
+        acquired = self._permits.acquire(timeout=max(0.0, timeout))
+        with self._lock:
+            self._waiting -= 1
+            if acquired:
+                self._in_flight += 1
+            else:
+                self._rejected += 1
+        return acquired
+
+    async def acquire_async(self, timeout: float) -> bool:
+        """Like ``acquire``, but waits on the running event loop instead of blocking it."""
+        deadline = time.monotonic() + max(0.0, timeout)
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._waiting += 1
+        acquired = False
+        try:
+            while not (acquired := self._permits.acquire(blocking=False)):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    with self._lock:
+                        self._rejected += 1
+                    return False
+                waiter = loop.create_future()
+                with self._lock:
+                    self._async_waiters.append(waiter)
+                # A release between the failed attempt and registering had no waiter to wake.
+                if self._permits.acquire(blocking=False):
+                    self._discard_waiter(waiter)
+                    acquired = True
+                    break
+                try:
+                    await asyncio.wait((waiter,), timeout=remaining)
+                except asyncio.CancelledError:
+                    if self._discard_waiter(waiter):
+                        self._wake_next()
+                    raise
+                self._discard_waiter(waiter)
+            return True
+        finally:
+            with self._lock:
+                self._waiting -= 1
+                if acquired:
+                    self._in_flight += 1
+
+    def try_acquire(self) -> bool:
+        """Take a spare permit without waiting or counting a rejection (used for hedges)."""
+        if not self._permits.acquire(blocking=False):
+            return False
+        with self._lock:
+            self._in_flight += 1
+        return True
+
+    def release(self, _future: Future | None = None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        self._permits.release()
+        self._wake_next()
+
+    def _wake_next(self) -> None:
+        with self._lock:
+            if not self._async_waiters:
+                return
+            waiter = self._async_waiters.popleft()
+        try:
+            waiter.get_loop().call_soon_threadsafe(self._wake, waiter)
+        except RuntimeError:  # its loop is closed; nobody is waiting there any more
+            self._wake_next()
+
+    def _wake(self, waiter: asyncio.Future) -> None:
+        if waiter.done():  # gave up before the wake-up arrived: pass it on
+            self._wake_next()
+        else:
+            waiter.set_result(None)
+
+    def _discard_waiter(self, waiter: asyncio.Future) -> bool:
+        """Unregister ``waiter``; True when a release had already woken it."""
+        with self._lock:
+            if waiter in self._async_waiters:
+                self._async_waiters.remove(waiter)
+        if waiter.done():
+            return not waiter.cancelled()
+        waiter.cancel()
+        return False
+
+    def record_abandoned(self) -> None:
+        with self._lock:
+            self._abandoned += 1
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "in_flight": self._in_flight,
+                "queue_depth": self._waiting,
+                "abandoned": self._abandoned,
+                "rejected": self._rejected,
+            }
+
+
+# Log-spaced from 1 ms to ~72 s in 15% steps; a quantile is reported as its bucket's upper bound.
+_LATENCY_BUCKET_BOUNDS: tuple[float, ...] = tuple(0.001 * 1.15**index for index in range(81))
+_MIN_LATENCY_SAMPLES = 20
+_ADAPTIVE_TIMEOUT_MULTIPLIER = 3.0
+_ADAPTIVE_TIMEOUT_FLOOR_SECONDS = 0.25
+_HEDGE_QUANTILE = 0.95
+_HEDGE_BUDGET_RATIO = 0.1
+
+
+class _LatencyProfile:
+    """Rolling latency histogram and hedge counters for one inference mode.
+
+    Only the last ``window`` successful attempts are kept, so quantiles follow
+    the model as it speeds up or slows down. Hedged calls record both attempts.
+    """
+
+    def __init__(self, window: int = 512) -> None:
+        self._samples: deque[int] = deque(maxlen=window)
+        self._counts = [0] * (len(_LATENCY_BUCKET_BOUNDS) + 1)
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._hedges = 0
+        self._hedge_wins = 0
+
+    def record(self, seconds: float) -> None:
+        index = bisect_left(_LATENCY_BUCKET_BOUNDS, seconds)
+        with self._lock:
+            if len(self._samples) == self._samples.maxlen:
+                self._counts[self._samples[0]] -= 1
+            self._samples.append(index)
+            self._counts[index] += 1
+
+    def quantile(self, q: float) -> float | None:
+        with self._lock:
+            return self._quantile(q)
+
+    def record_call(self) -> None:
+        with self._lock:
+            self._calls += 1
+
+    def claim_hedge(self) -> bool:
+        """Count a hedge unless hedges already exceed ``_HEDGE_BUDGET_RATIO`` of calls."""
+        with self._lock:
+            if self._hedges >= self._calls * _HEDGE_BUDGET_RATIO:
+                return False
+            self._hedges += 1
+            return True
+
+    def record_hedge_win(self) -> None:
+        with self._lock:
+            self._hedge_wins += 1
+
+    def snapshot(self) -> dict[str, int | None]:
+        with self._lock:
+            quantiles = {q: self._quantile(q) for q in (0.5, 0.95, 0.99)}
+            return {
+                "samples": len(self._samples),
+                "p50_ms": None if quantiles[0.5] is None else round(quantiles[0.5] * 1000),
+                "p95_ms": None if quantiles[0.95] is None else round(quantiles[0.95] * 1000),
+                "p99_ms": None if quantiles[0.99] is None else round(quantiles[0.99] * 1000),
+                "calls": self._calls,
+                "hedges": self._hedges,
+                "hedge_wins": self._hedge_wins,
+            }
+
+    def _quantile(self, q: float) -> float | None:
+        total = len(self._samples)
+        if total < _MIN_LATENCY_SAMPLES:
+            return None
+        rank = max(1, math.ceil(q * total))
+        cumulative = 0
+        for index, count in enumerate(self._counts):
+            cumulative += count
+            if cumulative >= rank:
+                return _LATENCY_BUCKET_BOUNDS[min(index, len(_LATENCY_BUCKET_BOUNDS) - 1)]
+        return _LATENCY_BUCKET_BOUNDS[-1]
+
+
+@dataclass
+class _CachedAnalysis:
+    result: TrackAnalysisResult
+    size_bytes: int
+    expires_at: float | None
+
+
+class _BoundedAnalysisCache:
+    """LRU of analysis results bounded by entry count and approximate serialized bytes.
+
+    Not locked itself: AIInferenceService only touches it under ``_cache_lock``.
+    Entry size is the length of the result's JSON, which tracks the real
+    footprint closely enough to bound memory.
+    """
+
+    def __init__(self, *, max_entries: int, max_bytes: int, ttl_seconds: float | None = None) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be greater than zero")
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be greater than zero")
+        if ttl_seconds is not None and ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be greater than zero")
+
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, _CachedAnalysis] = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, fingerprint: str, now: float) -> TrackAnalysisResult | None:
+        entry = self._entries.get(fingerprint)
+        if entry is not None and entry.expires_at is not None and entry.expires_at <= now:
+            self._remove(fingerprint)
+            self._expirations += 1
+            entry = None
+        if entry is None:
+            self._misses += 1
+            return None
+
+        self._hits += 1
+        self._entries.move_to_end(fingerprint)
+        return entry.result
+
+    def set(self, fingerprint: str, result: TrackAnalysisResult, now: float) -> None:
+        size_bytes = len(result.model_dump_json())
+        if fingerprint in self._entries:
+            self._remove(fingerprint)
+        if size_bytes > self._max_bytes:
+            return
+
+        expires_at = None if self._ttl_seconds is None else now + self._ttl_seconds
+        self._entries[fingerprint] = _CachedAnalysis(result=result, size_bytes=size_bytes, expires_at=expires_at)
+        self._bytes += size_bytes
+        while len(self._entries) > self._max_entries or self._bytes > self._max_bytes:
+            self._remove(next(iter(self._entries)))
+            self._evictions += 1
+
+    def metrics(self) -> dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "max_entries": self._max_entries,
+            "bytes": self._bytes,
+            "max_bytes": self._max_bytes,
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+        }
+
+    def _remove(self, fingerprint: str) -> None:
+        self._bytes -= self._entries.pop(fingerprint).size_bytes
+
+
+_ANALYSIS_MODEL_VERSION = "heuristic-v1"
+
+# (result, latency_ms, cost_usd, cache_hit, status, prompt_profile_version)
+_AnalysisOutcome = tuple[TrackAnalysisResult, int, float, bool, Literal["success", "degraded", "failed"], str]
+
+
+@dataclass
+class _AnalysisClaim:
+    fingerprint: str
+    cached: TrackAnalysisResult | None
+    flight: Future | None
+    leader: bool
+
+
+_DEFAULT_BULKHEAD_LIMITS: dict[str, int] = {"track_analysis": 8, "host_script": 4}
+
+
 class AIServiceError(RuntimeError):
     pass
 
@@ -145,87 +489,314 @@ class AIInferenceService:
         self,
         timeout_seconds: float = 2.0,
         circuit_breaker: AICircuitBreaker | None = None,
+        prompt_variables_path: Path = _DEFAULT_PROMPT_VARIABLES_PATH,
+        bulkhead_limits: dict[str, int] | None = None,
+        adaptive_timeouts: bool = False,
+        hedge_modes: tuple[str, ...] = (),
+        cache_max_entries: int = 1000,
+        cache_max_bytes: int = 16 * 1024 * 1024,
+        cache_ttl_seconds: float | None = None,
+        event_emitter: StructuredEventEmitter | None = None,
     ) -> None:
         self.timeout_seconds = timeout_seconds
+        self._events = event_emitter or get_event_emitter()
         self.circuit_breaker = circuit_breaker or AICircuitBreaker()
-        self._analysis_cache: dict[str, TrackAnalysisResult] = {}
+        limits = {**_DEFAULT_BULKHEAD_LIMITS, **(bulkhead_limits or {})}
+        self._bulkheads = {mode: _Bulkhead(limit) for mode, limit in limits.items()}
+        # Sized to the sum of the bulkheads, so a permitted call never queues inside the pool.
+        self._executor = ThreadPoolExecutor(max_workers=sum(limits.values()), thread_name_prefix="ai-inference")
+        self.adaptive_timeouts = adaptive_timeouts
+        self.hedge_modes = frozenset(hedge_modes)
+        self._latency = {mode: _LatencyProfile() for mode in limits}
+        self._analysis_cache = _BoundedAnalysisCache(
+            max_entries=cache_max_entries,
+            max_bytes=cache_max_bytes,
+            ttl_seconds=cache_ttl_seconds,
+        )
         self._cache_lock = threading.Lock()
-        self._max_cache_size = 1000
+        self._analysis_in_flight: dict[str, Future] = {}
+        self._prompt_variables_path = prompt_variables_path
+        self._prompt_profile: _PromptProfileSnapshot | None = None
+        self._prompt_profile_lock = threading.Lock()
+
+    def inference_gauges(self) -> dict[str, dict[str, int]]:
+        """Per-mode bulkhead gauges: limit, in_flight, queue_depth, abandoned, rejected.
+
+        Sync and async calls share each mode's bulkhead.
+        """
+        return {mode: bulkhead.snapshot() for mode, bulkhead in self._bulkheads.items()}
+
+    def latency_gauges(self) -> dict[str, dict[str, int | None]]:
+        """Per-mode rolling latency quantiles, hedge counters and the timeout currently applied."""
+        return {
+            mode: {**profile.snapshot(), "timeout_ms": round(self._timeout_for(mode) * 1000)}
+            for mode, profile in self._latency.items()
+        }
+
+    def analysis_cache_metrics(self) -> dict[str, int]:
+        with self._cache_lock:
+            return self._analysis_cache.metrics()
 
-    def _resolve_prompt_profile(self) -> tuple[str, str]:
-        config_path = Path(__file__).parent.parent / "config" / "prompt_variables.json"
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _resolve_prompt_profile(self) -> tuple[str, str, str]:
+        """Return ``(version, serialized, digest)`` for the current prompt profile.
+
+        Loading runs ``load_config_json`` (including envelope decryption), so the
+        snapshot is reused until the file's mtime, size or inode changes or
+        ``save_prompt_variables`` invalidates it; a hit costs one ``stat``.
+        """
         try:
-            payload = load_config_json(config_path)
-        except (OSError, json.JSONDecodeError, ConfigCryptoError):
-            return "default", "{}"
-        payload = self._load_prompt_variables()
-        if payload is None:
-            config_path = Path(__file__).parent.parent / "config" / "prompt_variables.json"
+            stat = os.stat(self._prompt_variables_path)
+            stat_key: tuple[int, int, int] | None = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        except OSError:
+            stat_key = None
+
+        snapshot = self._prompt_profile
+        if snapshot is None or snapshot.stat_key != stat_key:
+            with self._prompt_profile_lock:
+                snapshot = self._prompt_profile
+                if snapshot is None or snapshot.stat_key != stat_key:
+                    snapshot = self._load_prompt_profile(stat_key)
+                    self._prompt_profile = snapshot
+        return snapshot.version, snapshot.serialized, snapshot.digest
+
+    def _load_prompt_profile(self, stat_key: tuple[int, int, int] | None) -> _PromptProfileSnapshot:
+        payload: dict[str, Any] = {}
+        if stat_key is not None:
             try:
-                payload = load_config_json(config_path)
+                payload = load_config_json(self._prompt_variables_path)
             except (OSError, json.JSONDecodeError, ConfigCryptoError):
-                return "default", "{}"
-
-        version = str(payload.get("version", "default")).strip() or "default"
-        variable_settings = payload.get("variable_settings", {})
-        custom_variables = payload.get("custom_variables", {})
-        deterministic_payload = {
-            "version": version,
-            "variable_settings": variable_settings,
-            "custom_variables": custom_variables,
-        }
-        serialized = json.dumps(deterministic_payload, sort_keys=True, separators=(",", ":"))
-        return version, serialized
+                payload = {}
+        return _PromptProfileSnapshot.from_payload(stat_key, payload)
 
     def save_prompt_variables(self, payload: dict[str, Any]) -> None:
-        config_path = Path(__file__).parent.parent / "config" / "prompt_variables.json"
+        config_path = self._prompt_variables_path
         config_path.write_text(dump_config_json(config_path, payload, indent=2), encoding="utf-8")
+        # Same-size rewrites within the filesystem's mtime granularity keep the stat key.
+        with self._prompt_profile_lock:
+            self._prompt_profile = None
 
     def _compute_fingerprint(
         self,
         request: TrackAnalysisRequest,
         *,
         model_version: str,
-        prompt_profile_payload: str,
+        prompt_profile_digest: str,
     ) -> str:
         raw = {
             "track": request.model_dump(mode="json"),
             "model_version": model_version,
-            "prompt_profile": prompt_profile_payload,
+            "prompt_profile": prompt_profile_digest,
         }
         serialized = json.dumps(raw, sort_keys=True, separators=(",", ":"))
         return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
 
-    def analyze_track(
+    def analyze_track(self, request: TrackAnalysisRequest, correlation_id: str) -> _AnalysisOutcome:
+        prompt_profile_version, _, prompt_profile_digest = self._resolve_prompt_profile()
+        (claim,) = self._claim_analyses([request], prompt_profile_digest)
+        return self._complete_analysis(request, claim, correlation_id, prompt_profile_version)
+
+    async def analyze_track_async(self, request: TrackAnalysisRequest, correlation_id: str) -> _AnalysisOutcome:
+        """Event-loop variant of ``analyze_track``; shares its cache, single-flight map and breaker."""
+        prompt_profile_version, _, prompt_profile_digest = self._resolve_prompt_profile()
+        (claim,) = self._claim_analyses([request], prompt_profile_digest)
+        return await self._complete_analysis_async(request, claim, correlation_id, prompt_profile_version)
+
+    def analyze_tracks(
+        self,
+        requests: list[TrackAnalysisRequest],
+        correlation_id: str,
+        max_concurrency: int = 8,
+    ) -> tuple[str, list[_AnalysisOutcome | AIServiceError]]:
+        """Analyze a batch; returns the prompt profile version and each item's outcome or ``AIServiceError``.
+
+        The cache is checked and in-flight analyses are claimed for the whole batch
+        under one ``_cache_lock`` acquisition. Duplicate fingerprints within the batch
+        coalesce like concurrent requests do, and at most ``max_concurrency``
+        inferences run at once, capped at the track-analysis bulkhead limit so a
+        batch queues its own items rather than making them wait out their timeouts
+        for a permit.
+        """
+        prompt_profile_version, _, prompt_profile_digest = self._resolve_prompt_profile()
+        claims = self._claim_analyses(requests, prompt_profile_digest)
+        item_correlation_ids = [f"{correlation_id}:{index}" for index in range(len(requests))]
+
+        def _complete(index: int) -> _AnalysisOutcome | AIServiceError:
+            try:
+                return self._complete_analysis(
+                    requests[index], claims[index], item_correlation_ids[index], prompt_profile_version
+                )
+            except AIServiceError as exc:
+                return exc
+
+        leaders = [index for index, claim in enumerate(claims) if claim.leader]
+        outcomes: list[_AnalysisOutcome | AIServiceError | None] = [None] * len(requests)
+        if leaders:
+            # Leaders block on the shared inference pool, so a small per-batch pool fans them out.
+            with ThreadPoolExecutor(
+                max_workers=min(self._batch_fan_out(max_concurrency), len(leaders)),
+                thread_name_prefix="ai-analysis-batch",
+            ) as executor:
+                futures = {index: executor.submit(_complete, index) for index in leaders}
+                for index, claim in enumerate(claims):
+                    if not claim.leader:
+                        outcomes[index] = _complete(index)
+                for index, future in futures.items():
+                    outcomes[index] = future.result()
+        else:
+            outcomes = [_complete(index) for index in range(len(requests))]
+        return prompt_profile_version, outcomes
+
+    async def analyze_tracks_async(
+        self,
+        requests: list[TrackAnalysisRequest],
+        correlation_id: str,
+        max_concurrency: int = 8,
+    ) -> tuple[str, list[_AnalysisOutcome | AIServiceError]]:
+        """Event-loop variant of ``analyze_tracks`` with the same claiming and coalescing rules."""
+        prompt_profile_version, _, prompt_profile_digest = self._resolve_prompt_profile()
+        claims = self._claim_analyses(requests, prompt_profile_digest)
+        limiter = asyncio.Semaphore(self._batch_fan_out(max_concurrency))
+
+        async def _complete(index: int) -> _AnalysisOutcome | AIServiceError:
+            claim = claims[index]
+            item_correlation_id = f"{correlation_id}:{index}"
+            try:
+                if not claim.leader:
+                    return await self._complete_analysis_async(
+                        requests[index], claim, item_correlation_id, prompt_profile_version
+                    )
+                async with limiter:
+                    return await self._complete_analysis_async(
+                        requests[index], claim, item_correlation_id, prompt_profile_version
+                    )
+            except AIServiceError as exc:
+                return exc
+
+        outcomes = await asyncio.gather(*(_complete(index) for index in range(len(requests))))
+        return prompt_profile_version, list(outcomes)
+
+    def _batch_fan_out(self, max_concurrency: int) -> int:
+        return max(1, min(max_concurrency, self._bulkheads["track_analysis"].limit))
+
+    def _claim_analyses(
+        self,
+        requests: list[TrackAnalysisRequest],
+        prompt_profile_digest: str,
+    ) -> list[_AnalysisClaim]:
+        fingerprints = [
+            self._compute_fingerprint(
+                request,
+                model_version=_ANALYSIS_MODEL_VERSION,
+                prompt_profile_digest=prompt_profile_digest,
+            )
+            for request in requests
+        ]
+        claims: list[_AnalysisClaim] = []
+        with self._cache_lock:
+            now = time.monotonic()
+            for fingerprint in fingerprints:
+                cached = self._analysis_cache.get(fingerprint, now)
+                flight = None if cached is not None else self._analysis_in_flight.get(fingerprint)
+                leader = cached is None and flight is None
+                if leader:
+                    flight = self._analysis_in_flight[fingerprint] = Future()
+                    # A running future cannot be cancelled, so a follower giving up
+                    # (e.g. a cancelled asyncio.wrap_future) never breaks the leader's publish.
+                    flight.set_running_or_notify_cancel()
+                claims.append(_AnalysisClaim(fingerprint=fingerprint, cached=cached, flight=flight, leader=leader))
+        return claims
+
+    def _complete_analysis(
         self,
         request: TrackAnalysisRequest,
+        claim: _AnalysisClaim,
         correlation_id: str,
-    ) -> tuple[TrackAnalysisResult, int, float, bool, Literal["success", "degraded", "failed"], str]:
-        prompt_profile_version, prompt_profile_payload = self._resolve_prompt_profile()
-        model_version = "heuristic-v1"
-        fingerprint = self._compute_fingerprint(
-            request,
-            model_version=model_version,
-            prompt_profile_payload=prompt_profile_payload,
+        prompt_profile_version: str,
+    ) -> _AnalysisOutcome:
+        if claim.cached is not None:
+            return self._cache_hit_outcome(claim.cached, correlation_id, prompt_profile_version)
+        if not claim.leader:
+            return self._await_analysis_flight(claim.flight, correlation_id, prompt_profile_version)
+
+        try:
+            result, latency_ms, cost_usd, status = self._run_inference("track_analysis", request, correlation_id)
+        except BaseException as exc:
+            self._fail_analysis_flight(claim, exc)
+            raise
+        return self._publish_analysis_flight(
+            claim, result, latency_ms, cost_usd, status, correlation_id, prompt_profile_version
         )
-        with self._cache_lock:
-            cached = self._analysis_cache.get(fingerprint)
-
-        if cached is not None:
-            self._log_event(
-                event="ai_analysis_cache_hit",
-                mode="track_analysis",
-                correlation_id=correlation_id,
-                latency_ms=0,
-                cost_usd=0.0,
-                failure_reason=None,
-                metadata={"prompt_profile_version": prompt_profile_version},
+
+    async def _complete_analysis_async(
+        self,
+        request: TrackAnalysisRequest,
+        claim: _AnalysisClaim,
+        correlation_id: str,
+        prompt_profile_version: str,
+    ) -> _AnalysisOutcome:
+        if claim.cached is not None:
+            return self._cache_hit_outcome(claim.cached, correlation_id, prompt_profile_version)
+        if not claim.leader:
+            started = time.monotonic()
+            result, status = await asyncio.wrap_future(claim.flight)
+            return self._coalesced_outcome(result, status, started, correlation_id, prompt_profile_version)
+
+        try:
+            result, latency_ms, cost_usd, status = await self._run_inference_async(
+                "track_analysis", request, correlation_id
+            )
+        except BaseException as exc:
+            # Followers must not see the leader's CancelledError (a BaseException) as their own.
+            self._fail_analysis_flight(
+                claim, exc if isinstance(exc, Exception) else AIServiceError("track analysis cancelled")
             )
-            return cached, 0, 0.0, True, "success", prompt_profile_version
+            raise
+        return self._publish_analysis_flight(
+            claim, result, latency_ms, cost_usd, status, correlation_id, prompt_profile_version
+        )
 
-        result, latency_ms, cost_usd, status = self._run_inference("track_analysis", request, correlation_id)
+    def _cache_hit_outcome(
+        self,
+        result: TrackAnalysisResult,
+        correlation_id: str,
+        prompt_profile_version: str,
+    ) -> _AnalysisOutcome:
+        self._log_event(
+            event="ai_analysis_cache_hit",
+            mode="track_analysis",
+            correlation_id=correlation_id,
+            latency_ms=0,
+            cost_usd=0.0,
+            failure_reason=None,
+            metadata={"prompt_profile_version": prompt_profile_version},
+        )
+        return result, 0, 0.0, True, "success", prompt_profile_version
+
+    def _fail_analysis_flight(self, claim: _AnalysisClaim, exc: BaseException) -> None:
         with self._cache_lock:
-            self._analysis_cache[fingerprint] = result
+            del self._analysis_in_flight[claim.fingerprint]
+        claim.flight.set_exception(exc)
+
+    def _publish_analysis_flight(
+        self,
+        claim: _AnalysisClaim,
+        result: TrackAnalysisResult,
+        latency_ms: int,
+        cost_usd: float,
+        status: Literal["success", "degraded", "failed"],
+        correlation_id: str,
+        prompt_profile_version: str,
+    ) -> _AnalysisOutcome:
+        with self._cache_lock:
+            # Fallbacks (bulkhead rejections, timeouts, failures) are shared with followers
+            # but never cached, so one load spike cannot pin them until TTL or eviction.
+            if status == "success":
+                self._analysis_cache.set(claim.fingerprint, result, time.monotonic())
+            del self._analysis_in_flight[claim.fingerprint]
+        claim.flight.set_result((result, status))
 
         self._log_event(
             event="ai_analysis_cache_miss",
@@ -238,65 +809,305 @@ class AIInferenceService:
         )
         return result, latency_ms, cost_usd, False, status, prompt_profile_version
 
+    def _await_analysis_flight(
+        self,
+        flight: Future,
+        correlation_id: str,
+        prompt_profile_version: str,
+    ) -> _AnalysisOutcome:
+        started = time.monotonic()
+        result, status = flight.result()
+        return self._coalesced_outcome(result, status, started, correlation_id, prompt_profile_version)
+
+    def _coalesced_outcome(
+        self,
+        result: TrackAnalysisResult,
+        status: Literal["success", "degraded", "failed"],
+        started: float,
+        correlation_id: str,
+        prompt_profile_version: str,
+    ) -> _AnalysisOutcome:
+        # Followers share the leader's inference instead of paying for their own, so they
+        # report a cache hit with no cost; the leader's exception is re-raised by the await.
+        latency_ms = int((time.monotonic() - started) * 1000)
+        self._log_event(
+            event="ai_analysis_coalesced",
+            mode="track_analysis",
+            correlation_id=correlation_id,
+            latency_ms=latency_ms,
+            cost_usd=0.0,
+            failure_reason=None,
+            metadata={"prompt_profile_version": prompt_profile_version},
+        )
+        return result, latency_ms, 0.0, True, status, prompt_profile_version
+
     def generate_host_script(
         self,
         request: HostScriptRequest,
         correlation_id: str,
     ) -> tuple[HostScriptResult, int, float, Literal["success", "degraded", "failed"], str]:
-        prompt_profile_version, _ = self._resolve_prompt_profile()
+        prompt_profile_version, _, _ = self._resolve_prompt_profile()
         result, latency_ms, cost_usd, status = self._run_inference("host_script", request, correlation_id)
         return result, latency_ms, cost_usd, status, prompt_profile_version
 
+    async def generate_host_script_async(
+        self,
+        request: HostScriptRequest,
+        correlation_id: str,
+    ) -> tuple[HostScriptResult, int, float, Literal["success", "degraded", "failed"], str]:
+        prompt_profile_version, _, _ = self._resolve_prompt_profile()
+        result, latency_ms, cost_usd, status = await self._run_inference_async("host_script", request, correlation_id)
+        return result, latency_ms, cost_usd, status, prompt_profile_version
+
+    def _timeout_for(self, mode: str) -> float:
+        """``timeout_seconds``, or with adaptive timeouts a multiple of the observed p99 capped by it."""
+        if not self.adaptive_timeouts:
+            return self.timeout_seconds
+        p99 = self._latency[mode].quantile(0.99)
+        if p99 is None:
+            return self.timeout_seconds
+        floor = min(_ADAPTIVE_TIMEOUT_FLOOR_SECONDS, self.timeout_seconds)
+        return min(self.timeout_seconds, max(floor, p99 * _ADAPTIVE_TIMEOUT_MULTIPLIER))
+
+    def _hedge_delay(self, mode: str) -> float | None:
+        if mode not in self.hedge_modes:
+            return None
+        return self._latency[mode].quantile(_HEDGE_QUANTILE)
+
+    def _start_hedge(self, mode: str, bulkhead: _Bulkhead) -> bool:
+        # A hedge only uses a spare permit and stays within the budget, so it never
+        # queues behind primaries or multiplies load when the model slows down as a whole.
+        if not bulkhead.try_acquire():
+            return False
+        if not self._latency[mode].claim_hedge():
+            bulkhead.release()
+            return False
+        return True
+
+    def _submit_attempt(
+        self,
+        mode: Literal["track_analysis", "host_script"],
+        request: BaseModel,
+        bulkhead: _Bulkhead,
+    ) -> Future:
+        submitted = time.monotonic()
+        profile = self._latency[mode]
+        future = self._executor.submit(self._invoke_model, mode, request)
+        future.add_done_callback(bulkhead.release)
+
+        def _record(done: Future) -> None:
+            if not done.cancelled() and done.exception() is None:
+                profile.record(time.monotonic() - submitted)
+
+        future.add_done_callback(_record)
+        return future
+
     def _run_inference(self, mode: Literal["track_analysis", "host_script"], request: BaseModel, correlation_id: str):
         if not self.circuit_breaker.allow():
             raise AICircuitOpenError("circuit breaker open")
 
         started = time.monotonic()
+        timeout = self._timeout_for(mode)
+        bulkhead = self._bulkheads[mode]
+        if not bulkhead.acquire(timeout=timeout):
+            return self._reject_inference(mode, bulkhead, correlation_id, started)
+
         try:
-            with ThreadPoolExecutor(max_workers=1) as executor:
-                future = executor.submit(self._invoke_model, mode, request)
-                result = future.result(timeout=self.timeout_seconds)
-            self.circuit_breaker.on_success()
-
-            latency_ms = int((time.monotonic() - started) * 1000)
-            cost_usd = self._estimate_cost(request)
-            self._log_event(
-                event="ai_inference_success",
-                mode=mode,
-                correlation_id=correlation_id,
-                latency_ms=latency_ms,
-                cost_usd=cost_usd,
-                failure_reason=None,
-                metadata=None,
-            )
-            return result, latency_ms, cost_usd, "success"
-        except TimeoutError:
-            self.circuit_breaker.on_failure()
-            latency_ms = int((time.monotonic() - started) * 1000)
-            fallback_result = self._build_fallback(mode)
-            self._log_event(
-                event="ai_inference_failure",
-                mode=mode,
-                correlation_id=correlation_id,
-                latency_ms=latency_ms,
-                cost_usd=0.0,
-                failure_reason="timeout",
-                metadata=None,
-            )
-            return fallback_result, latency_ms, 0.0, "degraded"
-        except Exception as exc:
-            self.circuit_breaker.on_failure()
-            latency_ms = int((time.monotonic() - started) * 1000)
-            self._log_event(
-                event="ai_inference_failure",
-                mode=mode,
-                correlation_id=correlation_id,
-                latency_ms=latency_ms,
-                cost_usd=0.0,
-                failure_reason=type(exc).__name__,
-                metadata=None,
-            )
+            attempts = [self._submit_attempt(mode, request, bulkhead)]
+        except RuntimeError as exc:
+            bulkhead.release()
             raise AIServiceError(str(exc)) from exc
+        self._latency[mode].record_call()
+
+        deadline = started + timeout
+        hedge_delay = self._hedge_delay(mode)
+        hedge_at = None if hedge_delay is None else started + hedge_delay
+        pending = set(attempts)
+        winner: Future | None = None
+        error: BaseException | None = None
+        while pending and winner is None:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            wake_at = deadline if hedge_at is None else min(deadline, hedge_at)
+            done, pending = wait(pending, timeout=wake_at - now, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    winner = future
+                    break
+                error = future.exception()
+            if winner is None and pending and hedge_at is not None and time.monotonic() >= hedge_at:
+                hedge_at = None
+                if self._start_hedge(mode, bulkhead):
+                    try:
+                        hedge = self._submit_attempt(mode, request, bulkhead)
+                    except RuntimeError:
+                        bulkhead.release()
+                    else:
+                        attempts.append(hedge)
+                        pending.add(hedge)
+
+        # Attempts that already started keep running on their worker (holding their permit)
+        # until they return; nothing waits on them. Only a timed-out call counts as abandoned.
+        for future in attempts:
+            if future is winner or future.done() or future.cancel():
+                continue
+            if winner is None:
+                bulkhead.record_abandoned()
+
+        if winner is not None:
+            if winner is not attempts[0]:
+                self._latency[mode].record_hedge_win()
+            return self._inference_succeeded(mode, request, winner.result(), correlation_id, started, len(attempts))
+        if pending or error is None:
+            return self._inference_timed_out(mode, correlation_id, started)
+        raise self._inference_failed(mode, correlation_id, started, error) from error
+
+    async def _run_inference_async(
+        self,
+        mode: Literal["track_analysis", "host_script"],
+        request: BaseModel,
+        correlation_id: str,
+    ):
+        if not self.circuit_breaker.allow():
+            raise AICircuitOpenError("circuit breaker open")
+
+        started = time.monotonic()
+        timeout = self._timeout_for(mode)
+        bulkhead = self._bulkheads[mode]
+        if not await bulkhead.acquire_async(timeout=timeout):
+            return self._reject_inference(mode, bulkhead, correlation_id, started)
+
+        profile = self._latency[mode]
+        profile.record_call()
+
+        def _start_attempt() -> asyncio.Task:
+            submitted = time.monotonic()
+            task = asyncio.ensure_future(self._invoke_model_async(mode, request))
+
+            def _settle(done: asyncio.Task) -> None:
+                bulkhead.release()
+                if not done.cancelled() and done.exception() is None:
+                    profile.record(time.monotonic() - submitted)
+
+            task.add_done_callback(_settle)
+            return task
+
+        attempts = [_start_attempt()]
+        deadline = started + timeout
+        hedge_delay = self._hedge_delay(mode)
+        hedge_at = None if hedge_delay is None else started + hedge_delay
+        pending = set(attempts)
+        winner: asyncio.Task | None = None
+        error: BaseException | None = None
+        try:
+            while pending and winner is None:
+                now = time.monotonic()
+                if now >= deadline:
+                    break
+                wake_at = deadline if hedge_at is None else min(deadline, hedge_at)
+                done, pending = await asyncio.wait(pending, timeout=wake_at - now, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        winner = task
+                        break
+                    error = task.exception()
+                if winner is None and pending and hedge_at is not None and time.monotonic() >= hedge_at:
+                    hedge_at = None
+                    if self._start_hedge(mode, bulkhead):
+                        hedge = _start_attempt()
+                        attempts.append(hedge)
+                        pending.add(hedge)
+        finally:
+            for task in attempts:
+                if task is not winner:
+                    task.cancel()
+
+        if winner is not None:
+            if winner is not attempts[0]:
+                profile.record_hedge_win()
+            return self._inference_succeeded(mode, request, winner.result(), correlation_id, started, len(attempts))
+        if pending or error is None:
+            return self._inference_timed_out(mode, correlation_id, started)
+        raise self._inference_failed(mode, correlation_id, started, error) from error
+
+    def _reject_inference(
+        self,
+        mode: Literal["track_analysis", "host_script"],
+        bulkhead: _Bulkhead,
+        correlation_id: str,
+        started: float,
+    ):
+        latency_ms = int((time.monotonic() - started) * 1000)
+        self._log_event(
+            event="ai_inference_failure",
+            mode=mode,
+            correlation_id=correlation_id,
+            latency_ms=latency_ms,
+            cost_usd=0.0,
+            failure_reason="bulkhead_full",
+            metadata=bulkhead.snapshot(),
+        )
+        return self._build_fallback(mode), latency_ms, 0.0, "degraded"
+
+    def _inference_succeeded(
+        self,
+        mode: Literal["track_analysis", "host_script"],
+        request: BaseModel,
+        result: TrackAnalysisResult | HostScriptResult,
+        correlation_id: str,
+        started: float,
+        attempts: int = 1,
+    ):
+        # A hedged call is one outcome for the breaker, but every attempt that was sent is paid for.
+        self.circuit_breaker.on_success()
+        latency_ms = int((time.monotonic() - started) * 1000)
+        cost_usd = round(self._estimate_cost(request) * attempts, 6)
+        self._log_event(
+            event="ai_inference_success",
+            mode=mode,
+            correlation_id=correlation_id,
+            latency_ms=latency_ms,
+            cost_usd=cost_usd,
+            failure_reason=None,
+            metadata={"attempts": attempts} if attempts > 1 else None,
+        )
+        return result, latency_ms, cost_usd, "success"
+
+    def _inference_timed_out(self, mode: Literal["track_analysis", "host_script"], correlation_id: str, started: float):
+        self.circuit_breaker.on_failure()
+        latency_ms = int((time.monotonic() - started) * 1000)
+        fallback_result = self._build_fallback(mode)
+        self._log_event(
+            event="ai_inference_failure",
+            mode=mode,
+            correlation_id=correlation_id,
+            latency_ms=latency_ms,
+            cost_usd=0.0,
+            failure_reason="timeout",
+            metadata=None,
+        )
+        return fallback_result, latency_ms, 0.0, "degraded"
+
+    def _inference_failed(
+        self,
+        mode: Literal["track_analysis", "host_script"],
+        correlation_id: str,
+        started: float,
+        exc: Exception,
+    ) -> AIServiceError:
+        self.circuit_breaker.on_failure()
+        latency_ms = int((time.monotonic() - started) * 1000)
+        self._log_event(
+            event="ai_inference_failure",
+            mode=mode,
+            correlation_id=correlation_id,
+            latency_ms=latency_ms,
+            cost_usd=0.0,
+            failure_reason=type(exc).__name__,
+            metadata=None,
+        )
+        return AIServiceError(str(exc))
 
     def _build_fallback(self, mode: Literal["track_analysis", "host_script"]) -> TrackAnalysisResult | HostScriptResult:
         if mode == "track_analysis":
@@ -353,6 +1164,24 @@ class AIInferenceService:
         )
         return HostScriptResult(script=script, safety_flags=[])
 
+    async def _invoke_model_async(self, mode: Literal["track_analysis", "host_script"], request: BaseModel):
+        """Awaitable model call used by the async path.
+
+        By default the blocking ``_invoke_model`` runs on the inference pool so it never
+        holds the event loop; a networked provider overrides this with its async client call.
+        Cancelling a call whose worker has already started returns to the caller at once, but
+        this coroutine only finishes with the worker, so its bulkhead permit stays held until then.
+        """
+        future = self._executor.submit(self._invoke_model, mode, request)
+        result = asyncio.wrap_future(future)
+        try:
+            return await asyncio.shield(result)
+        except asyncio.CancelledError:
+            if not future.cancel() and not future.done():
+                self._bulkheads[mode].record_abandoned()
+                await asyncio.wait((result,))
+            raise
+
     def _estimate_cost(self, request: BaseModel) -> float:
         text = json.dumps(request.model_dump(), sort_keys=True)
         est_tokens = max(1, len(text) // 4)
@@ -379,6 +1208,4 @@ class AIInferenceService:
         }
         if metadata:
             payload["metadata"] = metadata
-        logger.info(
-            json.dumps(payload, sort_keys=True)
-        )
+        self._events.emit(logger, payload)
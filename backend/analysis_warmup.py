@@ -0,0 +1,396 @@
+"""Background warm-up of the track-analysis caches from the ``tracks`` table or a manifest.
+
+A warm-up walks its source in id order, analyzes tracks in parallel batches so
+their results land in the caches before a DJ asks for them, and can checkpoint
+its position so an interrupted run over a persistent cache resumes where it
+stopped.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from pydantic import ValidationError
+
+from backend.ai.contracts.track_analysis import TrackAnalysisRequest
+from backend.ai_service import AIInferenceService, AIServiceError
+from backend.track_analysis_service import TrackAnalysisService
+from backend.track_library import resolve_library_db_path
+
+logger = logging.getLogger(__name__)
+
+_SELECT_TRACKS_AFTER = (
+    "SELECT id, title, artist, album, genre, bpm, duration_seconds FROM tracks WHERE id > ? ORDER BY id"
+)
+
+# (position, request); request is None for rows or lines that cannot form a valid TrackAnalysisRequest.
+WarmupItem = tuple[int, TrackAnalysisRequest | None]
+
+
+class AnalysisWarmupSource:
+    source_id: str
+
+    def iter_items(self, after_position: int = 0) -> Iterator[WarmupItem]:
+        """Yield items with strictly increasing positions greater than ``after_position``."""
+        raise NotImplementedError
+
+
+class TracksTableWarmupSource(AnalysisWarmupSource):
+    """Rows of a ``tracks`` table; the position is the row id."""
+
+    def __init__(self, db_path: Path) -> None:
+        self._db_path = db_path
+        self.source_id = f"tracks:{db_path}"
+
+    def iter_items(self, after_position: int = 0) -> Iterator[WarmupItem]:
+        if not self._db_path.exists():
+            raise FileNotFoundError(f"track library database not found: {self._db_path}")
+        with closing(sqlite3.connect(f"file:{self._db_path}?mode=ro", uri=True)) as connection:
+            connection.row_factory = sqlite3.Row
+            rows = connection.execute(_SELECT_TRACKS_AFTER, (after_position,))
+            for row in rows:
+                yield row["id"], self._row_to_request(row)
+
+    @staticmethod
+    def _row_to_request(row: sqlite3.Row) -> TrackAnalysisRequest | None:
+        if row["duration_seconds"] is None:
+            return None
+        try:
+            return TrackAnalysisRequest(
+                track_id=str(row["id"]),
+                metadata={
+                    "title": row["title"],
+                    "artist": row["artist"],
+                    "album": row["album"],
+                    "duration_seconds": round(row["duration_seconds"]),
+                    "genre_hint": row["genre"],
+                },
+                audio_features=None if row["bpm"] is None else {"bpm": round(row["bpm"])},
+            )
+        except ValidationError:
+            return None
+
+
+class ManifestWarmupSource(AnalysisWarmupSource):
+    """JSON Lines file of ``TrackAnalysisRequest`` payloads; the position is the 1-based line number."""
+
+    def __init__(self, manifest_path: Path) -> None:
+        self._manifest_path = manifest_path
+        self.source_id = f"manifest:{manifest_path}"
+
+    def iter_items(self, after_position: int = 0) -> Iterator[WarmupItem]:
+        with self._manifest_path.open(encoding="utf-8") as manifest:
+            for position, line in enumerate(manifest, start=1):
+                if position <= after_position or not line.strip():
+                    continue
+                try:
+                    yield position, TrackAnalysisRequest.model_validate_json(line)
+                except ValidationError:
+                    yield position, None
+
+
+class AnalysisWarmupTarget:
+    name: str
+
+    def warm_batch(self, requests: list[TrackAnalysisRequest]) -> list[bool | Exception]:
+        """Per request: True if the analysis was computed, False if it was already cached, or the error."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class TrackAnalysisWarmupTarget(AnalysisWarmupTarget):
+    name = "track_analysis_service"
+
+    def __init__(self, service: TrackAnalysisService, max_concurrency: int = 8) -> None:
+        self._service = service
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="analysis-warmup")
+
+    def warm_batch(self, requests: list[TrackAnalysisRequest]) -> list[bool | Exception]:
+        futures = [self._executor.submit(self._service.warm, request) for request in requests]
+        outcomes: list[bool | Exception] = []
+        for future in futures:
+            try:
+                outcomes.append(future.result())
+            except Exception as exc:  # noqa: BLE001 - reported per track, the run goes on
+                outcomes.append(exc)
+        return outcomes
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+class InferenceWarmupTarget(AnalysisWarmupTarget):
+    """Warms ``AIInferenceService``'s in-process cache.
+
+    Fans out below the track-analysis bulkhead limit (half of it by default), so
+    live requests still get permits while a warm-up runs beside them.
+    """
+
+    name = "ai_inference_service"
+
+    def __init__(self, service: AIInferenceService, max_concurrency: int | None = None) -> None:
+        self._service = service
+        limit = service.inference_gauges()["track_analysis"]["limit"]
+        requested = max_concurrency if max_concurrency is not None else limit // 2
+        self._max_concurrency = max(1, min(requested, limit - 1))
+
+    def warm_batch(self, requests: list[TrackAnalysisRequest]) -> list[bool | Exception]:
+        _, outcomes = self._service.analyze_tracks(
+            requests,
+            correlation_id=f"warmup-{uuid.uuid4().hex[:12]}",
+            max_concurrency=self._max_concurrency,
+        )
+        results: list[bool | Exception] = []
+        for outcome in outcomes:
+            if isinstance(outcome, AIServiceError):
+                results.append(outcome)
+            elif outcome[4] != "success":
+                results.append(AIServiceError(f"analysis {outcome[4]}"))
+            else:
+                results.append(not outcome[3])
+        return results
+
+
+@dataclass
+class AnalysisWarmupReport:
+    source_id: str
+    resumed_from: int = 0
+    last_position: int = 0
+    scanned: int = 0
+    invalid: int = 0
+    already_cached: int = 0
+    warmed: int = 0
+    failed: int = 0
+    elapsed_seconds: float = 0.0
+    completed: bool = False
+    errors: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def tracks_per_second(self) -> float:
+        analyzed = self.already_cached + self.warmed + self.failed
+        return round(analyzed / self.elapsed_seconds, 2) if self.elapsed_seconds > 0 else 0.0
+
+    @property
+    def coverage(self) -> float:
+        """Share of the valid tracks scanned in this run whose analysis is now cached."""
+        eligible = self.scanned - self.invalid
+        return round((self.already_cached + self.warmed) / eligible, 4) if eligible else 1.0
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "source_id": self.source_id,
+            "resumed_from": self.resumed_from,
+            "last_position": self.last_position,
+            "scanned": self.scanned,
+            "invalid": self.invalid,
+            "already_cached": self.already_cached,
+            "warmed": self.warmed,
+            "failed": self.failed,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "tracks_per_second": self.tracks_per_second,
+            "coverage": self.coverage,
+            "completed": self.completed,
+            "errors": dict(self.errors),
+        }
+
+
+class AnalysisWarmupRunner:
+    """Feeds a source through one or more targets in batches.
+
+    Batches are processed in order and each one is fanned out by its targets,
+    so after a batch finishes every position up to its last item is done and
+    is written to ``checkpoint_path``. ``rate_limit_per_second`` paces batches
+    so the warm-up never sends more than that many tracks per second on
+    average. A track counts as warmed if any target computed it, already
+    cached if every target had it, and failed if any target failed.
+    """
+
+    def __init__(
+        self,
+        targets: list[AnalysisWarmupTarget],
+        *,
+        batch_size: int = 50,
+        rate_limit_per_second: float | None = None,
+        checkpoint_path: Path | None = None,
+    ) -> None:
+        if not targets:
+            raise ValueError("at least one warm-up target is required")
+        if batch_size <= 0:
+            raise ValueError("batch_size must be greater than zero")
+        if rate_limit_per_second is not None and rate_limit_per_second <= 0:
+            raise ValueError("rate_limit_per_second must be greater than zero")
+
+        self._targets = targets
+        self._batch_size = batch_size
+        self._rate_limit_per_second = rate_limit_per_second
+        self._checkpoint_path = checkpoint_path
+
+    def run(
+        self,
+        source: AnalysisWarmupSource,
+        *,
+        stop_event: threading.Event | None = None,
+    ) -> AnalysisWarmupReport:
+        stop_event = stop_event or threading.Event()
+        resumed_from = self._load_checkpoint(source.source_id)
+        report = AnalysisWarmupReport(
+            source_id=source.source_id,
+            resumed_from=resumed_from,
+            last_position=resumed_from,
+        )
+        started = time.monotonic()
+        next_batch_at = started
+
+        batch: list[WarmupItem] = []
+        items = source.iter_items(after_position=resumed_from)
+        exhausted = False
+        try:
+            while not exhausted and not stop_event.is_set():
+                batch.clear()
+                for item in items:
+                    batch.append(item)
+                    if len(batch) >= self._batch_size:
+                        break
+                else:
+                    exhausted = True
+                if not batch:
+                    break
+
+                wait_seconds = next_batch_at - time.monotonic()
+                if wait_seconds > 0 and stop_event.wait(wait_seconds):
+                    break
+                self._warm_batch(batch, report)
+                if self._rate_limit_per_second is not None:
+                    next_batch_at = max(next_batch_at, time.monotonic()) + len(batch) / self._rate_limit_per_second
+                self._save_checkpoint(report)
+        finally:
+            items.close()
+
+        report.completed = exhausted and not stop_event.is_set()
+        report.elapsed_seconds = time.monotonic() - started
+        logger.info(json.dumps({"event": "analysis_warmup_finished", **report.to_dict()}, sort_keys=True))
+        return report
+
+    def close(self) -> None:
+        for target in self._targets:
+            target.close()
+
+    def _warm_batch(self, batch: list[WarmupItem], report: AnalysisWarmupReport) -> None:
+        requests = [request for _, request in batch if request is not None]
+        report.scanned += len(batch)
+        report.invalid += len(batch) - len(requests)
+        report.last_position = batch[-1][0]
+        if not requests:
+            return
+
+        computed = [False] * len(requests)
+        failures: list[Exception | None] = [None] * len(requests)
+        for target in self._targets:
+            for index, outcome in enumerate(target.warm_batch(requests)):
+                if isinstance(outcome, Exception):
+                    failures[index] = failures[index] or outcome
+                elif outcome:
+                    computed[index] = True
+
+        for index, failure in enumerate(failures):
+            if failure is not None:
+                report.failed += 1
+                reason = type(failure).__name__
+                report.errors[reason] = report.errors.get(reason, 0) + 1
+            elif computed[index]:
+                report.warmed += 1
+            else:
+                report.already_cached += 1
+
+    def _load_checkpoint(self, source_id: str) -> int:
+        if self._checkpoint_path is None or not self._checkpoint_path.exists():
+            return 0
+        try:
+            checkpoint = json.loads(self._checkpoint_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return 0
+        if checkpoint.get("source_id") != source_id:
+            return 0
+        return int(checkpoint.get("last_position", 0))
+
+    def _save_checkpoint(self, report: AnalysisWarmupReport) -> None:
+        if self._checkpoint_path is None:
+            return
+        self._checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self._checkpoint_path.with_suffix(f"{self._checkpoint_path.suffix}.tmp")
+        temp_path.write_text(
+            json.dumps({"source_id": report.source_id, "last_position": report.last_position}),
+            encoding="utf-8",
+        )
+        os.replace(temp_path, self._checkpoint_path)
+
+
+class AnalysisWarmupTask:
+    """A warm-up running on a worker thread beside the app, stopped cleanly at shutdown."""
+
+    def __init__(self, runner: AnalysisWarmupRunner, source: AnalysisWarmupSource) -> None:
+        self._runner = runner
+        self._source = source
+        self._stop_event = threading.Event()
+        self._task: asyncio.Task[AnalysisWarmupReport] | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(asyncio.to_thread(self._run))
+
+    async def stop(self) -> AnalysisWarmupReport | None:
+        if self._task is None:
+            return None
+        self._stop_event.set()
+        try:
+            return await self._task
+        except Exception:
+            logger.exception("analysis warm-up failed")
+            return None
+
+    def _run(self) -> AnalysisWarmupReport:
+        try:
+            return self._runner.run(self._source, stop_event=self._stop_event)
+        finally:
+            self._runner.close()
+
+
+def build_startup_warmup(targets: list[AnalysisWarmupTarget]) -> AnalysisWarmupTask | None:
+    """Warm-up for the app lifespan, or None unless ``ROBODJ_ANALYSIS_WARMUP`` is enabled.
+
+    ``targets`` must be backed by the persistent ``ROBODJ_TRACK_ANALYSIS_CACHE_DB``
+    cache, and without it no warm-up runs: a bounded in-process cache would evict
+    most of a large library before it is used, and starts empty on every boot.
+    Reads ``ROBODJ_ANALYSIS_WARMUP_MANIFEST`` (default: the tracks table),
+    ``ROBODJ_ANALYSIS_WARMUP_RATE`` (tracks/sec, default 50) and
+    ``ROBODJ_ANALYSIS_WARMUP_CHECKPOINT``.
+    """
+    if os.environ.get("ROBODJ_ANALYSIS_WARMUP", "").strip().lower() not in {"1", "true", "yes", "on"}:
+        return None
+    if not os.environ.get("ROBODJ_TRACK_ANALYSIS_CACHE_DB", "").strip():
+        logger.warning("ROBODJ_ANALYSIS_WARMUP is set but ROBODJ_TRACK_ANALYSIS_CACHE_DB is not; skipping warm-up")
+        return None
+
+    manifest = os.environ.get("ROBODJ_ANALYSIS_WARMUP_MANIFEST", "").strip()
+    source: AnalysisWarmupSource = (
+        ManifestWarmupSource(Path(manifest)) if manifest else TracksTableWarmupSource(resolve_library_db_path())
+    )
+    checkpoint = os.environ.get("ROBODJ_ANALYSIS_WARMUP_CHECKPOINT", "").strip()
+    runner = AnalysisWarmupRunner(
+        targets,
+        rate_limit_per_second=float(os.environ.get("ROBODJ_ANALYSIS_WARMUP_RATE", "50")),
+        checkpoint_path=Path(checkpoint) if checkpoint else None,
+    )
+    return AnalysisWarmupTask(runner, source)
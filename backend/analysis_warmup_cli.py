@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import argparse
+import os
+from pathlib import Path
+
+from backend.analysis_warmup import (
+    AnalysisWarmupRunner,
+    AnalysisWarmupSource,
+    ManifestWarmupSource,
+    TrackAnalysisWarmupTarget,
+    TracksTableWarmupSource,
+)
+from backend.track_analysis_service import SQLiteAnalysisCacheStore, TrackAnalysisService
+from backend.track_library import resolve_library_db_path
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Precompute track analyses into the shared SQLite analysis cache")
+    parser.add_argument(
+        "--tracks-db",
+        default=str(resolve_library_db_path()),
+        help="SQLite database whose tracks table is warmed (ignored with --manifest)",
+    )
+    parser.add_argument(
+        "--manifest",
+        default=None,
+        help="JSON Lines file of TrackAnalysisRequest payloads to warm instead of the tracks table",
+    )
+    parser.add_argument(
+        "--cache-db",
+        default=os.environ.get("ROBODJ_TRACK_ANALYSIS_CACHE_DB", ""),
+        help="Analysis cache database to fill (defaults to ROBODJ_TRACK_ANALYSIS_CACHE_DB)",
+    )
+    parser.add_argument("--batch-size", type=int, default=50, help="Tracks per batch")
+    parser.add_argument("--max-concurrency", type=int, default=8, help="Parallel analyses within a batch")
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=None,
+        help="Maximum tracks per second (default: unlimited)",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        default="config/cache/analysis_warmup_checkpoint.json",
+        help=(
+            "Progress checkpoint; a rerun over the same source resumes after the last finished batch, "
+            "so only rows added since are scanned. Delete it to re-warm everything."
+        ),
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if not args.cache_db:
+        print(
+            "error: --cache-db or ROBODJ_TRACK_ANALYSIS_CACHE_DB is required "
+            "(an in-process cache dies with this run)"
+        )
+        return 2
+
+    source: AnalysisWarmupSource = (
+        ManifestWarmupSource(Path(args.manifest)) if args.manifest else TracksTableWarmupSource(Path(args.tracks_db))
+    )
+    service = TrackAnalysisService(cache_store=SQLiteAnalysisCacheStore(Path(args.cache_db)))
+    runner = AnalysisWarmupRunner(
+        [TrackAnalysisWarmupTarget(service, max_concurrency=args.max_concurrency)],
+        batch_size=args.batch_size,
+        rate_limit_per_second=args.rate_limit,
+        checkpoint_path=Path(args.checkpoint),
+    )
+    try:
+        report = runner.run(source)
+    finally:
+        runner.close()
+
+    for key, value in report.to_dict().items():
+        print(f"{key}={value}")
+    return 0 if report.failed == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,12 +4,14 @@ from fastapi import FastAPI
 from fastapi.responses import RedirectResponse
 
 from backend.ai_api import router as ai_router
+from backend.analysis_warmup import TrackAnalysisWarmupTarget, build_startup_warmup
 from backend.playlist_api import router as playlist_router
 from backend.runtime_env_validation import enforce_runtime_environment
 from backend.scheduling.api import router as autonomy_policy_router
 from backend.scheduling.scheduler_ui_api import router as scheduler_ui_router
 from backend.security.secret_integrity import run_secret_integrity_checks
 from backend.status.api import router as status_router
+from backend.track_analysis_api import get_track_analysis_service
 
 
 @asynccontextmanager
@@ -27,8 +29,16 @@ async def lifespan(_: FastAPI):
             "Resolve alerts and restart DGN-DJ backend services."
         )
 
+    # Only the SQLite-backed track analysis cache is warmed at startup; see build_startup_warmup.
+    warmup = build_startup_warmup([TrackAnalysisWarmupTarget(get_track_analysis_service())])
+    if warmup is not None:
+        warmup.start()
+
     yield
 
+    if warmup is not None:
+        await warmup.stop()
+
 
 app = FastAPI(title="DGN-DJ Studio Backend Scheduler Services", lifespan=lifespan)
 app.include_router(autonomy_policy_router)
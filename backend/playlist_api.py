@@ -1,19 +1,29 @@
-from fastapi import APIRouter, Depends
-from fastapi.responses import JSONResponse
+from collections.abc import Iterator
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
 
 from backend.playlist_service import (
+    PlaylistBatchRequest,
+    PlaylistBatchResult,
+    PlaylistCandidateShortageError,
     PlaylistGenerationRequest,
     PlaylistConstraintsInfeasibleError,
     PlaylistGenerationService,
     PlaylistResponseEnvelope,
+    PlaylistStreamErrorFrame,
 )
 from backend.security.auth import verify_api_key
+from backend.track_library import TrackLibraryError, TrackLibraryStore, UnknownTrackLibraryError
 
 router = APIRouter(prefix="/api/v1/ai", tags=["playlist"])
+# Shared so library-backed requests reuse the warm track snapshot between calls.
+_service = PlaylistGenerationService(library_store=TrackLibraryStore.from_environment())
 
 
 def get_playlist_service() -> PlaylistGenerationService:
-    return PlaylistGenerationService()
+    return _service
 
 
 @router.post("/generate-playlist", response_model=PlaylistResponseEnvelope)
@@ -27,5 +37,60 @@ def generate_playlist(
     except PlaylistConstraintsInfeasibleError as exc:
         envelope = PlaylistResponseEnvelope(success=False, data=None, error=exc.error)
         return JSONResponse(status_code=422, content=envelope.model_dump())
+    except PlaylistCandidateShortageError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
+    except UnknownTrackLibraryError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    except TrackLibraryError as exc:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)) from exc
 
     return PlaylistResponseEnvelope(success=True, data=result, error=None)
+
+
+@router.post("/generate-playlist/batch", response_model=PlaylistBatchResult)
+def generate_playlist_batch(
+    request: PlaylistBatchRequest,
+    _: str = Depends(verify_api_key),
+    service: PlaylistGenerationService = Depends(get_playlist_service),
+) -> PlaylistBatchResult:
+    """Generate every daypart of a schedule from one shared candidate set.
+
+    Infeasible specs are reported per item, so one bad hour does not fail the batch.
+    """
+    try:
+        return service.generate_batch(request)
+    except UnknownTrackLibraryError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    except TrackLibraryError as exc:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)) from exc
+
+
+def _ndjson_frames(frames: Iterator[BaseModel]) -> Iterator[str]:
+    try:
+        for frame in frames:
+            yield frame.model_dump_json() + "\n"
+    except PlaylistConstraintsInfeasibleError as exc:
+        yield PlaylistStreamErrorFrame(error=exc.error).model_dump_json() + "\n"
+
+
+@router.post("/generate-playlist/stream")
+def stream_playlist(
+    request: PlaylistGenerationRequest,
+    _: str = Depends(verify_api_key),
+    service: PlaylistGenerationService = Depends(get_playlist_service),
+) -> StreamingResponse:
+    """NDJSON variant of /generate-playlist for playout queues.
+
+    Emits one ``entry`` frame per slot as soon as it is chosen, then a ``summary``
+    frame; an infeasible slot ends the stream with an ``error`` frame instead.
+    """
+    try:
+        frames = service.stream_playlist(request)
+    except PlaylistCandidateShortageError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
+    except UnknownTrackLibraryError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    except TrackLibraryError as exc:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)) from exc
+
+    return StreamingResponse(_ndjson_frames(frames), media_type="application/x-ndjson")
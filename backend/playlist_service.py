@@ -1,10 +1,25 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Literal
+import threading
+from bisect import bisect_left, bisect_right
+from collections import deque
+from collections.abc import Iterable, Iterator, Sequence
+from copy import copy
+from dataclasses import dataclass, field
+from heapq import nlargest
+from time import monotonic
+from typing import TYPE_CHECKING, Literal
 
 from pydantic import BaseModel, Field, model_validator
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only where NumPy is absent
+    np = None
+
+if TYPE_CHECKING:
+    from backend.track_library import TrackLibraryStore
+
 
 class TrackCandidate(BaseModel):
     id: str = Field(min_length=1)
@@ -17,8 +32,19 @@ class TrackCandidate(BaseModel):
     duration_seconds: int = Field(ge=30)
 
 
+class TrackLibraryFilter(BaseModel):
+    genres: list[str] = Field(default_factory=list)
+    moods: list[str] = Field(default_factory=list)
+    min_bpm: int | None = Field(default=None, ge=50, le=220)
+    max_bpm: int | None = Field(default=None, ge=50, le=220)
+    min_energy: int | None = Field(default=None, ge=1, le=10)
+    max_energy: int | None = Field(default=None, ge=1, le=10)
+
+
 class PlaylistGenerationRequest(BaseModel):
-    tracks: list[TrackCandidate] = Field(min_length=1)
+    tracks: list[TrackCandidate] | None = Field(default=None, min_length=1)
+    library_id: str | None = Field(default=None, min_length=1)
+    library_filter: TrackLibraryFilter | None = None
     desired_count: int = Field(default=12, ge=1, le=100)
     start_hour: int = Field(default=12, ge=0, le=23)
     energy_curve: Literal["build", "steady", "cooldown"] = "build"
@@ -27,10 +53,21 @@ class PlaylistGenerationRequest(BaseModel):
     max_bpm_delta: int = Field(default=18, ge=0, le=80)
     max_consecutive_same_genre: int = Field(default=2, ge=1, le=10)
     target_duration_seconds: int | None = Field(default=None, ge=30)
+    strategy: Literal["greedy", "beam"] = "greedy"
+    beam_width: int = Field(default=4, ge=1, le=16)
+    time_budget_ms: int | None = Field(default=None, ge=1)
+
+    @model_validator(mode="after")
+    def validate_candidate_source(self) -> "PlaylistGenerationRequest":
+        if (self.tracks is None) == (self.library_id is None):
+            raise ValueError("exactly one of tracks or library_id must be provided")
+        if self.library_filter is not None and self.library_id is None:
+            raise ValueError("library_filter requires library_id")
+        return self
 
     @model_validator(mode="after")
     def validate_desired_count(self) -> "PlaylistGenerationRequest":
-        if self.desired_count > len(self.tracks):
+        if self.tracks is not None and self.desired_count > len(self.tracks):
             raise ValueError("desired_count cannot exceed available track count")
         return self
 
@@ -70,6 +107,81 @@ class PlaylistResponseEnvelope(BaseModel):
     error: PlaylistGenerationError | None
 
 
+class PlaylistStreamEntryFrame(BaseModel):
+    type: Literal["entry"] = "entry"
+    slot: int = Field(ge=0)
+    entry: PlaylistEntry
+
+
+class PlaylistStreamSummaryFrame(BaseModel):
+    type: Literal["summary"] = "summary"
+    average_transition_score: float = Field(ge=0.0, le=1.0)
+    energy_flow_score: float = Field(ge=0.0, le=1.0)
+    total_duration_seconds: int = Field(ge=0)
+
+
+class PlaylistStreamErrorFrame(BaseModel):
+    type: Literal["error"] = "error"
+    error: PlaylistGenerationError
+
+
+class PlaylistBatchSpec(BaseModel):
+    start_hour: int = Field(ge=0, le=23)
+    desired_count: int = Field(default=12, ge=1, le=100)
+    energy_curve: Literal["build", "steady", "cooldown"] = "build"
+    preferred_genres: list[str] = Field(default_factory=list)
+    target_duration_seconds: int | None = Field(default=None, ge=30)
+
+
+class PlaylistBatchRequest(BaseModel):
+    tracks: list[TrackCandidate] | None = Field(default=None, min_length=1)
+    library_id: str | None = Field(default=None, min_length=1)
+    library_filter: TrackLibraryFilter | None = None
+    specs: list[PlaylistBatchSpec] = Field(min_length=1, max_length=48)
+    avoid_recent_artist_window: int = Field(default=2, ge=0, le=10)
+    max_bpm_delta: int = Field(default=18, ge=0, le=80)
+    max_consecutive_same_genre: int = Field(default=2, ge=1, le=10)
+    strategy: Literal["greedy", "beam"] = "greedy"
+    beam_width: int = Field(default=4, ge=1, le=16)
+    time_budget_ms: int | None = Field(default=None, ge=1)
+    carry_over_separation: bool = True
+
+    @model_validator(mode="after")
+    def validate_candidate_source(self) -> PlaylistBatchRequest:
+        if (self.tracks is None) == (self.library_id is None):
+            raise ValueError("exactly one of tracks or library_id must be provided")
+        if self.library_filter is not None and self.library_id is None:
+            raise ValueError("library_filter requires library_id")
+        return self
+
+    def request_for(self, spec: PlaylistBatchSpec) -> PlaylistGenerationRequest:
+        # Candidates are resolved once for the whole batch, so per-spec requests skip validation.
+        return PlaylistGenerationRequest.model_construct(
+            desired_count=spec.desired_count,
+            start_hour=spec.start_hour,
+            energy_curve=spec.energy_curve,
+            avoid_recent_artist_window=self.avoid_recent_artist_window,
+            preferred_genres=spec.preferred_genres,
+            max_bpm_delta=self.max_bpm_delta,
+            max_consecutive_same_genre=self.max_consecutive_same_genre,
+            target_duration_seconds=spec.target_duration_seconds,
+            strategy=self.strategy,
+            beam_width=self.beam_width,
+            time_budget_ms=self.time_budget_ms,
+        )
+
+
+class PlaylistBatchItem(BaseModel):
+    start_hour: int = Field(ge=0, le=23)
+    success: bool
+    data: PlaylistGenerationResult | None
+    error: PlaylistGenerationError | None
+
+
+class PlaylistBatchResult(BaseModel):
+    items: list[PlaylistBatchItem]
+
+
 @dataclass(frozen=True)
 class _TimeProfile:
     target_energy: int
@@ -82,6 +194,302 @@ class _OptimizedTrack:
     genre_lower: str
     mood_lower: str
     artist_norm: str
+    position: int = 0
+
+
+@dataclass
+class _SlotState:
+    """Running totals for the playlist built so far, advanced once per chosen track."""
+
+    recent_artists: deque[str]
+    filled: int = 0
+    accumulated_duration: int = 0
+    run_genre: str | None = None
+    run_length: int = 0
+    last: _OptimizedTrack | None = None
+
+    @classmethod
+    def for_request(cls, request: PlaylistGenerationRequest, seed_artists: Iterable[str] = ()) -> _SlotState:
+        # A zero window keeps every artist, mirroring how output[-0:] slices the whole playlist.
+        return cls(recent_artists=deque(seed_artists, maxlen=request.avoid_recent_artist_window or None))
+
+    def fork(self) -> _SlotState:
+        return _SlotState(
+            recent_artists=deque(self.recent_artists, maxlen=self.recent_artists.maxlen),
+            filled=self.filled,
+            accumulated_duration=self.accumulated_duration,
+            run_genre=self.run_genre,
+            run_length=self.run_length,
+            last=self.last,
+        )
+
+    def advance(self, chosen: _OptimizedTrack) -> None:
+        self.filled += 1
+        self.accumulated_duration += chosen.track.duration_seconds
+        if chosen.genre_lower == self.run_genre:
+            self.run_length += 1
+        else:
+            self.run_genre = chosen.genre_lower
+            self.run_length = 1
+        self.recent_artists.append(chosen.artist_norm)
+        self.last = chosen
+
+
+class _CandidateIndex:
+    """Remaining candidates bucketed by BPM, then by lowercased genre.
+
+    Distinct BPM values are kept in a sorted array so a slot only visits the
+    buckets inside the ``max_bpm_delta`` window, and the genre sub-buckets let
+    the ``genre_run_length`` rule skip a whole genre instead of testing each
+    track. Buckets preserve request order via ``_OptimizedTrack.position``.
+    """
+
+    def __init__(self, tracks: list[_OptimizedTrack]) -> None:
+        self._remaining: dict[str, _OptimizedTrack] = {}
+        self._buckets: dict[int, dict[str, list[_OptimizedTrack]]] = {}
+        for track in tracks:
+            self._remaining[track.track.id] = track
+            self._buckets.setdefault(track.track.bpm, {}).setdefault(track.genre_lower, []).append(track)
+        self._bpms: list[int] = sorted(self._buckets)
+
+    def remaining(self) -> Iterator[_OptimizedTrack]:
+        return iter(self._remaining.values())
+
+    def window(self, center_bpm: int, max_delta: int, excluded_genre: str | None) -> Iterator[_OptimizedTrack]:
+        lo = bisect_left(self._bpms, center_bpm - max_delta)
+        hi = bisect_right(self._bpms, center_bpm + max_delta)
+        for bpm in self._bpms[lo:hi]:
+            for genre, bucket in self._buckets[bpm].items():
+                if genre != excluded_genre:
+                    yield from bucket
+
+    def remove(self, candidate: _OptimizedTrack) -> None:
+        del self._remaining[candidate.track.id]
+        bpm = candidate.track.bpm
+        genres = self._buckets[bpm]
+        bucket = genres[candidate.genre_lower]
+        bucket.remove(candidate)
+        if bucket:
+            return
+        del genres[candidate.genre_lower]
+        if genres:
+            return
+        del self._buckets[bpm]
+        del self._bpms[bisect_left(self._bpms, bpm)]
+
+
+def _energy_term(energy_delta: int) -> float:
+    return max(0, 1 - (energy_delta / 10))
+
+
+def _genre_term(genre_lower: str, requested_genres: set[str], profile: _TimeProfile) -> float:
+    if requested_genres:
+        return 0.5 if genre_lower in requested_genres else -0.2
+    if genre_lower in profile.preferred_genres:
+        return 0.35
+    return 0.0
+
+
+def _transition_value(bpm_gap: int, same_mood: bool, same_artist: bool, same_genre: bool) -> float:
+    bpm_score = max(0.0, 1 - (bpm_gap / 35))
+    mood_score = 1.0 if same_mood else 0.65
+    artist_score = 0.0 if same_artist else 1.0
+    genre_score = 1.0 if same_genre else 0.75
+    return round((bpm_score * 0.35) + (mood_score * 0.25) + (artist_score * 0.25) + (genre_score * 0.15), 3)
+
+
+# BPM gaps at or beyond this value all score 0 on the BPM component of a transition.
+_MAX_SCORED_BPM_GAP = 35
+
+
+class _ColumnarCandidatePool:
+    """NumPy columns for one request's candidates, sorted by (bpm, request position).
+
+    Energy deltas and transitions only take a handful of discrete values, so
+    their terms are looked up from tables built with the scalar helpers above;
+    that keeps every score bit-identical to ``_candidate_score``, including the
+    ``round(..., 3)`` applied to transitions. Per slot, the BPM window is a
+    contiguous slice found by ``searchsorted``.
+    """
+
+    if np is not None:
+        _ENERGY_TERMS = np.array([_energy_term(delta) for delta in range(10)])
+        # Indexed as [bpm_gap, same_mood, same_artist, same_genre].
+        _TRANSITION_TABLE = np.array(
+            [
+                [
+                    [
+                        [_transition_value(gap, mood, artist, genre) for genre in (False, True)]
+                        for artist in (False, True)
+                    ]
+                    for mood in (False, True)
+                ]
+                for gap in range(_MAX_SCORED_BPM_GAP + 1)
+            ]
+        )
+
+    def __init__(
+        self,
+        tracks: list[_OptimizedTrack],
+        requested_genres: set[str],
+        profile: _TimeProfile,
+    ) -> None:
+        genre_codes: dict[str, int] = {}
+        mood_codes: dict[str, int] = {}
+        artist_codes: dict[str, int] = {}
+        bpm = np.array([candidate.track.bpm for candidate in tracks], dtype=np.int64)
+        position = np.array([candidate.position for candidate in tracks], dtype=np.int64)
+        order = np.lexsort((position, bpm))
+
+        self._tracks = [tracks[row] for row in order.tolist()]
+        self._row_of = {candidate.position: row for row, candidate in enumerate(self._tracks)}
+        self._genre_codes = genre_codes
+        self._artist_codes = artist_codes
+        self._bpm = bpm[order]
+        self._position = position[order]
+        self._energy = np.array([candidate.track.energy for candidate in tracks], dtype=np.int64)[order]
+        self._duration = np.array([candidate.track.duration_seconds for candidate in tracks], dtype=np.int64)[order]
+        self._genre = np.array(
+            [genre_codes.setdefault(candidate.genre_lower, len(genre_codes)) for candidate in tracks],
+            dtype=np.int64,
+        )[order]
+        self._mood = np.array(
+            [mood_codes.setdefault(candidate.mood_lower, len(mood_codes)) for candidate in tracks],
+            dtype=np.int64,
+        )[order]
+        self._artist = np.array(
+            [artist_codes.setdefault(candidate.artist_norm, len(artist_codes)) for candidate in tracks],
+            dtype=np.int64,
+        )[order]
+        self._genre_term = np.array([_genre_term(genre, requested_genres, profile) for genre in genre_codes])[
+            self._genre
+        ]
+        self._alive = np.ones(len(self._tracks), dtype=bool)
+
+    def fork(
+        self,
+        requested_genres: set[str],
+        profile: _TimeProfile,
+        alive: np.ndarray | None = None,
+    ) -> _ColumnarCandidatePool:
+        """Share the immutable columns with a fresh pool scoring genres for another request.
+
+        ``alive`` (from ``alive_mask``) restricts the fork to a subset of the candidates.
+        """
+        pool = copy(self)
+        pool._genre_term = np.array([_genre_term(genre, requested_genres, profile) for genre in self._genre_codes])[
+            self._genre
+        ]
+        pool._alive = np.ones(len(self._tracks), dtype=bool) if alive is None else alive.copy()
+        return pool
+
+    def alive_mask(self, candidates: Iterable[_OptimizedTrack]) -> np.ndarray:
+        """Row mask selecting ``candidates``, which must all belong to this pool."""
+        alive = np.zeros(len(self._tracks), dtype=bool)
+        alive[[self._row_of[candidate.position] for candidate in candidates]] = True
+        return alive
+
+    def remaining(self) -> Iterator[_OptimizedTrack]:
+        return (self._tracks[row] for row in np.flatnonzero(self._alive).tolist())
+
+    def rank(
+        self,
+        request: PlaylistGenerationRequest,
+        state: _SlotState,
+        target_energy: int,
+        excluded_genre: str | None,
+        max_duration: int | None,
+        limit: int = 1,
+        exclude: frozenset[int] = frozenset(),
+    ) -> list[_OptimizedTrack]:
+        """Return up to ``limit`` candidates ordered by score, then request position."""
+        previous = state.last
+        if previous is None:
+            lo, hi = 0, len(self._tracks)
+        else:
+            lo = int(np.searchsorted(self._bpm, previous.track.bpm - request.max_bpm_delta, side="left"))
+            hi = int(np.searchsorted(self._bpm, previous.track.bpm + request.max_bpm_delta, side="right"))
+
+        mask = self._alive[lo:hi].copy()
+        if excluded_genre is not None:
+            mask &= self._genre[lo:hi] != self._genre_codes[excluded_genre]
+        if max_duration is not None:
+            mask &= self._duration[lo:hi] <= max_duration
+        for position in exclude:
+            row = self._row_of[position]
+            if lo <= row < hi:
+                mask[row - lo] = False
+        if not mask.any():
+            return []
+
+        # Accumulate in the same order as _candidate_score so floating-point results match exactly.
+        scores = self._ENERGY_TERMS[np.abs(self._energy[lo:hi] - target_energy)] + self._genre_term[lo:hi]
+        if state.recent_artists:
+            recent = np.zeros(len(self._artist_codes), dtype=bool)
+            recent[[self._artist_codes[artist] for artist in state.recent_artists]] = True
+            scores = scores - np.where(recent[self._artist[lo:hi]], 0.6, 0.0)
+        if previous is not None:
+            previous_row = self._row_of[previous.position]
+            gaps = np.minimum(np.abs(self._bpm[lo:hi] - previous.track.bpm), _MAX_SCORED_BPM_GAP)
+            scores = scores + self._TRANSITION_TABLE[
+                gaps,
+                (self._mood[lo:hi] == self._mood[previous_row]).astype(np.int64),
+                (self._artist[lo:hi] == self._artist[previous_row]).astype(np.int64),
+                (self._genre[lo:hi] == self._genre[previous_row]).astype(np.int64),
+            ]
+
+        positions = self._position[lo:hi]
+        if limit == 1:
+            scores = np.where(mask, scores, -np.inf)
+            best_rows = np.flatnonzero(scores == scores.max())
+            return [self._tracks[lo + int(best_rows[np.argmin(positions[best_rows])])]]
+
+        valid_rows = np.flatnonzero(mask)
+        ordered = valid_rows[np.lexsort((positions[valid_rows], -scores[valid_rows]))[:limit]]
+        return [self._tracks[lo + int(row)] for row in ordered.tolist()]
+
+    def remove(self, candidate: _OptimizedTrack) -> None:
+        self._alive[self._row_of[candidate.position]] = False
+
+
+@dataclass
+class _PreparedRequest:
+    request: PlaylistGenerationRequest
+    profile: _TimeProfile
+    requested_genres: set[str]
+    pool: _CandidateIndex | _ColumnarCandidatePool
+    seed_artists: tuple[str, ...] = ()
+
+
+@dataclass
+class _SharedCandidates:
+    """Normalized candidates plus, with the NumPy engine, columns that requests fork.
+
+    ``alive`` marks the rows of ``base_pool`` that belong to ``tracks`` when the
+    pool was built for a larger set (a library snapshot before filtering).
+    """
+
+    tracks: list[_OptimizedTrack]
+    base_pool: _ColumnarCandidatePool | None
+    alive: np.ndarray | None = None
+
+
+@dataclass
+class _BeamNode:
+    """One partial sequence kept by beam search, with its running objective terms."""
+
+    state: _SlotState
+    entries: list[PlaylistEntry] = field(default_factory=list)
+    transition_scores: list[float] = field(default_factory=list)
+    used: frozenset[int] = frozenset()
+    flow_penalty: float = 0.0
+
+    def objective(self) -> float:
+        # Same terms the result reports: average transition plus energy flow, unrounded.
+        if not self.entries:
+            return 0.0
+        flow = 1.0 if len(self.entries) <= 1 else max(0.0, 1 - (self.flow_penalty / (len(self.entries) * 4)))
+        return sum(self.transition_scores) / len(self.transition_scores) + flow
 
 
 TIME_OF_DAY_PROFILE: dict[int, _TimeProfile] = {
@@ -98,121 +506,468 @@ for h in range(0, 5):  # Late Night
 
 
 class PlaylistGenerationService:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        engine: Literal["auto", "python", "numpy"] = "auto",
+        library_store: TrackLibraryStore | None = None,
+    ) -> None:
+        if engine == "numpy" and np is None:
+            raise ValueError("engine='numpy' requires NumPy to be installed")
         self._cache = {}
+        self._use_numpy = np is not None and engine != "python"
+        self._library_store = library_store
+        # library_id -> (snapshot version, normalized tracks and base pool); shared read-only across requests.
+        self._library_tracks: dict[str, tuple[int, _SharedCandidates]] = {}
+        self._library_lock = threading.Lock()
 
     def _normalize_artist(self, artist: str) -> str:
         return artist.strip().lower()
 
+    def generate(self, request: PlaylistGenerationRequest) -> PlaylistGenerationResult:
+        return self.generate_playlist(request)
+
     def generate_playlist(self, request: PlaylistGenerationRequest) -> PlaylistGenerationResult:
-        # Pre-process tracks into optimized structures (O(N))
-        remaining = {
+        return self._generate_prepared(self._prepare(request))
+
+    def generate_batch(self, batch: PlaylistBatchRequest) -> PlaylistBatchResult:
+        """Generate one playlist per spec, in order, from a single shared, pre-normalized candidate set.
+
+        With ``carry_over_separation`` each spec is seeded with the previous spec's last
+        ``avoid_recent_artist_window`` entries: their artists count as recent and their
+        tracks are excluded.
+        """
+        if batch.library_id is not None:
+            candidates = self._library_candidates(batch.library_id, batch.library_filter)
+        else:
+            candidates = self._shared_candidates(self._optimize_tracks(batch.tracks or []))
+
+        items: list[PlaylistBatchItem] = []
+        previous: PlaylistGenerationResult | None = None
+        for spec in batch.specs:
+            request = batch.request_for(spec)
+            seed = self._carry_over_seed(request, previous) if batch.carry_over_separation else []
+            outcome = self._generate_batch_item(request, candidates, seed)
+            if isinstance(outcome, PlaylistGenerationError):
+                items.append(PlaylistBatchItem(start_hour=request.start_hour, success=False, data=None, error=outcome))
+                previous = None
+            else:
+                items.append(PlaylistBatchItem(start_hour=request.start_hour, success=True, data=outcome, error=None))
+                previous = outcome
+        return PlaylistBatchResult(items=items)
+
+    def _generate_batch_item(
+        self,
+        request: PlaylistGenerationRequest,
+        candidates: _SharedCandidates,
+        seed: Sequence[PlaylistEntry] = (),
+    ) -> PlaylistGenerationResult | PlaylistGenerationError:
+        prepared = self._prepare_candidates(request, candidates)
+        if seed:
+            seed_ids = {entry.track_id for entry in seed}
+            for candidate in [c for c in prepared.pool.remaining() if c.track.id in seed_ids]:
+                prepared.pool.remove(candidate)
+            prepared.seed_artists = tuple(self._normalize_artist(entry.artist) for entry in seed)
+        try:
+            return self._generate_prepared(prepared)
+        except PlaylistConstraintsInfeasibleError as exc:
+            return exc.error
+
+    def _carry_over_seed(
+        self,
+        request: PlaylistGenerationRequest,
+        previous: PlaylistGenerationResult | None,
+    ) -> list[PlaylistEntry]:
+        if previous is None:
+            return []
+        return previous.entries[-request.avoid_recent_artist_window :]
+
+    def _generate_prepared(self, prepared: _PreparedRequest) -> PlaylistGenerationResult:
+        if prepared.request.strategy == "beam":
+            return self._generate_beam(prepared)
+        return self._generate_greedy(prepared)
+
+    def stream_playlist(
+        self, request: PlaylistGenerationRequest
+    ) -> Iterator[PlaylistStreamEntryFrame | PlaylistStreamSummaryFrame]:
+        """Yield each entry as soon as its slot is decided, then a summary frame.
+
+        Candidates are prepared before the first frame so lookup errors surface to the
+        caller eagerly. Beam search only knows its winner at the end, so it emits its
+        entries together. An infeasible slot raises ``PlaylistConstraintsInfeasibleError``
+        from the iterator after the entries already yielded.
+        """
+        prepared = self._prepare(request)
+        if request.strategy == "beam":
+            return self._stream_beam(prepared)
+        return self._stream_greedy(prepared)
+
+    def _stream_greedy(
+        self, prepared: _PreparedRequest
+    ) -> Iterator[PlaylistStreamEntryFrame | PlaylistStreamSummaryFrame]:
+        entries: list[PlaylistEntry] = []
+        transition_scores: list[float] = []
+        for slot, (entry, transition) in enumerate(self._iter_greedy(prepared)):
+            entries.append(entry)
+            transition_scores.append(transition)
+            yield PlaylistStreamEntryFrame(slot=slot, entry=entry)
+        yield self._summary_frame(self._build_result(prepared.request, entries, transition_scores))
+
+    def _stream_beam(
+        self, prepared: _PreparedRequest
+    ) -> Iterator[PlaylistStreamEntryFrame | PlaylistStreamSummaryFrame]:
+        result = self._generate_beam(prepared)
+        for slot, entry in enumerate(result.entries):
+            yield PlaylistStreamEntryFrame(slot=slot, entry=entry)
+        yield self._summary_frame(result)
+
+    def _summary_frame(self, result: PlaylistGenerationResult) -> PlaylistStreamSummaryFrame:
+        return PlaylistStreamSummaryFrame(
+            average_transition_score=result.average_transition_score,
+            energy_flow_score=result.energy_flow_score,
+            total_duration_seconds=result.total_duration_seconds,
+        )
+
+    def _prepare(self, request: PlaylistGenerationRequest) -> _PreparedRequest:
+        if request.library_id is not None:
+            candidates = self._library_candidates(request.library_id, request.library_filter)
+            # Inline tracks are counted by the request validator; library candidates only exist now.
+            if request.desired_count > len(candidates.tracks):
+                raise PlaylistCandidateShortageError(
+                    f"desired_count {request.desired_count} exceeds the {len(candidates.tracks)} tracks "
+                    f"available in library '{request.library_id}'"
+                )
+        else:
+            candidates = _SharedCandidates(tracks=self._optimize_tracks(request.tracks or []), base_pool=None)
+        return self._prepare_candidates(request, candidates)
+
+    def _prepare_candidates(
+        self,
+        request: PlaylistGenerationRequest,
+        candidates: _SharedCandidates,
+    ) -> _PreparedRequest:
+        # Pre-compute invariants to avoid re-calculating them in the inner loop (O(N) * K times)
+        profile = TIME_OF_DAY_PROFILE[request.start_hour]
+        requested_genres = {genre.lower() for genre in request.preferred_genres}
+        if candidates.base_pool is not None:
+            pool: _CandidateIndex | _ColumnarCandidatePool = candidates.base_pool.fork(
+                requested_genres, profile, candidates.alive
+            )
+        elif self._use_numpy:
+            pool = _ColumnarCandidatePool(candidates.tracks, requested_genres, profile)
+        else:
+            pool = _CandidateIndex(candidates.tracks)
+        return _PreparedRequest(request=request, profile=profile, requested_genres=requested_genres, pool=pool)
+
+    def _shared_candidates(self, tracks: list[_OptimizedTrack]) -> _SharedCandidates:
+        # The base pool's genre terms are placeholders; every fork recomputes them for its request.
+        base_pool = _ColumnarCandidatePool(tracks, set(), TIME_OF_DAY_PROFILE[0]) if self._use_numpy else None
+        return _SharedCandidates(tracks=tracks, base_pool=base_pool)
+
+    def _optimize_tracks(self, tracks: Iterable[TrackCandidate]) -> list[_OptimizedTrack]:
+        # Pre-process tracks into optimized structures (O(N)); later duplicates of an id replace
+        # earlier ones but keep the first occurrence's position, matching dict semantics.
+        by_id = {
             t.id: _OptimizedTrack(
                 track=t,
                 genre_lower=t.genre.lower(),
                 mood_lower=t.mood.lower(),
                 artist_norm=self._normalize_artist(t.artist),
             )
-            for t in request.tracks
+            for t in tracks
         }
+        for position, optimized in enumerate(by_id.values()):
+            optimized.position = position
+        return list(by_id.values())
+
+    def _library_candidates(
+        self,
+        library_id: str,
+        library_filter: TrackLibraryFilter | None,
+    ) -> _SharedCandidates:
+        if self._library_store is None:
+            raise ValueError("library-backed playlist generation is not configured for this service")
+
+        snapshot = self._library_store.snapshot(library_id)
+        with self._library_lock:
+            cached = self._library_tracks.get(library_id)
+            if cached is None or cached[0] != snapshot.version:
+                # Positions follow snapshot order and never change afterwards, so a filtered
+                # subset still breaks score ties the same way a request-ordered list would.
+                cached = (snapshot.version, self._shared_candidates(self._optimize_tracks(snapshot.tracks)))
+                self._library_tracks[library_id] = cached
+        library = cached[1]
+        if library_filter is None:
+            return library
+
+        genres = {genre.lower() for genre in library_filter.genres}
+        moods = {mood.lower() for mood in library_filter.moods}
+        tracks = [
+            candidate
+            for candidate in library.tracks
+            if (not genres or candidate.genre_lower in genres)
+            and (not moods or candidate.mood_lower in moods)
+            and (library_filter.min_bpm is None or candidate.track.bpm >= library_filter.min_bpm)
+            and (library_filter.max_bpm is None or candidate.track.bpm <= library_filter.max_bpm)
+            and (library_filter.min_energy is None or candidate.track.energy >= library_filter.min_energy)
+            and (library_filter.max_energy is None or candidate.track.energy <= library_filter.max_energy)
+        ]
+        alive = library.base_pool.alive_mask(tracks) if library.base_pool is not None else None
+        return _SharedCandidates(tracks=tracks, base_pool=library.base_pool, alive=alive)
+
+    def _generate_greedy(self, prepared: _PreparedRequest) -> PlaylistGenerationResult:
         output: list[PlaylistEntry] = []
         transition_scores: list[float] = []
+        for entry, transition in self._iter_greedy(prepared):
+            output.append(entry)
+            transition_scores.append(transition)
+        return self._build_result(prepared.request, output, transition_scores)
 
-        # Pre-compute invariants to avoid re-calculating them in the inner loop (O(N) * K times)
-        profile = TIME_OF_DAY_PROFILE[request.start_hour]
-        requested_genres = {genre.lower() for genre in request.preferred_genres}
+    def _iter_greedy(self, prepared: _PreparedRequest) -> Iterator[tuple[PlaylistEntry, float]]:
+        request = prepared.request
+        state = _SlotState.for_request(request, prepared.seed_artists)
+        previous_track: PlaylistEntry | None = None
 
         for slot in range(request.desired_count):
             target_energy = self._target_energy_for_slot(request, slot)
-            previous_track = output[-1] if output else None
-
-            # Pre-compute previous track attributes to avoid re-calculating in inner loop
-            prev_mood_lower = previous_track.mood.lower() if previous_track else None
-            prev_genre_lower = previous_track.genre.lower() if previous_track else None
-
-            recent_artists = {
-                self._normalize_artist(entry.artist) for entry in output[-request.avoid_recent_artist_window :]
-            }
-
-            hard_filtered: list[_OptimizedTrack] = []
-            blocked_counts: dict[Literal["bpm_delta", "genre_run_length", "duration_target"], int] = {
-                "bpm_delta": 0,
-                "genre_run_length": 0,
-                "duration_target": 0,
-            }
-            for candidate in remaining.values():
-                failed_constraints = self._hard_constraint_failures(request, output, previous_track, candidate)
-                if not failed_constraints:
-                    hard_filtered.append(candidate)
-                    continue
-                for failed_constraint in failed_constraints:
-                    blocked_counts[failed_constraint] += 1
-
-            if not hard_filtered:
-                blocked_constraints = [
-                    constraint for constraint, count in blocked_counts.items() if count > 0
-                ]
-                raise PlaylistConstraintsInfeasibleError(
-                    error=PlaylistGenerationError(
-                        code="playlist_constraints_infeasible",
-                        message=(
-                            f"No candidate satisfies hard constraints at slot {slot}; "
-                            f"generated {len(output)} of {request.desired_count} requested entries"
-                        ),
-                        slot=slot,
-                        generated_entries=len(output),
-                        blocked_constraints=blocked_constraints,
-                        blocked_counts=blocked_counts,
-                    )
+
+            ranked = self._rank_candidates(prepared, state, previous_track, target_energy, limit=1)
+            if not ranked:
+                raise self._infeasible_error(request, slot, state, previous_track, prepared.pool.remaining())
+
+            chosen = ranked[0]
+            entry, transition = self._build_entry(request, target_energy, previous_track, chosen)
+            prepared.pool.remove(chosen)
+            state.advance(chosen)
+            previous_track = entry
+            yield entry, transition
+
+    def _generate_beam(self, prepared: _PreparedRequest) -> PlaylistGenerationResult:
+        """Keep the ``beam_width`` best partial sequences by the reported quality scores.
+
+        Each slot expands every kept sequence by its ``beam_width`` best candidates under
+        the greedy score. Once ``time_budget_ms`` is spent, the best sequences so far are
+        finished greedily instead, so work past the budget is at most ``beam_width`` greedy passes.
+        """
+        request = prepared.request
+        deadline = None if request.time_budget_ms is None else monotonic() + request.time_budget_ms / 1000
+        beams = [_BeamNode(state=_SlotState.for_request(request, prepared.seed_artists))]
+
+        for slot in range(request.desired_count):
+            if deadline is not None and monotonic() >= deadline:
+                return self._finish_beams_greedily(prepared, beams, slot)
+
+            target_energy = self._target_energy_for_slot(request, slot)
+            expansions: list[_BeamNode] = []
+            for beam in beams:
+                previous_track = beam.entries[-1] if beam.entries else None
+                for chosen in self._rank_candidates(
+                    prepared, beam.state, previous_track, target_energy, limit=request.beam_width, exclude=beam.used
+                ):
+                    expansions.append(self._extend_beam(request, beam, target_energy, chosen))
+
+            if not expansions:
+                best = beams[0]
+                raise self._infeasible_error(
+                    request,
+                    slot,
+                    best.state,
+                    best.entries[-1] if best.entries else None,
+                    self._unused_candidates(prepared, best),
                 )
+            # Stable sort keeps earlier beams and better-ranked candidates ahead on equal objectives.
+            expansions.sort(key=lambda node: node.objective(), reverse=True)
+            beams = expansions[: request.beam_width]
+
+        best = beams[0]
+        return self._build_result(request, best.entries, best.transition_scores)
+
+    def _finish_beams_greedily(
+        self,
+        prepared: _PreparedRequest,
+        beams: list[_BeamNode],
+        start_slot: int,
+    ) -> PlaylistGenerationResult:
+        request = prepared.request
+        errors: list[PlaylistConstraintsInfeasibleError] = []
+        for beam in beams:
+            node = beam
+            for slot in range(start_slot, request.desired_count):
+                target_energy = self._target_energy_for_slot(request, slot)
+                previous_track = node.entries[-1] if node.entries else None
+                ranked = self._rank_candidates(
+                    prepared, node.state, previous_track, target_energy, limit=1, exclude=node.used
+                )
+                if not ranked:
+                    errors.append(
+                        self._infeasible_error(
+                            request, slot, node.state, previous_track, self._unused_candidates(prepared, node)
+                        )
+                    )
+                    break
+                node = self._extend_beam(request, node, target_energy, ranked[0])
+            else:
+                return self._build_result(request, node.entries, node.transition_scores)
 
-            # Optimized: Use max() instead of sorted() since we only need the top candidate.
-            # This reduces complexity from O(N log N) to O(N) per slot.
-            chosen = max(
-                hard_filtered,
-                key=lambda candidate: self._candidate_score(
+        raise errors[0]
+
+    def _extend_beam(
+        self,
+        request: PlaylistGenerationRequest,
+        beam: _BeamNode,
+        target_energy: int,
+        chosen: _OptimizedTrack,
+    ) -> _BeamNode:
+        previous_track = beam.entries[-1] if beam.entries else None
+        entry, transition = self._build_entry(request, target_energy, previous_track, chosen)
+        state = beam.state.fork()
+        state.advance(chosen)
+        flow_penalty = beam.flow_penalty
+        if previous_track is not None:
+            flow_penalty += self._energy_flow_penalty(request, entry.energy - previous_track.energy)
+        return _BeamNode(
+            state=state,
+            entries=[*beam.entries, entry],
+            transition_scores=[*beam.transition_scores, transition],
+            used=beam.used | {chosen.position},
+            flow_penalty=flow_penalty,
+        )
+
+    def _unused_candidates(self, prepared: _PreparedRequest, beam: _BeamNode) -> Iterator[_OptimizedTrack]:
+        return (candidate for candidate in prepared.pool.remaining() if candidate.position not in beam.used)
+
+    def _build_entry(
+        self,
+        request: PlaylistGenerationRequest,
+        target_energy: int,
+        previous_track: PlaylistEntry | None,
+        chosen: _OptimizedTrack,
+    ) -> tuple[PlaylistEntry, float]:
+        transition = 1.0 if previous_track is None else self._transition_score(previous_track, chosen)
+        chosen_track = chosen.track
+        entry = PlaylistEntry(
+            track_id=chosen_track.id,
+            title=chosen_track.title,
+            artist=chosen_track.artist,
+            genre=chosen_track.genre,
+            mood=chosen_track.mood,
+            energy=chosen_track.energy,
+            bpm=chosen_track.bpm,
+            duration_seconds=chosen_track.duration_seconds,
+            transition_score=round(transition, 3),
+            selection_reason=self._selection_reason(request, target_energy, previous_track, chosen),
+        )
+        return entry, transition
+
+    def _build_result(
+        self,
+        request: PlaylistGenerationRequest,
+        entries: list[PlaylistEntry],
+        transition_scores: list[float],
+    ) -> PlaylistGenerationResult:
+        return PlaylistGenerationResult(
+            entries=entries,
+            average_transition_score=round(sum(transition_scores) / len(transition_scores), 3),
+            energy_flow_score=round(self._energy_flow_score(entries, request), 3),
+            total_duration_seconds=sum(entry.duration_seconds for entry in entries),
+        )
+
+    def _excluded_genre(self, request: PlaylistGenerationRequest, state: _SlotState) -> str | None:
+        if state.run_length >= request.max_consecutive_same_genre:
+            return state.run_genre
+        return None
+
+    def _max_candidate_duration(self, request: PlaylistGenerationRequest, state: _SlotState) -> int | None:
+        if request.target_duration_seconds is None:
+            return None
+        min_future = (request.desired_count - state.filled - 1) * 30
+        return request.target_duration_seconds - state.accumulated_duration - min_future
+
+    def _rank_candidates(
+        self,
+        prepared: _PreparedRequest,
+        state: _SlotState,
+        previous_track: PlaylistEntry | None,
+        target_energy: int,
+        limit: int,
+        exclude: frozenset[int] = frozenset(),
+    ) -> list[_OptimizedTrack]:
+        """Return up to ``limit`` candidates passing every hard constraint, best first."""
+        request = prepared.request
+        excluded_genre = self._excluded_genre(request, state)
+        max_duration = self._max_candidate_duration(request, state)
+        if isinstance(prepared.pool, _ColumnarCandidatePool):
+            return prepared.pool.rank(request, state, target_energy, excluded_genre, max_duration, limit, exclude)
+
+        if previous_track is None:
+            candidates = prepared.pool.remaining()
+        else:
+            candidates = prepared.pool.window(previous_track.bpm, request.max_bpm_delta, excluded_genre)
+        if max_duration is not None:
+            candidates = (candidate for candidate in candidates if candidate.track.duration_seconds <= max_duration)
+        if exclude:
+            candidates = (candidate for candidate in candidates if candidate.position not in exclude)
+
+        # Pre-compute previous track attributes to avoid re-calculating in inner loop
+        prev_mood_lower = previous_track.mood.lower() if previous_track else None
+        prev_genre_lower = previous_track.genre.lower() if previous_track else None
+        recent_artists = set(state.recent_artists)
+        # Optimized: nlargest(1, ...) is a single max() pass, not a sort.
+        # Index buckets are not in request order, so ties fall back to the lowest position,
+        # which is the candidate a request-ordered scan would have kept.
+        return nlargest(
+            limit,
+            candidates,
+            key=lambda candidate: (
+                self._candidate_score(
                     candidate=candidate,
                     previous_track=previous_track,
                     target_energy=target_energy,
                     recent_artists=recent_artists,
-                    profile=profile,
-                    requested_genres=requested_genres,
+                    profile=prepared.profile,
+                    requested_genres=prepared.requested_genres,
                     prev_mood_lower=prev_mood_lower,
                     prev_genre_lower=prev_genre_lower,
                 ),
-            )
-
-            transition = 1.0 if previous_track is None else self._transition_score(previous_track, chosen, prev_mood_lower, prev_genre_lower)
-            transition_scores.append(transition)
+                -candidate.position,
+            ),
+        )
 
-            chosen_track = chosen.track
-            output.append(
-                PlaylistEntry(
-                    track_id=chosen_track.id,
-                    title=chosen_track.title,
-                    artist=chosen_track.artist,
-                    genre=chosen_track.genre,
-                    mood=chosen_track.mood,
-                    energy=chosen_track.energy,
-                    bpm=chosen_track.bpm,
-                    duration_seconds=chosen_track.duration_seconds,
-                    transition_score=round(transition, 3),
-                    selection_reason=self._selection_reason(request, target_energy, previous_track, chosen),
-                )
+    def _infeasible_error(
+        self,
+        request: PlaylistGenerationRequest,
+        slot: int,
+        state: _SlotState,
+        previous_track: PlaylistEntry | None,
+        remaining: Iterable[_OptimizedTrack],
+    ) -> PlaylistConstraintsInfeasibleError:
+        # Only the failing slot pays for a full scan, to report accurate blocked counts.
+        blocked_counts: dict[Literal["bpm_delta", "genre_run_length", "duration_target"], int] = {
+            "bpm_delta": 0,
+            "genre_run_length": 0,
+            "duration_target": 0,
+        }
+        for candidate in remaining:
+            for failed_constraint in self._hard_constraint_failures(request, state, previous_track, candidate):
+                blocked_counts[failed_constraint] += 1
+        blocked_constraints = [constraint for constraint, count in blocked_counts.items() if count > 0]
+        return PlaylistConstraintsInfeasibleError(
+            error=PlaylistGenerationError(
+                code="playlist_constraints_infeasible",
+                message=(
+                    f"No candidate satisfies hard constraints at slot {slot}; "
+                    f"generated {state.filled} of {request.desired_count} requested entries"
+                ),
+                slot=slot,
+                generated_entries=state.filled,
+                blocked_constraints=blocked_constraints,
+                blocked_counts=blocked_counts,
             )
-            del remaining[chosen_track.id]
-
-        return PlaylistGenerationResult(
-            entries=output,
-            average_transition_score=round(sum(transition_scores) / len(transition_scores), 3),
-            energy_flow_score=round(self._energy_flow_score(output, request), 3),
-            total_duration_seconds=sum(entry.duration_seconds for entry in output),
         )
 
     def _hard_constraint_failures(
         self,
         request: PlaylistGenerationRequest,
-        output: list[PlaylistEntry],
+        state: _SlotState,
         previous_track: PlaylistEntry | None,
         candidate: _OptimizedTrack,
     ) -> list[Literal["bpm_delta", "genre_run_length", "duration_target"]]:
@@ -221,27 +976,18 @@ class PlaylistGenerationService:
         if previous_track is not None and abs(previous_track.bpm - candidate.track.bpm) > request.max_bpm_delta:
             failures.append("bpm_delta")
 
-        if output:
-            run_length = 0
-            for existing in reversed(output):
-                if existing.genre.lower() == candidate.genre_lower:
-                    run_length += 1
-                else:
-                    break
-            if run_length >= request.max_consecutive_same_genre:
-                failures.append("genre_run_length")
+        if candidate.genre_lower == state.run_genre and state.run_length >= request.max_consecutive_same_genre:
+            failures.append("genre_run_length")
 
         if request.target_duration_seconds is not None:
-            accumulated = sum(entry.duration_seconds for entry in output)
-            remaining_slots = request.desired_count - len(output)
-            projected = accumulated + candidate.track.duration_seconds
+            remaining_slots = request.desired_count - state.filled
+            projected = state.accumulated_duration + candidate.track.duration_seconds
             min_future = (remaining_slots - 1) * 30
             if projected + min_future > request.target_duration_seconds:
                 failures.append("duration_target")
 
         return failures
 
-
     def _target_energy_for_slot(self, request: PlaylistGenerationRequest, slot: int) -> int:
         base = TIME_OF_DAY_PROFILE[request.start_hour].target_energy
         if request.desired_count == 1:
@@ -266,13 +1012,8 @@ class PlaylistGenerationService:
         prev_genre_lower: str | None,
     ) -> float:
         score = 0.0
-        energy_delta = abs(candidate.track.energy - target_energy)
-        score += max(0, 1 - (energy_delta / 10))
-
-        if requested_genres:
-            score += 0.5 if candidate.genre_lower in requested_genres else -0.2
-        elif candidate.genre_lower in profile.preferred_genres:
-            score += 0.35
+        score += _energy_term(abs(candidate.track.energy - target_energy))
+        score += _genre_term(candidate.genre_lower, requested_genres, profile)
 
         if candidate.artist_norm in recent_artists:
             score -= 0.6
@@ -289,19 +1030,14 @@ class PlaylistGenerationService:
         prev_mood_lower: str | None = None,
         prev_genre_lower: str | None = None,
     ) -> float:
-        bpm_gap = abs(previous.bpm - current.track.bpm)
-        bpm_score = max(0.0, 1 - (bpm_gap / 35))
-
         p_mood = prev_mood_lower if prev_mood_lower is not None else previous.mood.lower()
-        mood_score = 1.0 if p_mood == current.mood_lower else 0.65
-
-        previous_artist_norm = self._normalize_artist(previous.artist)
-        artist_score = 0.0 if previous_artist_norm == current.artist_norm else 1.0
-
         p_genre = prev_genre_lower if prev_genre_lower is not None else previous.genre.lower()
-        genre_score = 1.0 if p_genre == current.genre_lower else 0.75
-
-        return round((bpm_score * 0.35) + (mood_score * 0.25) + (artist_score * 0.25) + (genre_score * 0.15), 3)
+        return _transition_value(
+            bpm_gap=abs(previous.bpm - current.track.bpm),
+            same_mood=p_mood == current.mood_lower,
+            same_artist=self._normalize_artist(previous.artist) == current.artist_norm,
+            same_genre=p_genre == current.genre_lower,
+        )
 
     def _selection_reason(
         self,
@@ -323,18 +1059,25 @@ class PlaylistGenerationService:
 
         penalties = 0.0
         for idx in range(1, len(entries)):
-            delta = entries[idx].energy - entries[idx - 1].energy
-            if request.energy_curve == "build" and delta < 0:
-                penalties += abs(delta)
-            elif request.energy_curve == "cooldown" and delta > 0:
-                penalties += abs(delta)
-            elif request.energy_curve == "steady" and abs(delta) > 2:
-                penalties += abs(delta) - 2
+            penalties += self._energy_flow_penalty(request, entries[idx].energy - entries[idx - 1].energy)
 
         return max(0.0, round(1 - (penalties / (len(entries) * 4)), 3))
 
+    def _energy_flow_penalty(self, request: PlaylistGenerationRequest, delta: int) -> int:
+        if request.energy_curve == "build" and delta < 0:
+            return abs(delta)
+        if request.energy_curve == "cooldown" and delta > 0:
+            return abs(delta)
+        if request.energy_curve == "steady" and abs(delta) > 2:
+            return abs(delta) - 2
+        return 0
+
 
 class PlaylistConstraintsInfeasibleError(Exception):
     def __init__(self, error: PlaylistGenerationError) -> None:
         super().__init__(error.message)
         self.error = error
+
+
+class PlaylistCandidateShortageError(ValueError):
+    """A library request asked for more entries than the (filtered) library holds."""
@@ -150,9 +150,10 @@ def write_policy(
 def read_effective_policy(
     show_id: Optional[str] = Query(default=None),
     timeslot_id: Optional[str] = Query(default=None),
+    at: Optional[datetime] = Query(default=None),
     service: AutonomyPolicyService = Depends(get_policy_service),
 ):
-    return service.resolve_effective_policy(show_id=show_id, timeslot_id=timeslot_id)
+    return service.resolve_effective_policy(show_id=show_id, timeslot_id=timeslot_id, at=at)
 
 
 @router.get("/mode-definitions")
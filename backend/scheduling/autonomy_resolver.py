@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from .autonomy_policy import (
+    AutonomyPolicy,
+    EffectivePolicyDecision,
+    GlobalMode,
+    PermissionMatrix,
+    TimeslotOverride,
+)
+
+WEEK_DAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+
+@dataclass(frozen=True)
+class _Resolution:
+    mode: GlobalMode
+    permissions: PermissionMatrix
+    source: str
+    timeslot_id: Optional[str] = None
+
+
+class CompiledAutonomyPolicy:
+    """Lookup tables for one ``AutonomyPolicy`` version, so each resolution is O(1).
+
+    Timeslot and show overrides are indexed by id; timeslot overrides are also laid
+    out on a 7x1440 minute-of-week table per scope (station-wide, plus one per show
+    that has show-scoped slots). A slot whose end is before its start runs past
+    midnight into the next day; equal start and end covers nothing. Where slots in
+    one scope overlap (a validated policy has none), the earlier one in the policy wins,
+    matching the order the linear scan used.
+    """
+
+    def __init__(self, policy: AutonomyPolicy) -> None:
+        self.policy = policy
+        self._default = self._resolution(policy.station_default_mode, None, "station_default")
+        self._timeslots: Dict[str, _Resolution] = {}
+        for override in policy.timeslot_overrides:
+            self._timeslots.setdefault(
+                override.id,
+                self._resolution(override.mode, override.permissions, "timeslot_override", override.id),
+            )
+        self._shows: Dict[str, _Resolution] = {}
+        for override in policy.show_overrides:
+            self._shows.setdefault(
+                override.show_id,
+                self._resolution(override.mode, override.permissions, "show_override"),
+            )
+
+        self._station_table: Optional[List[Optional[_Resolution]]] = None
+        self._show_tables: Dict[str, List[Optional[_Resolution]]] = {}
+        # Reversed so earlier overrides overwrite later ones: first in policy order wins.
+        for override in reversed(policy.timeslot_overrides):
+            if override.show_id is None:
+                if self._station_table is None:
+                    self._station_table = [None] * MINUTES_PER_WEEK
+                table = self._station_table
+            else:
+                table = self._show_tables.setdefault(override.show_id, [None] * MINUTES_PER_WEEK)
+            resolution = self._timeslots[override.id]
+            for start, end in _week_ranges(override):
+                table[start:end] = [resolution] * (end - start)
+
+    def resolve(
+        self,
+        show_id: Optional[str] = None,
+        timeslot_id: Optional[str] = None,
+        at: Optional[datetime] = None,
+    ) -> EffectivePolicyDecision:
+        """Precedence: timeslot by id, then timeslot covering ``at``'s wall-clock time, then show, then station."""
+        resolution = self._timeslots.get(timeslot_id) if timeslot_id else None
+        if resolution is None and at is not None:
+            resolution = self._at_minute(show_id, at.weekday() * MINUTES_PER_DAY + at.hour * 60 + at.minute)
+        if resolution is None and show_id:
+            resolution = self._shows.get(show_id)
+        return self._decision(resolution or self._default, show_id, timeslot_id)
+
+    def resolve_many(self, times: Iterable[datetime], show_id: Optional[str] = None) -> List[EffectivePolicyDecision]:
+        """Time-based resolution for each instant in ``times``, e.g. every slot of a day being planned."""
+        return [self.resolve(show_id=show_id, at=at) for at in times]
+
+    def _at_minute(self, show_id: Optional[str], minute: int) -> Optional[_Resolution]:
+        if show_id:
+            table = self._show_tables.get(show_id)
+            if table is not None and table[minute] is not None:
+                return table[minute]
+        return self._station_table[minute] if self._station_table is not None else None
+
+    def _resolution(
+        self,
+        mode: GlobalMode,
+        permissions: Optional[PermissionMatrix],
+        source: str,
+        timeslot_id: Optional[str] = None,
+    ) -> _Resolution:
+        return _Resolution(
+            mode=mode,
+            permissions=permissions if permissions else self.policy.mode_permissions[mode],
+            source=source,
+            timeslot_id=timeslot_id,
+        )
+
+    @staticmethod
+    def _decision(
+        resolution: _Resolution,
+        show_id: Optional[str],
+        timeslot_id: Optional[str],
+    ) -> EffectivePolicyDecision:
+        return EffectivePolicyDecision(
+            show_id=show_id,
+            timeslot_id=timeslot_id or resolution.timeslot_id,
+            mode=resolution.mode,
+            permissions=resolution.permissions,
+            source=resolution.source,
+        )
+
+
+def _week_ranges(override: TimeslotOverride) -> List[tuple[int, int]]:
+    day_start = WEEK_DAYS.index(override.day_of_week) * MINUTES_PER_DAY
+    start = day_start + _minutes(override.start_time)
+    end = day_start + _minutes(override.end_time)
+    if end >= start:
+        return [(start, end)]
+    # Overnight: runs to midnight, then into the next day (Sunday wraps to Monday).
+    end += MINUTES_PER_DAY
+    if end <= MINUTES_PER_WEEK:
+        return [(start, end)]
+    return [(start, MINUTES_PER_WEEK), (0, end - MINUTES_PER_WEEK)]
+
+
+def _minutes(value: str) -> int:
+    hours, minutes = value.split(":", maxsplit=1)
+    return int(hours) * 60 + int(minutes)
@@ -6,7 +6,7 @@ import shutil
 import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterable, List, Optional
 from uuid import uuid4
 
 from backend.security.approval_policy import ApprovalRecord
@@ -25,6 +25,7 @@ from .autonomy_policy import (
     GlobalMode,
     PolicyAuditEvent,
 )
+from .autonomy_resolver import CompiledAutonomyPolicy
 from .conflict_detection import PolicyConflict, detect_policy_conflicts
 from .observability import emit_scheduler_event
 
@@ -50,6 +51,7 @@ class AutonomyPolicyService:
         self,
         policy_path: Path = Path("config/autonomy_policy.json"),
         audit_log_path: Path = Path("config/logs/autonomy_audit_events.jsonl"),
+        policy_refresh_seconds: float = 1.0,
     ) -> None:
         self.policy_path = policy_path
         self.audit_log_path = audit_log_path
@@ -60,6 +62,10 @@ class AutonomyPolicyService:
         self.security_audit_log_path.parent.mkdir(parents=True, exist_ok=True)
         self._cached_policy: Optional[AutonomyPolicy] = None
         self._last_mtime: Optional[float] = None
+        # Resolution re-checks the policy file at most this often; update_policy swaps it in immediately.
+        self.policy_refresh_seconds = policy_refresh_seconds
+        self._compiled: Optional[CompiledAutonomyPolicy] = None
+        self._compiled_checked_at = 0.0
 
     def get_policy(self) -> AutonomyPolicy:
         started = time.perf_counter()
@@ -250,6 +256,8 @@ class AutonomyPolicyService:
             self._last_mtime = self.policy_path.stat().st_mtime
         except OSError:
             self._last_mtime = None
+        self._compiled = CompiledAutonomyPolicy(payload)
+        self._compiled_checked_at = time.monotonic()
 
         return payload
 
@@ -263,51 +271,25 @@ class AutonomyPolicyService:
         self,
         show_id: Optional[str] = None,
         timeslot_id: Optional[str] = None,
+        at: Optional[datetime] = None,
     ) -> EffectivePolicyDecision:
-        policy = self.get_policy()
+        return self.compiled_policy().resolve(show_id=show_id, timeslot_id=timeslot_id, at=at)
 
-        if timeslot_id:
-            for timeslot_override in policy.timeslot_overrides:
-                if timeslot_override.id == timeslot_id:
-                    mode = timeslot_override.mode
-                    permissions = (
-                        timeslot_override.permissions
-                        if timeslot_override.permissions
-                        else policy.mode_permissions[mode]
-                    )
-                    return EffectivePolicyDecision(
-                        show_id=show_id,
-                        timeslot_id=timeslot_id,
-                        mode=mode,
-                        permissions=permissions,
-                        source="timeslot_override",
-                    )
-
-        if show_id:
-            for show_override in policy.show_overrides:
-                if show_override.show_id == show_id:
-                    mode = show_override.mode
-                    permissions = (
-                        show_override.permissions
-                        if show_override.permissions
-                        else policy.mode_permissions[mode]
-                    )
-                    return EffectivePolicyDecision(
-                        show_id=show_id,
-                        timeslot_id=timeslot_id,
-                        mode=mode,
-                        permissions=permissions,
-                        source="show_override",
-                    )
-
-        default_mode = policy.station_default_mode
-        return EffectivePolicyDecision(
-            show_id=show_id,
-            timeslot_id=timeslot_id,
-            mode=default_mode,
-            permissions=policy.mode_permissions[default_mode],
-            source="station_default",
-        )
+    def resolve_many(self, times: Iterable[datetime], show_id: Optional[str] = None) -> List[EffectivePolicyDecision]:
+        return self.compiled_policy().resolve_many(times, show_id=show_id)
+
+    def compiled_policy(self) -> CompiledAutonomyPolicy:
+        now = time.monotonic()
+        compiled = self._compiled
+        if compiled is not None and now - self._compiled_checked_at < self.policy_refresh_seconds:
+            return compiled
+
+        policy = self.get_policy()
+        if compiled is None or compiled.policy is not policy:
+            compiled = CompiledAutonomyPolicy(policy)
+            self._compiled = compiled
+        self._compiled_checked_at = now
+        return compiled
 
     def record_audit_event(
         self,
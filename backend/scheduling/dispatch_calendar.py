@@ -0,0 +1,340 @@
+"""Materialized dispatch calendar: every schedule occurrence over a rolling horizon.
+
+Schedules are expanded once into UTC occurrences kept in one list sorted by start,
+so "what is active at T" and "next N dispatches after T" are binary searches instead
+of walks over every record's spec. ``DispatchCalendar.update`` diffs the incoming
+schedules by id and re-expands only the ones that changed.
+
+Supported specs: ``one_off`` run_at; five-field ``cron`` (numbers, ``*``, lists,
+ranges and steps); ``rrule`` with FREQ=DAILY|WEEKLY, INTERVAL, BYDAY, BYHOUR,
+BYMINUTE, UNTIL and the station's DURATION_MINUTES extension (default 60, as in the
+timeline). Cron and one-off occurrences are instants. Wall-clock times are taken in
+the schedule's timezone, so DST shifts move the UTC instant, not the local time.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from operator import itemgetter
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from .scheduler_models import (
+    DispatchOccurrence,
+    ScheduleRecord,
+    ScheduleSpecMode,
+    UiState,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HORIZON = timedelta(days=14)
+# Occurrences that started up to this long ago stay indexed so long blocks still answer active_at(now).
+_RETENTION = timedelta(days=1)
+_DEFAULT_RRULE_DURATION_MINUTES = 60
+_RRULE_DAYS = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6}
+_CRON_FIELD_RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+# (start_utc, schedule_id, end_utc)
+_Entry = tuple[datetime, str, datetime]
+_start_of = itemgetter(0)
+
+
+@dataclass(frozen=True)
+class _ScheduleInfo:
+    name: str
+    timezone: str
+    priority: int
+    mode: ScheduleSpecMode
+
+
+class DispatchCalendar:
+    """Sorted, timezone-aware occurrence index over ``[now - 1 day, now + horizon)``.
+
+    The horizon rolls forward lazily on each query once a new UTC day has begun.
+    Lookups outside it raise ``ValueError``.
+    """
+
+    def __init__(
+        self,
+        horizon: timedelta = DEFAULT_HORIZON,
+        clock: Callable[[], datetime] | None = None,
+    ) -> None:
+        if horizon <= timedelta(0):
+            raise ValueError("horizon must be positive")
+        self._horizon = horizon
+        self._clock = clock or (lambda: datetime.now(timezone.utc))
+        self._lock = threading.Lock()
+        self._records: dict[str, ScheduleRecord] = {}
+        self._info: dict[str, _ScheduleInfo] = {}
+        self._by_schedule: dict[str, list[_Entry]] = {}
+        self._entries: list[_Entry] = []
+        # Upper bound on occurrence length; bounds how far back active_at has to look.
+        self._max_duration = timedelta(0)
+        self._horizon_start, self._horizon_end = self._horizon_for(self._clock())
+
+    def update(self, schedules: list[ScheduleRecord]) -> int:
+        """Sync with ``schedules`` and return how many schedules were re-expanded."""
+        with self._lock:
+            self._roll()
+            incoming = {schedule.id: schedule for schedule in schedules}
+            changed = [
+                schedule
+                for schedule in incoming.values()
+                if self._records.get(schedule.id) is not schedule and self._records.get(schedule.id) != schedule
+            ]
+            for schedule_id in [*(sid for sid in self._records if sid not in incoming), *(s.id for s in changed)]:
+                self._remove(schedule_id)
+            self._records = incoming
+            for schedule in changed:
+                self._add(schedule, self._horizon_start, self._horizon_end)
+            return len(changed)
+
+    def active_at(self, at: datetime) -> list[DispatchOccurrence]:
+        """Occurrences covering ``at`` (instants match their exact start), highest priority first."""
+        at = _as_utc(at)
+        with self._lock:
+            self._roll()
+            self._check_in_horizon(at)
+            low = bisect_left(self._entries, at - self._max_duration, key=_start_of)
+            high = bisect_right(self._entries, at, key=_start_of)
+            active = [entry for entry in self._entries[low:high] if at < entry[2] or at == entry[0] == entry[2]]
+            occurrences = [self._occurrence(entry) for entry in active]
+        return sorted(occurrences, key=lambda item: (-item.priority, item.starts_at, item.schedule_id))
+
+    def next_after(self, after: datetime, limit: int = 10) -> list[DispatchOccurrence]:
+        """The first ``limit`` occurrences starting strictly after ``after``, within the horizon."""
+        after = _as_utc(after)
+        with self._lock:
+            self._roll()
+            self._check_in_horizon(after)
+            start = bisect_right(self._entries, after, key=_start_of)
+            return [self._occurrence(entry) for entry in self._entries[start : start + max(0, limit)]]
+
+    def between(self, start: datetime, end: datetime) -> list[DispatchOccurrence]:
+        """Occurrences starting in ``[start, end)``, clipped to the horizon."""
+        start, end = _as_utc(start), _as_utc(end)
+        if end <= start:
+            raise ValueError("calendar end must be after start")
+        with self._lock:
+            self._roll()
+            low = bisect_left(self._entries, start, key=_start_of)
+            high = bisect_left(self._entries, end, key=_start_of)
+            return [self._occurrence(entry) for entry in self._entries[low:high]]
+
+    def horizon(self) -> tuple[datetime, datetime]:
+        with self._lock:
+            self._roll()
+            return self._horizon_start, self._horizon_end
+
+    def _horizon_for(self, now: datetime) -> tuple[datetime, datetime]:
+        start = datetime.combine((_as_utc(now) - _RETENTION).date(), time(), tzinfo=timezone.utc)
+        return start, start + _RETENTION + self._horizon
+
+    def _roll(self) -> None:
+        new_start, new_end = self._horizon_for(self._clock())
+        if new_start <= self._horizon_start:
+            return
+        old_end = self._horizon_end
+        cut = bisect_left(self._entries, new_start, key=_start_of)
+        # Long occurrences that began before the new start but are still running stay indexed.
+        kept = [entry for entry in self._entries[:cut] if entry[2] > new_start]
+        self._entries = kept + self._entries[cut:]
+        for schedule_id, entries in self._by_schedule.items():
+            cut = bisect_left(entries, new_start, key=_start_of)
+            self._by_schedule[schedule_id] = [entry for entry in entries[:cut] if entry[2] > new_start] + entries[cut:]
+        self._horizon_start, self._horizon_end = new_start, new_end
+        for schedule in self._records.values():
+            self._add(schedule, max(old_end, new_start), new_end)
+
+    def _check_in_horizon(self, at: datetime) -> None:
+        if not self._horizon_start <= at < self._horizon_end:
+            raise ValueError(
+                f"{at.isoformat()} is outside the dispatch calendar horizon "
+                f"[{self._horizon_start.isoformat()}, {self._horizon_end.isoformat()})"
+            )
+
+    def _remove(self, schedule_id: str) -> None:
+        self._info.pop(schedule_id, None)
+        for entry in self._by_schedule.pop(schedule_id, ()):
+            del self._entries[bisect_left(self._entries, entry)]
+
+    def _add(self, schedule: ScheduleRecord, start: datetime, end: datetime) -> None:
+        info = _schedule_info(schedule)
+        if info is None:
+            return
+        self._info[schedule.id] = info
+        try:
+            entries = [
+                (occurrence_start, schedule.id, occurrence_start + duration)
+                for occurrence_start, duration in _expand(schedule, start, end)
+            ]
+        except (ValueError, ZoneInfoNotFoundError) as error:
+            logger.warning("Skipping dispatch calendar for schedule_id=%s: %s", schedule.id, error)
+            return
+        for entry in entries:
+            insort(self._entries, entry)
+            self._max_duration = max(self._max_duration, entry[2] - entry[0])
+        self._by_schedule.setdefault(schedule.id, []).extend(entries)
+        self._by_schedule[schedule.id].sort()
+
+    def _occurrence(self, entry: _Entry) -> DispatchOccurrence:
+        info = self._info[entry[1]]
+        return DispatchOccurrence(
+            schedule_id=entry[1],
+            schedule_name=info.name,
+            starts_at=entry[0],
+            ends_at=entry[2],
+            timezone=info.timezone,
+            priority=info.priority,
+            mode=info.mode,
+        )
+
+
+def _schedule_info(schedule: ScheduleRecord) -> _ScheduleInfo | None:
+    spec = schedule.effective_schedule_spec()
+    if not schedule.enabled or schedule.effective_ui_state() != UiState.active or spec is None:
+        return None
+    return _ScheduleInfo(
+        name=schedule.name,
+        timezone=schedule.effective_timezone() or "UTC",
+        priority=schedule.effective_priority() or 0,
+        mode=spec.mode,
+    )
+
+
+def _expand(schedule: ScheduleRecord, start: datetime, end: datetime) -> Iterator[tuple[datetime, timedelta]]:
+    """Yield ``(start_utc, duration)`` for occurrences starting in ``[start, end)`` and inside the schedule window."""
+    spec = schedule.effective_schedule_spec()
+    zone = ZoneInfo(schedule.effective_timezone() or "UTC")
+    start_window = schedule.effective_start_window()
+    end_window = schedule.effective_end_window()
+    if start_window is not None:
+        start = max(start, _parse_instant(start_window.value, zone))
+    if end_window is not None:
+        # The end window is inclusive, like the conflict detector's window checks.
+        end = min(end, _parse_instant(end_window.value, zone) + timedelta(microseconds=1))
+    if start >= end:
+        return
+
+    if spec.mode == ScheduleSpecMode.one_off:
+        run_at = _parse_instant(spec.run_at, zone)
+        if start <= run_at < end:
+            yield run_at, timedelta(0)
+        return
+
+    if spec.mode == ScheduleSpecMode.cron:
+        local_times = _cron_local_times(spec.cron)
+        duration = timedelta(0)
+    else:
+        anchor = (start_window and _parse_instant(start_window.value, zone).astimezone(zone).date()) or date(1970, 1, 5)
+        local_times, duration = _rrule_local_times(spec.rrule, anchor)
+
+    # Local dates that can hold a UTC instant in [start, end); one day of slack covers any offset.
+    day = start.astimezone(zone).date() - timedelta(days=1)
+    last_day = end.astimezone(zone).date() + timedelta(days=1)
+    while day <= last_day:
+        for wall_time in local_times(day):
+            occurrence = datetime.combine(day, wall_time, tzinfo=zone).astimezone(timezone.utc)
+            if start <= occurrence < end:
+                yield occurrence, duration
+        day += timedelta(days=1)
+
+
+def _cron_local_times(cron: str) -> Callable[[date], list[time]]:
+    fields = cron.split()
+    if len(fields) != 5:
+        raise ValueError(f"cron must use five fields: {cron!r}")
+    minutes, hours, days_of_month, months, days_of_week = (
+        _cron_values(field, low, high) for field, (low, high) in zip(fields, _CRON_FIELD_RANGES)
+    )
+    if 7 in days_of_week:
+        days_of_week = days_of_week | {0}
+    times = [time(hour, minute) for hour in sorted(hours) for minute in sorted(minutes)]
+    dom_restricted = fields[2] != "*"
+    dow_restricted = fields[4] != "*"
+
+    def _times(day: date) -> list[time]:
+        if day.month not in months:
+            return []
+        dom_match = day.day in days_of_month
+        dow_match = (day.weekday() + 1) % 7 in days_of_week
+        # Standard cron: when both day fields are restricted, either one matching is enough.
+        matches = (dom_match or dow_match) if dom_restricted and dow_restricted else (dom_match and dow_match)
+        return times if matches else []
+
+    return _times
+
+
+def _cron_values(field: str, low: int, high: int) -> frozenset[int]:
+    values: set[int] = set()
+    for part in field.split(","):
+        base, _, step_text = part.partition("/")
+        step = int(step_text) if step_text else 1
+        if base == "*":
+            first, last = low, high
+        elif "-" in base:
+            first_text, last_text = base.split("-", 1)
+            first, last = int(first_text), int(last_text)
+        else:
+            first = int(base)
+            last = high if step_text else first
+        if step <= 0 or not low <= first <= last <= high:
+            raise ValueError(f"cron field {field!r} is outside {low}-{high}")
+        values.update(range(first, last + 1, step))
+    return frozenset(values)
+
+
+def _rrule_local_times(rrule: str, anchor: date) -> tuple[Callable[[date], list[time]], timedelta]:
+    parts = dict(part.split("=", 1) for part in rrule.split(";") if "=" in part)
+    frequency = parts.get("FREQ")
+    if frequency not in {"DAILY", "WEEKLY"}:
+        raise ValueError(f"unsupported rrule FREQ={frequency}")
+    interval = int(parts.get("INTERVAL", "1"))
+    if interval <= 0:
+        raise ValueError("rrule INTERVAL must be positive")
+    if "BYDAY" in parts:
+        weekdays = {_rrule_weekday(code) for code in parts["BYDAY"].split(",")}
+    else:
+        weekdays = {anchor.weekday()} if frequency == "WEEKLY" else set(range(7))
+    hours = [int(value) for value in parts.get("BYHOUR", "0").split(",")]
+    minutes = [int(value) for value in parts.get("BYMINUTE", "0").split(",")]
+    times = sorted(time(hour, minute) for hour in hours for minute in minutes)
+    until = _parse_until(parts["UNTIL"]) if "UNTIL" in parts else None
+    duration = timedelta(minutes=int(parts.get("DURATION_MINUTES", str(_DEFAULT_RRULE_DURATION_MINUTES))))
+    anchor_week = anchor - timedelta(days=anchor.weekday())
+
+    def _times(day: date) -> list[time]:
+        if day < anchor or day.weekday() not in weekdays or (until is not None and day > until):
+            return []
+        period = (day - anchor_week).days // 7 if frequency == "WEEKLY" else (day - anchor).days
+        return times if period % interval == 0 else []
+
+    return _times, duration
+
+
+def _rrule_weekday(code: str) -> int:
+    weekday = _RRULE_DAYS.get(code.strip()[-2:])
+    if weekday is None:
+        raise ValueError(f"unsupported rrule BYDAY value {code!r}")
+    return weekday
+
+
+def _parse_until(value: str) -> date:
+    return datetime.strptime(value[:8], "%Y%m%d").date()
+
+
+def _parse_instant(value: str, zone: ZoneInfo) -> datetime:
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=zone)
+    return parsed.astimezone(timezone.utc)
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        raise ValueError("dispatch calendar lookups need a timezone-aware datetime")
+    return value.astimezone(timezone.utc)
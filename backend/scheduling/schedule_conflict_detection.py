@@ -1,19 +1,31 @@
 from __future__ import annotations
 
+import heapq
+import json
+import threading
+from bisect import bisect_left, insort
+from collections.abc import Callable, Iterator
 from dataclasses import dataclass
 from datetime import datetime
+from typing import TypeVar
 
 from .scheduler_models import (
     ConflictSuggestion,
     ConflictType,
     ScheduleConflict,
     ScheduleRecord,
+    ScheduleSpec,
     TimelineBlock,
     UiState,
     WEEK_DAYS,
 )
 
 
+_T = TypeVar("_T", int, datetime)
+# (timezone, priority, canonical schedule_spec JSON)
+_DispatchKey = tuple[str | None, int | None, str]
+
+
 @dataclass(frozen=True)
 class TimeSegment:
     schedule_id: str
@@ -61,189 +73,382 @@ def _detect_duplicate_ids(schedules: list[ScheduleRecord]) -> list[ScheduleConfl
 def _detect_duplicate_names(schedules: list[ScheduleRecord]) -> list[ScheduleConflict]:
     by_name: dict[str, list[ScheduleRecord]] = {}
     for schedule in schedules:
-        by_name.setdefault(schedule.name.strip().lower(), []).append(schedule)
+        by_name.setdefault(_name_key(schedule), []).append(schedule)
 
-    conflicts: list[ScheduleConflict] = []
-    for name_key, group in sorted(by_name.items()):
-        if len(group) < 2:
-            continue
-        conflicts.append(
-            ScheduleConflict(
-                conflict_type=ConflictType.duplicate_name,
-                schedule_ids=sorted(item.id for item in group),
-                message=f"Duplicate schedule name '{name_key}' detected (case-insensitive).",
-                suggestions=[
-                    ConflictSuggestion(
-                        action="rename_schedule",
-                        message="Rename one schedule so operators can distinguish entries quickly.",
-                    )
-                ],
-            )
-        )
-    return conflicts
+    return [
+        _duplicate_name_conflict(name_key, [item.id for item in group])
+        for name_key, group in sorted(by_name.items())
+        if len(group) >= 2
+    ]
 
 
 def _detect_invalid_windows(schedules: list[ScheduleRecord]) -> list[ScheduleConflict]:
-    conflicts: list[ScheduleConflict] = []
-    for schedule in sorted(schedules, key=lambda item: item.id):
-        start_window = schedule.effective_start_window()
-        end_window = schedule.effective_end_window()
-        if not start_window or not end_window:
-            continue
-        start = datetime.fromisoformat(start_window.value.replace("Z", "+00:00"))
-        end = datetime.fromisoformat(end_window.value.replace("Z", "+00:00"))
-        if start <= end:
-            continue
-        conflicts.append(
-            ScheduleConflict(
-                conflict_type=ConflictType.invalid_window,
-                schedule_ids=[schedule.id],
-                message=f"{schedule.name}: start_window must be <= end_window.",
-                suggestions=[
-                    ConflictSuggestion(
-                        action="swap_window_bounds",
-                        message="Swap start/end values or widen the active window.",
-                    )
-                ],
-            )
-        )
-    return conflicts
+    conflicts = (_invalid_window_conflict(schedule) for schedule in sorted(schedules, key=lambda item: item.id))
+    return [conflict for conflict in conflicts if conflict is not None]
 
 
 def _detect_template_ambiguity(schedules: list[ScheduleRecord]) -> list[ScheduleConflict]:
-    conflicts: list[ScheduleConflict] = []
-    for schedule in sorted(schedules, key=lambda item: item.id):
-        duplicate_override_keys = schedule.duplicate_override_keys()
-        if not duplicate_override_keys:
-            continue
-        keys = ", ".join(sorted(duplicate_override_keys))
-        conflicts.append(
-            ScheduleConflict(
-                conflict_type=ConflictType.template_ambiguity,
-                schedule_ids=[schedule.id],
-                message=f"{schedule.name} defines {keys} at top-level and in overrides.",
-                suggestions=[
-                    ConflictSuggestion(
-                        action="dedupe_override_keys",
-                        message="Keep each runtime field in only one location.",
-                    )
-                ],
-            )
-        )
-    return conflicts
+    conflicts = (_template_ambiguity_conflict(schedule) for schedule in sorted(schedules, key=lambda item: item.id))
+    return [conflict for conflict in conflicts if conflict is not None]
 
 
 def _detect_ambiguous_dispatch_conflicts(schedules: list[ScheduleRecord]) -> list[ScheduleConflict]:
-    # Optimization: Group schedules by (timezone, priority) to reduce O(N^2) complexity.
-    # We also pre-calculate expensive properties like bounds and specs.
+    # Only active schedules with the same timezone, priority and schedule_spec can be ambiguous, so
+    # group on all three (the spec by its canonical JSON) and sweep each group's windows for overlaps.
+    groups: dict[_DispatchKey, list[tuple[datetime, datetime, str]]] = {}
+    for schedule in schedules:
+        dispatch = _dispatch_entry(schedule)
+        if dispatch is not None:
+            key, start, end = dispatch
+            groups.setdefault(key, []).append((start, end, schedule.id))
 
-    @dataclass
-    class _CachedSchedule:
-        schedule: ScheduleRecord
-        spec_dump: dict | None
-        start: datetime | None
-        end: datetime | None
+    conflicts: list[ScheduleConflict] = []
+    for group in groups.values():
+        if len(group) < 2:
+            continue
+        # The model rejects start > end, but records built without validation can still carry one;
+        # those are checked against the whole group so the sweep below only sees ordered windows.
+        ordered = sorted(item for item in group if item[0] <= item[1])
+        inverted = [item for item in group if item[0] > item[1]]
+        pairs: list[tuple[str, str]] = [
+            (left[2], right[2]) for left, right in _overlapping_pairs(ordered, closed=True)
+        ]
+        for index, left in enumerate(inverted):
+            for right in ordered + inverted[index + 1 :]:
+                if left[0] <= right[1] and right[0] <= left[1]:
+                    pairs.append((left[2], right[2]))
+        conflicts.extend(_ambiguous_dispatch_conflict(left_id, right_id) for left_id, right_id in pairs)
+    return conflicts
 
-    groups: dict[tuple[str | None, int | None], list[_CachedSchedule]] = {}
 
-    # Sort for deterministic output
-    for schedule in sorted(schedules, key=lambda item: item.id):
-        if not schedule.enabled or schedule.effective_ui_state() != UiState.active:
-            continue
+def _detect_timeline_overlaps(timeline: list[TimelineBlock], schedules: list[ScheduleRecord]) -> list[ScheduleConflict]:
+    names = {schedule.id: schedule.name for schedule in schedules}
+    by_day: dict[str, list[tuple[int, int, str]]] = {day: [] for day in WEEK_DAYS}
+    for block in timeline:
+        for segment in _to_segments(block):
+            by_day[segment.day_of_week].append((segment.start_minute, segment.end_minute, segment.schedule_id))
+
+    return [
+        _overlap_conflict(day, left, right, names)
+        for day, segments in by_day.items()
+        for left, right in _overlapping_pairs(sorted(segments), closed=False)
+        if left[2] != right[2]
+    ]
+
+
+class ScheduleConflictIndex:
+    """Conflicts for the last schedule list it evaluated, kept up to date by diffing.
+
+    ``evaluate`` matches incoming records to cached ones by id and only rebuilds
+    timeline blocks and pair checks for records that were added, removed or
+    changed. Each changed record is checked against its interval neighbours on
+    the same day and the members of its dispatch group, so the cost follows the
+    size of the edit rather than the size of the schedule. The result always
+    equals ``detect_schedule_conflicts`` over the full list. A list with duplicate
+    ids cannot be matched by id and takes the full pass instead.
+    """
+
+    def __init__(self, build_blocks: Callable[[ScheduleRecord], list[TimelineBlock]]) -> None:
+        self._build_blocks = build_blocks
+        self._lock = threading.Lock()
+        self._reset()
+
+    def evaluate(self, schedules: list[ScheduleRecord]) -> tuple[list[TimelineBlock], list[ScheduleConflict]]:
+        """Return the timeline (in schedule order) and sorted conflicts for ``schedules``."""
+        with self._lock:
+            incoming = {schedule.id: schedule for schedule in schedules}
+            if len(incoming) != len(schedules):
+                self._reset()
+                timeline = [block for schedule in schedules for block in self._build_blocks(schedule)]
+                return timeline, detect_schedule_conflicts(schedules, timeline)
+
+            changed = [schedule for schedule in schedules if not self._is_cached(schedule)]
+            removed = [schedule_id for schedule_id in self._records if schedule_id not in incoming]
+            if changed or removed:
+                self._apply(incoming, changed, removed)
+            timeline = [block for schedule in schedules for block in self._blocks[schedule.id]]
+            return timeline, self._conflicts()
+
+    def _reset(self) -> None:
+        self._records: dict[str, ScheduleRecord] = {}
+        self._blocks: dict[str, list[TimelineBlock]] = {}
+        self._segments: dict[str, list[tuple[str, int, int]]] = {}
+        self._day_segments: dict[str, list[tuple[int, int, str]]] = {day: [] for day in WEEK_DAYS}
+        # Upper bound on segment length per day; bounds how far back a neighbour lookup must reach.
+        self._day_max_length: dict[str, int] = dict.fromkeys(WEEK_DAYS, 0)
+        self._dispatch: dict[str, tuple[_DispatchKey, datetime, datetime]] = {}
+        self._dispatch_groups: dict[_DispatchKey, dict[str, tuple[datetime, datetime]]] = {}
+        self._name_keys: dict[str, str] = {}
+        self._name_groups: dict[str, set[str]] = {}
+        self._name_conflicts: dict[str, ScheduleConflict] = {}
+        self._record_conflicts: dict[str, list[ScheduleConflict]] = {}
+        self._pair_conflicts: dict[tuple[str, str], list[ScheduleConflict]] = {}
+        self._partners: dict[str, set[str]] = {}
+
+    def _is_cached(self, schedule: ScheduleRecord) -> bool:
+        cached = self._records.get(schedule.id)
+        return cached is schedule or (cached is not None and cached == schedule)
+
+    def _apply(
+        self,
+        incoming: dict[str, ScheduleRecord],
+        changed: list[ScheduleRecord],
+        removed: list[str],
+    ) -> None:
+        touched_names = set()
+        for schedule_id in [*removed, *(schedule.id for schedule in changed)]:
+            touched_names.add(self._name_keys.get(schedule_id))
+            self._remove(schedule_id)
+        for schedule in changed:
+            self._add(schedule)
+            touched_names.add(self._name_keys[schedule.id])
+        self._records = incoming
+
+        dirty = {schedule.id for schedule in changed}
+        for schedule in changed:
+            self._check_neighbours(schedule.id, dirty)
+
+        for name_key in touched_names - {None}:
+            group = self._name_groups.get(name_key, ())
+            if len(group) >= 2:
+                self._name_conflicts[name_key] = _duplicate_name_conflict(name_key, list(group))
+            else:
+                self._name_conflicts.pop(name_key, None)
+
+    def _remove(self, schedule_id: str) -> None:
+        self._blocks.pop(schedule_id, None)
+        for day, start, end in self._segments.pop(schedule_id, ()):
+            day_segments = self._day_segments[day]
+            del day_segments[bisect_left(day_segments, (start, end, schedule_id))]
+        dispatch = self._dispatch.pop(schedule_id, None)
+        if dispatch is not None:
+            group = self._dispatch_groups[dispatch[0]]
+            del group[schedule_id]
+            if not group:
+                del self._dispatch_groups[dispatch[0]]
+        name_key = self._name_keys.pop(schedule_id, None)
+        if name_key is not None:
+            self._name_groups[name_key].discard(schedule_id)
+            if not self._name_groups[name_key]:
+                del self._name_groups[name_key]
+        self._record_conflicts.pop(schedule_id, None)
+        for partner in self._partners.pop(schedule_id, ()):
+            self._pair_conflicts.pop(_pair_key(schedule_id, partner), None)
+            self._partners[partner].discard(schedule_id)
+
+    def _add(self, schedule: ScheduleRecord) -> None:
+        blocks = self._build_blocks(schedule)
+        self._blocks[schedule.id] = blocks
+        segments = [
+            (segment.day_of_week, segment.start_minute, segment.end_minute)
+            for block in blocks
+            for segment in _to_segments(block)
+        ]
+        self._segments[schedule.id] = segments
+        for day, start, end in segments:
+            insort(self._day_segments[day], (start, end, schedule.id))
+            self._day_max_length[day] = max(self._day_max_length[day], end - start)
+
+        dispatch = _dispatch_entry(schedule)
+        if dispatch is not None:
+            self._dispatch[schedule.id] = dispatch
+            self._dispatch_groups.setdefault(dispatch[0], {})[schedule.id] = (dispatch[1], dispatch[2])
+
+        name_key = _name_key(schedule)
+        self._name_keys[schedule.id] = name_key
+        self._name_groups.setdefault(name_key, set()).add(schedule.id)
+
+        conflicts = (_invalid_window_conflict(schedule), _template_ambiguity_conflict(schedule))
+        self._record_conflicts[schedule.id] = [conflict for conflict in conflicts if conflict is not None]
+
+    def _check_neighbours(self, schedule_id: str, dirty: set[str]) -> None:
+        # When both records of a pair changed, only the one with the smaller id records it.
+        def _skip(other_id: str) -> bool:
+            return other_id == schedule_id or (other_id in dirty and other_id < schedule_id)
+
+        names = {schedule_id: self._records[schedule_id].name}
+        for day, start, end in self._segments[schedule_id]:
+            day_segments = self._day_segments[day]
+            low = bisect_left(day_segments, (start - self._day_max_length[day],))
+            high = bisect_left(day_segments, (end + 1,))
+            for other in day_segments[low:high]:
+                if _skip(other[2]):
+                    continue
+                left, right = sorted(((start, end, schedule_id), other))
+                if right[0] < left[1]:
+                    names.setdefault(other[2], self._records[other[2]].name)
+                    self._add_pair(schedule_id, other[2], _overlap_conflict(day, left, right, names))
+
+        dispatch = self._dispatch.get(schedule_id)
+        if dispatch is None:
+            return
+        key, start, end = dispatch
+        for other_id, (other_start, other_end) in self._dispatch_groups[key].items():
+            if not _skip(other_id) and start <= other_end and other_start <= end:
+                self._add_pair(schedule_id, other_id, _ambiguous_dispatch_conflict(schedule_id, other_id))
+
+    def _add_pair(self, left_id: str, right_id: str, conflict: ScheduleConflict) -> None:
+        self._pair_conflicts.setdefault(_pair_key(left_id, right_id), []).append(conflict)
+        self._partners.setdefault(left_id, set()).add(right_id)
+        self._partners.setdefault(right_id, set()).add(left_id)
+
+    def _conflicts(self) -> list[ScheduleConflict]:
+        conflicts = [*self._name_conflicts.values()]
+        for record_conflicts in self._record_conflicts.values():
+            conflicts.extend(record_conflicts)
+        for pair_conflicts in self._pair_conflicts.values():
+            conflicts.extend(pair_conflicts)
+        return sorted(conflicts, key=_conflict_sort_key)
+
+
+def _pair_key(left_id: str, right_id: str) -> tuple[str, str]:
+    return (left_id, right_id) if left_id <= right_id else (right_id, left_id)
+
+
+def _name_key(schedule: ScheduleRecord) -> str:
+    return schedule.name.strip().lower()
+
+
+def _dispatch_entry(schedule: ScheduleRecord) -> tuple[_DispatchKey, datetime, datetime] | None:
+    """Dispatch group key and window of an active schedule, or None if it cannot be ambiguous."""
+    if not schedule.enabled or schedule.effective_ui_state() != UiState.active:
+        return None
+    spec = schedule.effective_schedule_spec()
+    start, end = _effective_bounds(schedule)
+    if spec is None or start is None or end is None:
+        return None
+    return (schedule.effective_timezone(), schedule.effective_priority(), _canonical_spec(spec)), start, end
+
+
+def _duplicate_name_conflict(name_key: str, schedule_ids: list[str]) -> ScheduleConflict:
+    return ScheduleConflict(
+        conflict_type=ConflictType.duplicate_name,
+        schedule_ids=sorted(schedule_ids),
+        message=f"Duplicate schedule name '{name_key}' detected (case-insensitive).",
+        suggestions=[
+            ConflictSuggestion(
+                action="rename_schedule",
+                message="Rename one schedule so operators can distinguish entries quickly.",
+            )
+        ],
+    )
 
-        key = (schedule.effective_timezone(), schedule.effective_priority())
 
-        spec = schedule.effective_schedule_spec()
-        spec_dump = spec.model_dump() if spec else None
-        start, end = _effective_bounds(schedule)
+def _invalid_window_conflict(schedule: ScheduleRecord) -> ScheduleConflict | None:
+    start_window = schedule.effective_start_window()
+    end_window = schedule.effective_end_window()
+    if not start_window or not end_window:
+        return None
+    start = datetime.fromisoformat(start_window.value.replace("Z", "+00:00"))
+    end = datetime.fromisoformat(end_window.value.replace("Z", "+00:00"))
+    if start <= end:
+        return None
+    return ScheduleConflict(
+        conflict_type=ConflictType.invalid_window,
+        schedule_ids=[schedule.id],
+        message=f"{schedule.name}: start_window must be <= end_window.",
+        suggestions=[
+            ConflictSuggestion(
+                action="swap_window_bounds",
+                message="Swap start/end values or widen the active window.",
+            )
+        ],
+    )
 
-        groups.setdefault(key, []).append(_CachedSchedule(schedule, spec_dump, start, end))
 
-    conflicts: list[ScheduleConflict] = []
+def _template_ambiguity_conflict(schedule: ScheduleRecord) -> ScheduleConflict | None:
+    duplicate_override_keys = schedule.duplicate_override_keys()
+    if not duplicate_override_keys:
+        return None
+    keys = ", ".join(sorted(duplicate_override_keys))
+    return ScheduleConflict(
+        conflict_type=ConflictType.template_ambiguity,
+        schedule_ids=[schedule.id],
+        message=f"{schedule.name} defines {keys} at top-level and in overrides.",
+        suggestions=[
+            ConflictSuggestion(
+                action="dedupe_override_keys",
+                message="Keep each runtime field in only one location.",
+            )
+        ],
+    )
 
-    for group in groups.values():
-        if len(group) < 2:
-            continue
 
-        for index, left_cached in enumerate(group):
-            for right_cached in group[index + 1 :]:
-                # We already know timezone and priority match because they are in the same group.
+def _ambiguous_dispatch_conflict(left_id: str, right_id: str) -> ScheduleConflict:
+    return ScheduleConflict(
+        conflict_type=ConflictType.ambiguous_dispatch,
+        schedule_ids=sorted([left_id, right_id]),
+        message=(
+            "Active schedules have identical timezone, priority, schedule_spec, "
+            "and overlapping windows; dispatch precedence is ambiguous."
+        ),
+        suggestions=[
+            ConflictSuggestion(
+                action="change_priority",
+                message="Change one schedule priority to establish deterministic precedence.",
+            ),
+            ConflictSuggestion(
+                action="adjust_window",
+                message="Narrow one window to remove temporal overlap.",
+            ),
+        ],
+    )
 
-                if left_cached.spec_dump is None or right_cached.spec_dump is None:
-                    continue
-                if left_cached.spec_dump != right_cached.spec_dump:
-                    continue
 
-                if not all((left_cached.start, left_cached.end, right_cached.start, right_cached.end)):
-                    continue
+def _overlap_conflict(
+    day: str,
+    left: tuple[int, int, str],
+    right: tuple[int, int, str],
+    names: dict[str, str],
+) -> ScheduleConflict:
+    overlap_start = right[0]
+    overlap_end = min(left[1], right[1])
+    left_name = names.get(left[2], left[2])
+    right_name = names.get(right[2], right[2])
+    return ScheduleConflict(
+        conflict_type=ConflictType.overlap,
+        schedule_ids=sorted([left[2], right[2]]),
+        message=(
+            f"Overlap on {day.title()}: {left_name} conflicts with {right_name} during "
+            f"{_format_minutes(overlap_start)}-{_format_minutes(overlap_end)}."
+        ),
+        suggestions=[
+            ConflictSuggestion(
+                action="nudge_block",
+                message=f"Move one block so {day.title()} starts at or after {_format_minutes(overlap_end)}.",
+            ),
+            ConflictSuggestion(
+                action="shorten_duration",
+                message="Reduce one block duration to remove the overlap window.",
+            ),
+        ],
+    )
 
-                # Check overlap: start1 <= end2 AND start2 <= end1
-                if left_cached.start <= right_cached.end and right_cached.start <= left_cached.end:
-                    conflicts.append(
-                        ScheduleConflict(
-                            conflict_type=ConflictType.ambiguous_dispatch,
-                            schedule_ids=sorted([left_cached.schedule.id, right_cached.schedule.id]),
-                            message=(
-                                "Active schedules have identical timezone, priority, schedule_spec, "
-                                "and overlapping windows; dispatch precedence is ambiguous."
-                            ),
-                            suggestions=[
-                                ConflictSuggestion(
-                                    action="change_priority",
-                                    message="Change one schedule priority to establish deterministic precedence.",
-                                ),
-                                ConflictSuggestion(
-                                    action="adjust_window",
-                                    message="Narrow one window to remove temporal overlap.",
-                                ),
-                            ],
-                        )
-                    )
-    return conflicts
 
+def _overlapping_pairs(
+    intervals: list[tuple[_T, _T, str]],
+    *,
+    closed: bool,
+) -> Iterator[tuple[tuple[_T, _T, str], tuple[_T, _T, str]]]:
+    """Yield every overlapping ``(earlier, later)`` pair from intervals sorted by start.
 
-def _detect_timeline_overlaps(timeline: list[TimelineBlock], schedules: list[ScheduleRecord]) -> list[ScheduleConflict]:
-    schedule_map = {schedule.id: schedule for schedule in schedules}
-    by_day: dict[str, list[TimeSegment]] = {day: [] for day in WEEK_DAYS}
+    Sweep line: a heap keyed on end holds the intervals still open at the current
+    start, so each interval is pushed and popped once and every active entry it
+    meets is a real overlap, giving O(n log n + k) for k pairs. ``closed`` treats
+    intervals that only touch at an endpoint as overlapping.
+    """
+    active: list[tuple[_T, int, tuple[_T, _T, str]]] = []
+    for sequence, current in enumerate(intervals):
+        start = current[0]
+        while active and (active[0][0] < start if closed else active[0][0] <= start):
+            heapq.heappop(active)
+        for _, _, earlier in active:
+            yield earlier, current
+        heapq.heappush(active, (current[1], sequence, current))
 
-    for block in sorted(timeline, key=lambda item: (item.day_of_week, item.start_time, item.schedule_id)):
-        for segment in _to_segments(block):
-            by_day[segment.day_of_week].append(segment)
 
-    conflicts: list[ScheduleConflict] = []
-    for day, segments in by_day.items():
-        ordered = sorted(segments, key=lambda item: (item.start_minute, item.end_minute, item.schedule_id))
-        for index, left in enumerate(ordered):
-            for right in ordered[index + 1 :]:
-                if right.start_minute >= left.end_minute:
-                    break
-                if left.schedule_id == right.schedule_id:
-                    continue
-                overlap_start = max(left.start_minute, right.start_minute)
-                overlap_end = min(left.end_minute, right.end_minute)
-                left_name = schedule_map.get(left.schedule_id, left.schedule_id).name if left.schedule_id in schedule_map else left.schedule_id
-                right_name = schedule_map.get(right.schedule_id, right.schedule_id).name if right.schedule_id in schedule_map else right.schedule_id
-                conflicts.append(
-                    ScheduleConflict(
-                        conflict_type=ConflictType.overlap,
-                        schedule_ids=sorted([left.schedule_id, right.schedule_id]),
-                        message=(
-                            f"Overlap on {day.title()}: {left_name} conflicts with {right_name} during "
-                            f"{_format_minutes(overlap_start)}-{_format_minutes(overlap_end)}."
-                        ),
-                        suggestions=[
-                            ConflictSuggestion(
-                                action="nudge_block",
-                                message=f"Move one block so {day.title()} starts at or after {_format_minutes(overlap_end)}.",
-                            ),
-                            ConflictSuggestion(
-                                action="shorten_duration",
-                                message="Reduce one block duration to remove the overlap window.",
-                            ),
-                        ],
-                    )
-                )
-    return conflicts
+def _canonical_spec(spec: ScheduleSpec) -> str:
+    return json.dumps(spec.model_dump(mode="json"), sort_keys=True, separators=(",", ":"))
 
 
 def _effective_bounds(schedule: ScheduleRecord) -> tuple[datetime | None, datetime | None]:
@@ -263,12 +468,19 @@ def _to_segments(block: TimelineBlock) -> list[TimeSegment]:
     if block.overnight and end <= start:
         next_day = WEEK_DAYS[(WEEK_DAYS.index(block.day_of_week) + 1) % len(WEEK_DAYS)]
         return [
-            TimeSegment(schedule_id=block.schedule_id, day_of_week=block.day_of_week, start_minute=start, end_minute=24 * 60),
+            TimeSegment(
+                schedule_id=block.schedule_id,
+                day_of_week=block.day_of_week,
+                start_minute=start,
+                end_minute=24 * 60,
+            ),
             TimeSegment(schedule_id=block.schedule_id, day_of_week=next_day, start_minute=0, end_minute=end),
         ]
     if end < start:
         end = start
-    return [TimeSegment(schedule_id=block.schedule_id, day_of_week=block.day_of_week, start_minute=start, end_minute=end)]
+    return [
+        TimeSegment(schedule_id=block.schedule_id, day_of_week=block.day_of_week, start_minute=start, end_minute=end)
+    ]
 
 
 def _minutes(value: str) -> int:
@@ -0,0 +1,149 @@
+"""Process-wide, generation-numbered snapshots of a schedule file.
+
+Every ``SchedulerUiService`` pointed at the same file shares one
+``ScheduleSnapshotStore``. A read costs one ``stat`` while the file is unchanged;
+otherwise the file is read once, and only parsed again when its content hash
+differs from the current snapshot. Writes go to a temp file in the same
+directory and are renamed over the target, so readers never see a partial file.
+
+Snapshot envelopes are shared between services and threads and must be treated
+as read-only.
+"""
+from __future__ import annotations
+
+import os
+import stat
+import tempfile
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from backend.security.config_crypto import config_hash
+
+from .scheduler_models import ScheduleEnvelope
+
+# (st_mtime_ns, st_size, st_ino): a rename always changes the inode, a rewrite in place the mtime or size.
+_StatKey = tuple[int, int, int]
+# Parses file content into an envelope plus the canonical serialization it should be stored as.
+ScheduleParser = Callable[[str], tuple[ScheduleEnvelope, str]]
+# Mode for a newly created schedule file: what a plain open() gives under the usual 022 umask.
+_NEW_FILE_MODE = 0o644
+
+
+@dataclass(frozen=True)
+class ScheduleSnapshot:
+    generation: int
+    content_hash: str
+    envelope: ScheduleEnvelope
+
+
+class ScheduleSnapshotStore:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._snapshot: ScheduleSnapshot | None = None
+        self._stat_key: _StatKey | None = None
+
+    @property
+    def generation(self) -> int:
+        snapshot = self._snapshot
+        return 0 if snapshot is None else snapshot.generation
+
+    def read(
+        self,
+        parse: ScheduleParser,
+        default: Callable[[], tuple[ScheduleEnvelope, str]],
+        on_stat_error: Callable[[OSError], None] | None = None,
+    ) -> ScheduleSnapshot:
+        """Current snapshot, refreshed from disk if the file changed since the last read.
+
+        A missing file is created from ``default``. When the file cannot be stat'ed,
+        ``on_stat_error`` is told and the file is read anyway. ``parse`` errors
+        propagate and leave the previous snapshot in place.
+        """
+        snapshot, stat_key = self._snapshot, self._stat(on_stat_error)
+        if snapshot is not None and stat_key is not None and stat_key == self._stat_key:
+            return snapshot
+
+        with self._lock:
+            if self._snapshot is not None and stat_key is not None and stat_key == self._stat_key:
+                return self._snapshot
+            try:
+                content = self.path.read_text(encoding="utf-8")
+            except FileNotFoundError:
+                return self._publish(*default())
+
+            content_hash = config_hash(content)
+            if self._snapshot is not None and self._snapshot.content_hash == content_hash:
+                # Touched or rewritten with identical bytes: keep the parsed envelope.
+                self._stat_key = stat_key
+                return self._snapshot
+
+            envelope, serialized = parse(content)
+            if serialized != content:
+                return self._publish(envelope, serialized)
+            return self._install(envelope, content_hash, stat_key)
+
+    def write(self, envelope: ScheduleEnvelope, serialized: str) -> ScheduleSnapshot:
+        """Atomically replace the file with ``serialized`` and make ``envelope`` the current snapshot."""
+        with self._lock:
+            return self._publish(envelope, serialized)
+
+    def _publish(self, envelope: ScheduleEnvelope, serialized: str) -> ScheduleSnapshot:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(prefix=f".{self.path.name}.", suffix=".tmp", dir=self.path.parent)
+        try:
+            # mkstemp creates the file 0600; keep the target's permissions across the rename.
+            os.chmod(fd, self._file_mode())
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                handle.write(serialized)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(temp_name, self.path)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+        return self._install(envelope, config_hash(serialized), self._stat())
+
+    def _file_mode(self) -> int:
+        """Permission bits of the current file, or ``_NEW_FILE_MODE`` when it is missing or cannot be stat'ed."""
+        try:
+            return stat.S_IMODE(self.path.stat().st_mode)
+        except OSError:
+            return _NEW_FILE_MODE
+
+    def _install(self, envelope: ScheduleEnvelope, content_hash: str, stat_key: _StatKey | None) -> ScheduleSnapshot:
+        self._snapshot = ScheduleSnapshot(
+            generation=self.generation + 1,
+            content_hash=content_hash,
+            envelope=envelope,
+        )
+        self._stat_key = stat_key
+        return self._snapshot
+
+    def _stat(self, on_error: Callable[[OSError], None] | None = None) -> _StatKey | None:
+        """Cache key for the file, or None when it is missing or cannot be stat'ed (forcing a read)."""
+        try:
+            result = self.path.stat()
+        except FileNotFoundError:
+            return None
+        except OSError as error:
+            if on_error is not None:
+                on_error(error)
+            return None
+        return (result.st_mtime_ns, result.st_size, result.st_ino)
+
+
+_stores: dict[Path, ScheduleSnapshotStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_snapshot_store(path: Path) -> ScheduleSnapshotStore:
+    """The process-wide store for ``path``; services opening the same file share it."""
+    key = Path(os.path.abspath(path))
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = ScheduleSnapshotStore(path)
+        return store
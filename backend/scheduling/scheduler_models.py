@@ -314,6 +314,15 @@ class SchedulerUiState(BaseModel):
     conflicts: list[ScheduleConflict]
 
 
+class DispatchOccurrence(BaseModel):
+    schedule_id: str
+    schedule_name: str
+    starts_at: datetime
+    ends_at: datetime
+    timezone: str
+    priority: int
+    mode: ScheduleSpecMode
+
 
 
 class ApprovalChainEntry(BaseModel):
@@ -2,15 +2,17 @@ from __future__ import annotations
 
 import threading
 import json
+from datetime import datetime
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 
 from backend.security.approval_policy import ApprovalPolicyError
 from backend.security.auth import get_scheduler_api_key
 from backend.security.approval_policy import ApprovalContext, ApprovalRecord
 
 from .scheduler_models import (
+    DispatchOccurrence,
     PreviewRequest,
     ScheduleConflict,
     SchedulerUiState,
@@ -139,3 +141,38 @@ def preview_schedule_spec(
     service: SchedulerUiService = Depends(get_scheduler_service),
 ):
     return service.preview_schedule_spec(payload)
+
+
+@router.get("/calendar", response_model=list[DispatchOccurrence])
+def read_dispatch_calendar(
+    start: datetime | None = None,
+    end: datetime | None = None,
+    service: SchedulerUiService = Depends(get_scheduler_service),
+) -> list[DispatchOccurrence]:
+    try:
+        return service.calendar_occurrences(start, end)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+
+@router.get("/calendar/active", response_model=list[DispatchOccurrence])
+def read_active_dispatches(
+    at: datetime | None = None,
+    service: SchedulerUiService = Depends(get_scheduler_service),
+) -> list[DispatchOccurrence]:
+    try:
+        return service.active_dispatches(at)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+
+@router.get("/calendar/next", response_model=list[DispatchOccurrence])
+def read_next_dispatches(
+    after: datetime | None = None,
+    limit: int = Query(default=10, ge=1, le=500),
+    service: SchedulerUiService = Depends(get_scheduler_service),
+) -> list[DispatchOccurrence]:
+    try:
+        return service.next_dispatches(after, limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
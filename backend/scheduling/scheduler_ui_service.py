@@ -3,19 +3,22 @@ from __future__ import annotations
 import logging
 import json
 import re
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from uuid import uuid4
 from zoneinfo import ZoneInfo
 
 from backend.security.approval_policy import ApprovalContext, ApprovalRecord, enforce_action_approval
 from backend.security.audit_export import append_audit_record
-from backend.security.config_crypto import config_hash, dump_config_json, load_config_json
+from backend.security.config_crypto import config_hash, dump_config_json, loads_config_json
 
+from .dispatch_calendar import DispatchCalendar
 from .observability import emit_scheduler_event
-from .schedule_conflict_detection import detect_schedule_conflicts
+from .schedule_conflict_detection import ScheduleConflictIndex
+from .schedule_snapshot_store import get_snapshot_store
 from .scheduler_models import (
     ConflictType,
+    DispatchOccurrence,
     PreviewRequest,
     ScheduleBlock,
     ScheduleConflict,
@@ -59,9 +62,14 @@ class SchedulerUiService:
         self.audit_log_path = audit_log_path
         self.schedules_path.parent.mkdir(parents=True, exist_ok=True)
         self.audit_log_path.parent.mkdir(parents=True, exist_ok=True)
-        self._cached_envelope: ScheduleEnvelope | None = None
+        # Shared with every other service on the same file: one parse per content change per process.
+        self._snapshots = get_snapshot_store(self.schedules_path)
         self._cached_ui_state: SchedulerUiState | None = None
-        self._last_mtime: float | None = None
+        # Remembers the last evaluated schedule list so edits only recheck the records they touch.
+        self._conflict_index = ScheduleConflictIndex(lambda schedule: self._build_timeline_blocks([schedule]))
+        # Dated occurrences over a rolling horizon; re-expanded per schedule as records change.
+        self._calendar = DispatchCalendar()
+        self._calendar_envelope: ScheduleEnvelope | None = None
 
     def get_ui_state(self) -> SchedulerUiState:
         envelope = self._load_and_migrate()
@@ -72,8 +80,7 @@ class SchedulerUiService:
         if self._cached_ui_state is not None and self._cached_ui_state.schedule_file is envelope:
             return self._cached_ui_state
 
-        timeline = self._build_timeline_blocks(envelope.schedules)
-        conflicts = detect_schedule_conflicts(envelope.schedules, timeline)
+        timeline, conflicts = self._conflict_index.evaluate(envelope.schedules)
 
         state = SchedulerUiState(schedule_file=envelope, timeline_blocks=timeline, conflicts=conflicts)
         self._cached_ui_state = state
@@ -90,13 +97,13 @@ class SchedulerUiService:
         envelope = ScheduleEnvelope(schema_version=2, schedules=schedules)
         self._validate_schema(envelope)
 
-        conflicts = self.validate_schedules(schedules)
+        timeline, conflicts = self._conflict_index.evaluate(schedules)
         if conflicts:
             raise ValueError(self._format_conflict_error(conflicts))
 
         before_hash = self._file_hash(self.schedules_path)
         serialized_payload = dump_config_json(self.schedules_path, envelope.model_dump(mode="json"), indent=2)
-        self.schedules_path.write_text(serialized_payload, encoding="utf-8")
+        self._snapshots.write(envelope, serialized_payload)
         after_hash = config_hash(serialized_payload)
         self._append_security_audit(
             action="ACT-UPDATE-SCHEDULES",
@@ -105,11 +112,12 @@ class SchedulerUiService:
             after_hash=after_hash,
             context=context,
         )
-        timeline = self._build_timeline_blocks(schedules)
 
-        # We don't update cache here immediately because we rely on mtime check in _load_and_migrate
-        # to refresh the data on next read. The file write above changes mtime.
-        return SchedulerUiState(schedule_file=envelope, timeline_blocks=timeline, conflicts=[])
+        # The written envelope is now the store's snapshot, so the next get_ui_state is served from this state.
+        self._calendar.update(schedules)
+        self._calendar_envelope = envelope
+        self._cached_ui_state = SchedulerUiState(schedule_file=envelope, timeline_blocks=timeline, conflicts=[])
+        return self._cached_ui_state
 
     def publish_schedules(
         self,
@@ -136,8 +144,31 @@ class SchedulerUiService:
         }
 
     def validate_schedules(self, schedules: list[ScheduleRecord]) -> list[ScheduleConflict]:
-        timeline = self._build_timeline_blocks(schedules)
-        return detect_schedule_conflicts(schedules, timeline)
+        return self._conflict_index.evaluate(schedules)[1]
+
+    def calendar_occurrences(
+        self, start: datetime | None = None, end: datetime | None = None
+    ) -> list[DispatchOccurrence]:
+        """Dated timeline: occurrences starting in ``[start, end)``, defaulting to the next seven days.
+
+        Bounds must be timezone-aware and ordered; otherwise ``ValueError`` is raised.
+        """
+        start = start or datetime.now(timezone.utc)
+        end = end or start + timedelta(days=7)
+        return self._synced_calendar().between(start, end)
+
+    def active_dispatches(self, at: datetime | None = None) -> list[DispatchOccurrence]:
+        return self._synced_calendar().active_at(at or datetime.now(timezone.utc))
+
+    def next_dispatches(self, after: datetime | None = None, limit: int = 10) -> list[DispatchOccurrence]:
+        return self._synced_calendar().next_after(after or datetime.now(timezone.utc), limit)
+
+    def _synced_calendar(self) -> DispatchCalendar:
+        envelope = self._load_and_migrate()
+        if envelope is not self._calendar_envelope:
+            self._calendar.update(envelope.schedules)
+            self._calendar_envelope = envelope
+        return self._calendar
 
     def template_primitives(self) -> dict[TemplateType, ScheduleTemplatePrimitive]:
         return {
@@ -185,46 +216,14 @@ class SchedulerUiService:
         )
 
     def _load_and_migrate(self) -> ScheduleEnvelope:
-        if not self.schedules_path.exists():
-            envelope = ScheduleEnvelope(schema_version=2, schedules=[])
-            payload = envelope.model_dump(mode="json")
-            self.schedules_path.write_text(dump_config_json(self.schedules_path, payload, indent=2), encoding="utf-8")
-            self._cached_envelope = envelope
-            try:
-                self._last_mtime = self.schedules_path.stat().st_mtime
-            except OSError:
-                self._last_mtime = None
-            return envelope
-
-        try:
-            mtime = self.schedules_path.stat().st_mtime
-            if self._cached_envelope is not None and self._last_mtime == mtime:
-                return self._cached_envelope
-        except OSError as error:
-            logger.warning(
-                "Scheduler schedule file stat failed during cache check.",
-                extra={
-                    "path": str(self.schedules_path),
-                    "operation": "stat",
-                    "error_type": type(error).__name__,
-                    "error_message": str(error),
-                },
-            )
-            emit_scheduler_event(
-                logger,
-                event_name="scheduler.schedule_file.stat.failed",
-                level="warning",
-                message="Schedule file stat failed during cache invalidation; continuing with fallback read path.",
-                metadata={
-                    "path": str(self.schedules_path),
-                    "operation": "stat",
-                    "error_type": type(error).__name__,
-                    "error_message": str(error),
-                },
-            )
-
-        content = self.schedules_path.read_text(encoding="utf-8")
-        raw = load_config_json(self.schedules_path)
+        return self._snapshots.read(
+            self._parse_schedule_file,
+            self._default_schedule_file,
+            on_stat_error=self._log_stat_failure,
+        ).envelope
+
+    def _parse_schedule_file(self, content: str) -> tuple[ScheduleEnvelope, str]:
+        raw = loads_config_json(self.schedules_path, content)
         envelope = ScheduleEnvelope.model_validate(self._migrate_payload(raw))
         self._validate_schema(envelope)
 
@@ -232,19 +231,35 @@ class SchedulerUiService:
         if conflicts:
             raise ValueError(self._format_conflict_error(conflicts))
 
-        # Only write back if the content has changed or we want to enforce formatting/migration
-        serialized = dump_config_json(self.schedules_path, envelope.model_dump(mode="json"), indent=2)
-        # Check if semantic content or formatting differs before writing
-        if serialized != content:
-            self.schedules_path.write_text(serialized, encoding="utf-8")
-
-        self._cached_envelope = envelope
-        try:
-            self._last_mtime = self.schedules_path.stat().st_mtime
-        except OSError:
-            self._last_mtime = None
-
-        return envelope
+        # The store writes this back only if it differs from what is on disk (migration/formatting).
+        return envelope, dump_config_json(self.schedules_path, envelope.model_dump(mode="json"), indent=2)
+
+    def _default_schedule_file(self) -> tuple[ScheduleEnvelope, str]:
+        envelope = ScheduleEnvelope(schema_version=2, schedules=[])
+        return envelope, dump_config_json(self.schedules_path, envelope.model_dump(mode="json"), indent=2)
+
+    def _log_stat_failure(self, error: OSError) -> None:
+        logger.warning(
+            "Scheduler schedule file stat failed during cache check.",
+            extra={
+                "path": str(self.schedules_path),
+                "operation": "stat",
+                "error_type": type(error).__name__,
+                "error_message": str(error),
+            },
+        )
+        emit_scheduler_event(
+            logger,
+            event_name="scheduler.schedule_file.stat.failed",
+            level="warning",
+            message="Schedule file stat failed during cache invalidation; continuing with fallback read path.",
+            metadata={
+                "path": str(self.schedules_path),
+                "operation": "stat",
+                "error_type": type(error).__name__,
+                "error_message": str(error),
+            },
+        )
 
     def _default_approval_context(self) -> ApprovalContext:
         return ApprovalContext(
@@ -292,13 +292,18 @@ def decrypt_config_payload(config_path: Path, payload: Any, *, keys: ConfigKeyMa
 
 
 def load_config_json(config_path: Path, *, keys: ConfigKeyMaterial | None = None) -> Any:
+    return loads_config_json(config_path, config_path.read_text(encoding="utf-8"), keys=keys)
+
+
+def loads_config_json(config_path: Path, content: str, *, keys: ConfigKeyMaterial | None = None) -> Any:
+    """Decode ``content`` already read from ``config_path``; the path only selects the protected fields."""
     resolved_keys = keys
     if resolved_keys is None:
         try:
             resolved_keys = load_key_material()
         except ConfigCryptoKeyError:
             resolved_keys = None
-    payload = json.loads(config_path.read_text(encoding="utf-8"))
+    payload = json.loads(content)
     return decrypt_config_payload(config_path, payload, keys=resolved_keys)
 
 
@@ -0,0 +1,163 @@
+"""Queue-backed structured (JSON) event logging for request-path services.
+
+Callers hand a payload dict to ``StructuredEventEmitter.emit``, which only
+samples, counts and enqueues it; serializing and writing happen on one
+background thread. The queue is bounded and overflow is dropped, so a slow
+log handler can never stall inference.
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+# High-volume events logged once per N occurrences; the emitted payload carries ``sample_every``.
+DEFAULT_SAMPLE_EVERY: dict[str, int] = {
+    "ai_analysis_cache_hit": 20,
+    "ai_analysis_coalesced": 20,
+    "track_analysis_cache_hit": 20,
+}
+
+_QueueItem = tuple[logging.Logger, int, dict[str, Any]] | threading.Event | None
+
+
+class StructuredEventEmitter:
+    def __init__(
+        self,
+        *,
+        max_queue_size: int = 10_000,
+        sample_every: dict[str, int] | None = None,
+    ) -> None:
+        if max_queue_size <= 0:
+            raise ValueError("max_queue_size must be greater than zero")
+        if any(every <= 0 for every in (sample_every or {}).values()):
+            raise ValueError("sample_every values must be greater than zero")
+
+        self._max_queue_size = max_queue_size
+        self._sample_every = dict(DEFAULT_SAMPLE_EVERY if sample_every is None else sample_every)
+        self._queue: queue.SimpleQueue[_QueueItem] = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._occurrences: dict[str, int] = {}
+        self._enqueued = 0
+        self._written = 0
+        self._dropped = 0
+        self._sampled_out = 0
+        self._worker: threading.Thread | None = None
+        self._closed = False
+
+    def emit(self, logger: logging.Logger, payload: dict[str, Any], *, level: int = logging.INFO) -> bool:
+        """Queue ``payload`` for ``logger``; False if it was sampled out, dropped or logging is off.
+
+        The payload is serialized later on the worker thread, so callers must not
+        mutate it after handing it over.
+        """
+        if self._closed or not logger.isEnabledFor(level):
+            return False
+
+        every = self._sample_every.get(payload.get("event", ""), 1)
+        with self._lock:
+            if every > 1:
+                occurrence = self._occurrences.get(payload["event"], 0)
+                self._occurrences[payload["event"]] = occurrence + 1
+                if occurrence % every:
+                    self._sampled_out += 1
+                    return False
+            # qsize() is approximate under concurrency, which is fine for a drop threshold.
+            if self._queue.qsize() >= self._max_queue_size:
+                self._dropped += 1
+                return False
+            self._enqueued += 1
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._drain, name="structured-events", daemon=True)
+                self._worker.start()
+
+        if every > 1:
+            payload["sample_every"] = every
+        self._queue.put((logger, level, payload))
+        return True
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until everything queued before this call has been written."""
+        if self._worker is None:
+            return True
+        marker = threading.Event()
+        self._queue.put(marker)
+        return marker.wait(timeout)
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            worker = self._worker
+        if worker is not None:
+            self._queue.put(None)
+            worker.join(timeout)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "queued": self._queue.qsize(),
+                "max_queue_size": self._max_queue_size,
+                "enqueued": self._enqueued,
+                "written": self._written,
+                "dropped": self._dropped,
+                "sampled_out": self._sampled_out,
+            }
+
+    def _drain(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if isinstance(item, threading.Event):
+                item.set()
+                continue
+            logger, level, payload = item
+            try:
+                logger.log(level, json.dumps(payload, sort_keys=True, default=str))
+            except Exception:  # a broken handler must not kill the writer
+                logging.getLogger(__name__).exception("structured event write failed")
+            with self._lock:
+                self._written += 1
+
+
+class ThrottledSnapshot:
+    """Calls ``read`` at most once per ``interval_seconds`` and serves the cached value in between."""
+
+    def __init__(self, read: Callable[[], dict[str, int]], interval_seconds: float = 5.0) -> None:
+        self._read = read
+        self._interval_seconds = interval_seconds
+        self._lock = threading.Lock()
+        self._value: dict[str, int] | None = None
+        self._read_at = 0.0
+
+    def get(self) -> dict[str, int]:
+        now = time.monotonic()
+        value = self._value
+        if value is not None and now - self._read_at < self._interval_seconds:
+            return value
+        with self._lock:
+            if self._value is None or now - self._read_at >= self._interval_seconds:
+                self._value = self._read()
+                self._read_at = now
+            return self._value
+
+
+_default_emitter: StructuredEventEmitter | None = None
+_default_emitter_lock = threading.Lock()
+
+
+def get_event_emitter() -> StructuredEventEmitter:
+    """Process-wide emitter shared by every service; flushed at interpreter exit."""
+    global _default_emitter
+    with _default_emitter_lock:
+        if _default_emitter is None:
+            _default_emitter = StructuredEventEmitter()
+            atexit.register(_default_emitter.close)
+        return _default_emitter
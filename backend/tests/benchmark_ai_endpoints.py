@@ -0,0 +1,434 @@
+"""In-process latency/throughput benchmark for the AI endpoints.
+
+Drives ``/track-analysis``, ``/host-script`` and ``/generate-playlist`` through
+the ASGI app with httpx (no sockets, no lifespan), against a stub model whose
+latency and failure rate come from a named profile. Each scenario runs on a
+fresh service instance, so cold runs really start with an empty cache.
+
+    python -m backend.tests.benchmark_ai_endpoints --save-baseline bench/ai.json
+    python -m backend.tests.benchmark_ai_endpoints --baseline bench/ai.json
+
+With ``--baseline`` the run exits 1 when any scenario regressed past ``--tolerance``.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import math
+import os
+import platform
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest import mock
+
+import httpx
+
+from backend import ai_api, playlist_api
+from backend.ai_service import AIInferenceService
+from backend.app import app
+from backend.playlist_service import PlaylistGenerationService
+
+BENCHMARK_API_KEY = "benchmark-api-key"
+ENDPOINTS = ("track-analysis", "host-script", "generate-playlist")
+CACHE_SCENARIOS = ("cold", "warm")
+CONCURRENCY_LEVELS = (1, 4, 16, 64, 256)
+# Distinct payloads cycled by warm scenarios; kept under AIInferenceService's default 1000-entry cache.
+WARM_WORKING_SET = 512
+GENRES = ["pop", "rock", "house", "dance", "electronic", "lofi", "ambient", "hip-hop"]
+MOODS = ["uplifting", "energetic", "chill", "dark", "melancholic"]
+
+# Regressions smaller than these are treated as noise regardless of --tolerance.
+_LATENCY_NOISE_FLOOR_MS = 1.0
+_MEMORY_NOISE_FLOOR_KB = 1024.0
+# A drop in the share of ``success`` responses smaller than this is treated as noise.
+_SUCCESS_RATE_NOISE_FLOOR = 0.02
+OUTCOMES = ("success", "degraded", "failed")
+
+
+@dataclass(frozen=True)
+class ModelProfile:
+    """Injected model behaviour: log-normal latency, an optional slow tail, and random failures."""
+
+    median_ms: float
+    sigma: float = 0.0
+    slow_rate: float = 0.0
+    slow_ms: float = 0.0
+    failure_rate: float = 0.0
+
+    def sample(self, rng: random.Random) -> tuple[float, bool]:
+        """Return ``(delay_seconds, fail)`` for one call."""
+        if self.slow_rate and rng.random() < self.slow_rate:
+            delay_ms = self.slow_ms
+        elif self.sigma:
+            delay_ms = rng.lognormvariate(math.log(self.median_ms), self.sigma)
+        else:
+            delay_ms = self.median_ms
+        return delay_ms / 1000, rng.random() < self.failure_rate
+
+
+MODEL_PROFILES = {
+    "instant": ModelProfile(median_ms=0.0),
+    "lognormal": ModelProfile(median_ms=20.0, sigma=0.5, failure_rate=0.01),
+    "heavy-tail": ModelProfile(median_ms=20.0, sigma=0.3, slow_rate=0.02, slow_ms=400.0, failure_rate=0.02),
+}
+
+
+class StubModelError(RuntimeError):
+    pass
+
+
+class StubModelInferenceService(AIInferenceService):
+    """AIInferenceService whose model call waits and fails according to a ``ModelProfile``.
+
+    The heuristic model still builds the result, so responses keep their real shape and size.
+    """
+
+    def __init__(self, profile: ModelProfile, seed: int, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.profile = profile
+        self._rng = random.Random(seed)  # noqa: S311 - reproducible latency injection, not security
+
+    def _invoke_model(self, mode, request):
+        delay, fail = self.profile.sample(self._rng)
+        if delay:
+            time.sleep(delay)
+        if fail:
+            raise StubModelError(f"injected {mode} failure")
+        return super()._invoke_model(mode, request)
+
+    async def _invoke_model_async(self, mode, request):
+        delay, fail = self.profile.sample(self._rng)
+        if delay:
+            await asyncio.sleep(delay)
+        if fail:
+            raise StubModelError(f"injected {mode} failure")
+        return super()._invoke_model(mode, request)
+
+
+def track_analysis_payload(index: int) -> dict:
+    return {
+        "track_id": f"bench-{index}",
+        "metadata": {
+            "title": f"Bench Track {index}",
+            "artist": f"Artist {index % 37}",
+            "genre_hint": GENRES[index % len(GENRES)],
+            "duration_seconds": 150 + index % 240,
+        },
+        "audio_features": {"bpm": 80 + index % 90},
+    }
+
+
+def host_script_payload(index: int) -> dict:
+    return {
+        "message_type": ("intro", "outro", "commentary", "news")[index % 4],
+        "prompt": f"Introduce bench track {index} and tease the next hour",
+        "persona_name": "Nova",
+        "persona_style": "warm late-night",
+        "voice": "alto",
+    }
+
+
+def playlist_payload(index: int, pool_size: int = 200) -> dict:
+    rng = random.Random(index)  # noqa: S311 - reproducible benchmark data, not security
+    tracks = [
+        {
+            "id": f"track_{index}_{i}",
+            "title": f"Track {i}",
+            "artist": f"Artist {rng.randint(0, pool_size // 10)}",
+            "genre": rng.choice(GENRES),
+            "mood": rng.choice(MOODS),
+            "energy": rng.randint(1, 10),
+            "bpm": rng.randint(70, 180),
+            "duration_seconds": rng.randint(120, 420),
+        }
+        for i in range(pool_size)
+    ]
+    return {"tracks": tracks, "desired_count": 12, "start_hour": index % 24, "energy_curve": "build"}
+
+
+PAYLOAD_FACTORIES = {
+    "track-analysis": track_analysis_payload,
+    "host-script": host_script_payload,
+    "generate-playlist": playlist_payload,
+}
+
+
+def resident_memory_kb() -> float | None:
+    """Current resident set size, or None where ``/proc`` is unavailable.
+
+    RSS rather than tracemalloc: tracing every allocation slows the request path
+    several-fold and would distort the latencies measured alongside it.
+    """
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            resident_pages = int(statm.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / 1024
+
+
+def response_outcome(response: httpx.Response) -> str:
+    """``success``, ``degraded`` or ``failed`` for one response, read from its body rather than its HTTP code.
+
+    AI envelopes carry ``status`` (a fallback is ``degraded`` with HTTP 200); playlist
+    envelopes only carry ``success``. Non-2xx and unparseable responses are ``failed``.
+    """
+    if not response.is_success:
+        return "failed"
+    try:
+        body = response.json()
+    except ValueError:
+        return "failed"
+    status = body.get("status") if isinstance(body, dict) else None
+    if status in OUTCOMES:
+        return status
+    return "success" if isinstance(body, dict) and body.get("success") else "failed"
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+async def _drive(
+    client: httpx.AsyncClient,
+    path: str,
+    payloads: list[dict],
+    concurrency: int,
+) -> tuple[list[float], Counter, Counter, float]:
+    """Send every payload with ``concurrency`` workers.
+
+    Returns latencies (s), HTTP status counts, outcome counts (see ``response_outcome``) and wall time.
+    """
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+    outcomes: Counter = Counter()
+    next_index = iter(range(len(payloads)))
+    headers = {"X-API-Key": BENCHMARK_API_KEY}
+
+    async def _worker() -> None:
+        for index in next_index:
+            started = time.perf_counter()
+            response = await client.post(path, json=payloads[index], headers=headers)
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] += 1
+            outcomes[response_outcome(response)] += 1
+            # An in-process cache hit never suspends; yield so one worker cannot monopolize the loop.
+            await asyncio.sleep(0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_worker() for _ in range(min(concurrency, len(payloads)))))
+    return latencies, statuses, outcomes, time.perf_counter() - started
+
+
+def _install_services(endpoint: str, profile: ModelProfile, seed: int) -> StubModelInferenceService | None:
+    if endpoint == "generate-playlist":
+        playlist_api._service = PlaylistGenerationService()
+        return None
+    ai_api._service = StubModelInferenceService(profile, seed)
+    return ai_api._service
+
+
+async def run_scenario(
+    endpoint: str,
+    cache: str,
+    concurrency: int,
+    profile_name: str,
+    *,
+    requests: int | None = None,
+    seed: int = 7,
+) -> dict:
+    """Run one scenario on fresh services and return its summary row.
+
+    ``cold`` sends a distinct payload per request. ``warm`` cycles through at most
+    ``WARM_WORKING_SET`` payloads and sends each once, untimed, beforehand: for track
+    analysis that fills the result cache, for the other endpoints it only warms the code path.
+    """
+    total = requests or max(128, concurrency * 8)
+    factory = PAYLOAD_FACTORIES[endpoint]
+    distinct = total if cache == "cold" else min(total, WARM_WORKING_SET)
+    working_set = [factory(seed * 1_000_003 + index) for index in range(distinct)]
+    payloads = [working_set[index % distinct] for index in range(total)]
+    path = f"/api/v1/ai/{endpoint}"
+    profile = MODEL_PROFILES[profile_name]
+    stub = _install_services(endpoint, profile, seed)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        if cache == "warm":
+            # Warm with an instant, never-failing model so every payload really ends up cached.
+            if stub is not None:
+                stub.profile = MODEL_PROFILES["instant"]
+            await _drive(client, path, working_set, concurrency=16)
+            if stub is not None:
+                stub.profile = profile
+
+        gc.collect()
+        rss_before = resident_memory_kb()
+        latencies, statuses, outcomes, elapsed = await _drive(client, path, payloads, concurrency)
+        gc.collect()
+        rss_after = resident_memory_kb()
+    if stub is not None:
+        stub.close()
+
+    latencies.sort()
+    errors = {str(code): count for code, count in sorted(statuses.items()) if code >= 400}
+    return {
+        "endpoint": endpoint,
+        "cache": cache,
+        "concurrency": concurrency,
+        "model_profile": None if endpoint == "generate-playlist" else profile_name,
+        "requests": total,
+        "errors": errors,
+        # Latencies cover every response; a shed request is fast but not a success.
+        "outcomes": {outcome: outcomes[outcome] for outcome in OUTCOMES},
+        "success_rate": round(outcomes["success"] / total, 4),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "throughput_rps": round(total / elapsed, 1),
+        # RSS can shrink when the allocator returns arenas; only growth is interesting.
+        "memory_growth_kb": None if rss_before is None else round(max(0.0, rss_after - rss_before), 1),
+    }
+
+
+def _scenario_key(row: dict) -> tuple:
+    return row["endpoint"], row["cache"], row["concurrency"], row["model_profile"]
+
+
+def compare_to_baseline(current: list[dict], baseline: list[dict], tolerance: float = 0.25) -> list[str]:
+    """Describe every scenario that got slower, lost throughput or retained more memory than ``tolerance`` allows.
+
+    A scenario also regresses when its share of ``success`` responses drops, so shedding
+    load as ``degraded`` fallbacks cannot pass for a latency win.
+    """
+    previous = {_scenario_key(row): row for row in baseline}
+    regressions = []
+    for row in current:
+        base = previous.get(_scenario_key(row))
+        if base is None:
+            continue
+        label = "{}/{} c={} ({})".format(*_scenario_key(row))
+        for metric in ("p95_ms", "p99_ms"):
+            limit = max(base[metric] * (1 + tolerance), base[metric] + _LATENCY_NOISE_FLOOR_MS)
+            if row[metric] > limit:
+                regressions.append(f"{label}: {metric} {base[metric]} -> {row[metric]}")
+        if "success_rate" in base and row["success_rate"] < base["success_rate"] - _SUCCESS_RATE_NOISE_FLOOR:
+            regressions.append(
+                f"{label}: success_rate {base['success_rate']} -> {row['success_rate']} "
+                f"(outcomes {base['outcomes']} -> {row['outcomes']})"
+            )
+        if row["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{label}: throughput_rps {base['throughput_rps']} -> {row['throughput_rps']}")
+        if row["memory_growth_kb"] is not None and base.get("memory_growth_kb") is not None:
+            limit = max(base["memory_growth_kb"] * (1 + tolerance), base["memory_growth_kb"] + _MEMORY_NOISE_FLOOR_KB)
+            if row["memory_growth_kb"] > limit:
+                regressions.append(
+                    f"{label}: memory_growth_kb {base['memory_growth_kb']} -> {row['memory_growth_kb']}"
+                )
+    return regressions
+
+
+def run_benchmark(
+    endpoints=ENDPOINTS,
+    caches=CACHE_SCENARIOS,
+    concurrency_levels=CONCURRENCY_LEVELS,
+    model_profiles=("lognormal",),
+    requests=None,
+    seed=7,
+):
+    rows = []
+    original_services = (ai_api._service, playlist_api._service)
+    env = {"ROBODJ_SECRET_KEY": BENCHMARK_API_KEY, "ROBODJ_SCHEDULER_API_KEY": BENCHMARK_API_KEY}
+    try:
+        with mock.patch.dict(os.environ, env, clear=False):
+            for endpoint in endpoints:
+                profiles = model_profiles[:1] if endpoint == "generate-playlist" else model_profiles
+                for profile_name in profiles:
+                    for cache in caches:
+                        for concurrency in concurrency_levels:
+                            row = asyncio.run(
+                                run_scenario(
+                                    endpoint,
+                                    cache,
+                                    concurrency,
+                                    profile_name,
+                                    requests=requests,
+                                    seed=seed,
+                                )
+                            )
+                            rows.append(row)
+                            print(
+                                f"[{endpoint}/{cache}/{row['model_profile'] or '-'}] c={concurrency}: "
+                                f"p50 {row['p50_ms']:.1f} ms, p95 {row['p95_ms']:.1f} ms, "
+                                f"p99 {row['p99_ms']:.1f} ms, {row['throughput_rps']:.0f} req/s, "
+                                f"success/degraded/failed "
+                                f"{'/'.join(str(row['outcomes'][outcome]) for outcome in OUTCOMES)}, "
+                                f"errors {sum(row['errors'].values())}, rss growth {row['memory_growth_kb']} KB"
+                            )
+    finally:
+        ai_api._service, playlist_api._service = original_services
+    return rows
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the AI endpoints in-process against a stub model.")
+    parser.add_argument("--endpoints", nargs="+", choices=ENDPOINTS, default=list(ENDPOINTS))
+    parser.add_argument("--cache", nargs="+", choices=CACHE_SCENARIOS, default=list(CACHE_SCENARIOS))
+    parser.add_argument("--concurrency", nargs="+", type=int, default=list(CONCURRENCY_LEVELS))
+    parser.add_argument("--model-profile", nargs="+", choices=sorted(MODEL_PROFILES), default=["lognormal"])
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=None,
+        help="Requests per scenario (default: 8x concurrency, at least 128).",
+    )
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--save-baseline", type=Path, help="Write this run's results to a JSON baseline file.")
+    parser.add_argument("--baseline", type=Path, help="Compare against a previously saved baseline.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression (default: 0.25).")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    rows = run_benchmark(
+        endpoints=tuple(args.endpoints),
+        caches=tuple(args.cache),
+        concurrency_levels=tuple(args.concurrency),
+        model_profiles=tuple(args.model_profile),
+        requests=args.requests,
+        seed=args.seed,
+    )
+
+    if args.save_baseline:
+        args.save_baseline.parent.mkdir(parents=True, exist_ok=True)
+        document = {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "scenarios": rows,
+        }
+        args.save_baseline.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+        print(f"baseline_saved={args.save_baseline}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare_to_baseline(rows, baseline["scenarios"], tolerance=args.tolerance)
+        for regression in regressions:
+            print(f"regression: {regression}")
+        print(f"regressions={len(regressions)}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
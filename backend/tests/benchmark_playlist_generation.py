@@ -0,0 +1,63 @@
+import random
+import statistics
+import time
+
+from backend.playlist_service import (
+    PlaylistGenerationRequest,
+    PlaylistGenerationService,
+    TrackCandidate,
+    np,
+)
+
+GENRES = ["pop", "rock", "house", "dance", "electronic", "lofi", "ambient", "hip-hop"]
+MOODS = ["uplifting", "energetic", "chill", "dark", "melancholic"]
+
+
+def generate_tracks(count, seed=7):
+    rng = random.Random(seed)  # noqa: S311 - reproducible benchmark data, not security
+    return [
+        TrackCandidate(
+            id=f"track_{i}",
+            title=f"Track {i}",
+            artist=f"Artist {rng.randint(0, count // 20)}",
+            genre=rng.choice(GENRES),
+            mood=rng.choice(MOODS),
+            energy=rng.randint(1, 10),
+            bpm=rng.randint(70, 180),
+            duration_seconds=rng.randint(120, 420),
+        )
+        for i in range(count)
+    ]
+
+
+def run_benchmark(pool_sizes=(10_000, 50_000, 100_000), desired_count=100, repeats=3):
+    engines = ["python"]
+    if np is not None:
+        engines.append("numpy")
+
+    for pool_size in pool_sizes:
+        tracks = generate_tracks(pool_size)
+        request = PlaylistGenerationRequest(
+            tracks=tracks,
+            desired_count=desired_count,
+            energy_curve="build",
+            max_bpm_delta=8,
+            target_duration_seconds=desired_count * 420,
+        )
+
+        for engine in engines:
+            service = PlaylistGenerationService(engine=engine)
+            timings = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                service.generate_playlist(request)
+                timings.append(time.perf_counter() - start)
+
+            print(
+                f"[{engine}] {desired_count}-slot playlist over {pool_size} candidates: "
+                f"median {statistics.median(timings) * 1000:.1f} ms, best {min(timings) * 1000:.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,82 @@
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+from backend.scheduling.schedule_conflict_detection import (
+    _format_minutes,
+    detect_schedule_conflicts,
+)
+from backend.scheduling.scheduler_models import (
+    WEEK_DAYS,
+    ContentRef,
+    ScheduleRecord,
+    ScheduleSpec,
+    ScheduleWindow,
+    TimelineBlock,
+    UiState,
+)
+
+CONTENT = [ContentRef(type="script", ref_id="script:top_hour", weight=100)]
+EPOCH = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def generate_station(count, block_rate=0.002, seed=7):
+    """One station: every schedule UTC at priority 50, so dispatch checks see a single group.
+
+    Specs repeat (672 distinct weekly cron slots) with month-long windows spread over
+    five years. Every schedule gets a zero-length timeline block at its cron time, as
+    the scheduler UI builds them; ``block_rate`` of them get a one-hour block instead.
+    """
+    rng = random.Random(seed)  # noqa: S311 - reproducible benchmark data, not security
+    schedules = []
+    timeline = []
+    for index in range(count):
+        minute, hour, weekday = rng.choice((0, 15, 30, 45)), rng.randint(0, 23), rng.randint(0, 6)
+        start = EPOCH + timedelta(days=rng.randint(0, 5 * 365))
+        schedules.append(
+            ScheduleRecord(
+                id=f"sch_{index}",
+                name=f"Show {index}",
+                enabled=True,
+                timezone="UTC",
+                ui_state=UiState.active,
+                priority=50,
+                start_window=ScheduleWindow(value=start.isoformat()),
+                end_window=ScheduleWindow(value=(start + timedelta(days=30)).isoformat()),
+                content_refs=CONTENT,
+                schedule_spec=ScheduleSpec(mode="cron", cron=f"{minute} {hour} * * {(weekday + 1) % 7}"),
+            )
+        )
+        start_minute = hour * 60 + minute
+        end_minute = start_minute + 60 if rng.random() < block_rate else start_minute
+        timeline.append(
+            TimelineBlock(
+                schedule_id=f"sch_{index}",
+                day_of_week=WEEK_DAYS[weekday],
+                start_time=_format_minutes(start_minute),
+                end_time=_format_minutes(end_minute),
+                overnight=end_minute >= 24 * 60,
+                mode_hint="cron",
+            )
+        )
+    return schedules, timeline
+
+
+def run_benchmark(schedule_counts=(5_000, 50_000), repeats=3):
+    for count in schedule_counts:
+        schedules, timeline = generate_station(count)
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            conflicts = detect_schedule_conflicts(schedules, timeline)
+            timings.append(time.perf_counter() - start)
+
+        print(
+            f"{count} schedules ({len(timeline)} blocks): median {statistics.median(timings) * 1000:.1f} ms, "
+            f"best {min(timings) * 1000:.1f} ms, {len(conflicts)} conflicts"
+        )
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,44 @@
+import statistics
+import time
+
+from backend.ai.contracts.track_analysis import TrackAnalysisRequest
+from backend.track_analysis_service import (
+    InMemoryAnalysisCacheStore,
+    TrackAnalysisService,
+)
+
+
+def generate_entries(count):
+    service = TrackAnalysisService(cache_store=InMemoryAnalysisCacheStore(max_entries=1))
+    template = service.analyze(
+        TrackAnalysisRequest(
+            track_id="trk_template",
+            metadata={"title": "Template", "artist": "Bench", "duration_seconds": 210, "genre_hint": "house"},
+        )
+    )
+    return [(f"fingerprint_{i}", template.model_copy(update={"track_id": f"trk_{i}"})) for i in range(count)]
+
+
+def run_benchmark(cache_sizes=(512, 10_000, 100_000), lookups=20_000, repeats=5):
+    for cache_size in cache_sizes:
+        store = InMemoryAnalysisCacheStore(max_entries=cache_size)
+        entries = generate_entries(cache_size)
+        for fingerprint, result in entries:
+            store.set(fingerprint, result)
+        keys = [entries[(i * 7919) % cache_size][0] for i in range(lookups)]
+
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for key in keys:
+                store.get(key)
+            timings.append((time.perf_counter() - start) / lookups)
+
+        print(
+            f"{cache_size} entries: median hit {statistics.median(timings) * 1e6:.2f} us, "
+            f"best {min(timings) * 1e6:.2f} us"
+        )
+
+
+if __name__ == "__main__":
+    run_benchmark()
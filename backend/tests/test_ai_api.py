@@ -1,4 +1,8 @@
+import asyncio
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest import mock
 import logging
 
@@ -6,7 +10,14 @@ import pytest
 from fastapi.testclient import TestClient
 
 from backend.ai.contracts.track_analysis import AnalysisStatus, TrackAnalysisRequest
-from backend.ai_service import AICircuitBreaker, AICircuitOpenError, AIInferenceService, HostScriptRequest
+from backend.ai_service import (
+    AICircuitBreaker,
+    AICircuitOpenError,
+    AIInferenceService,
+    AIServiceError,
+    HostScriptRequest,
+    HostScriptResult,
+)
 from backend.app import app
 
 TEST_API_KEY = os.environ.get("TEST_API_KEY", "valid_api_key_for_testing")
@@ -154,7 +165,7 @@ def test_circuit_breaker_blocks_after_failure() -> None:
     else:
         raise AssertionError("expected circuit open exception")
 
-@mock.patch("backend.ai_api._service.analyze_track")
+@mock.patch("backend.ai_api._service.analyze_track_async")
 def test_track_analysis_circuit_open_error(mock_analyze_track) -> None:
     mock_analyze_track.side_effect = AICircuitOpenError("circuit breaker open")
     client = TestClient(app)
@@ -174,7 +185,7 @@ def test_track_analysis_circuit_open_error(mock_analyze_track) -> None:
     assert response.status_code == 503
     assert response.json()["detail"] == "circuit breaker open"
 
-@mock.patch("backend.ai_api._service.analyze_track")
+@mock.patch("backend.ai_api._service.analyze_track_async")
 def test_track_analysis_service_error(mock_analyze_track) -> None:
     from backend.ai_service import AIServiceError
     mock_analyze_track.side_effect = AIServiceError("service error")
@@ -194,3 +205,522 @@ def test_track_analysis_service_error(mock_analyze_track) -> None:
 
     assert response.status_code == 502
     assert response.json()["detail"] == "service error"
+
+
+def test_prompt_profile_snapshot_reloads_only_when_file_changes(tmp_path, monkeypatch) -> None:
+    import backend.ai_service as ai_service
+
+    config_path = tmp_path / "prompt_variables.json"
+    config_path.write_text('{"version": "v1", "custom_variables": {}}', encoding="utf-8")
+    loads = []
+    real_load = ai_service.load_config_json
+    monkeypatch.setattr(ai_service, "load_config_json", lambda path: loads.append(path) or real_load(path))
+    service = AIInferenceService(prompt_variables_path=config_path)
+
+    first = service._resolve_prompt_profile()
+    assert service._resolve_prompt_profile() is not None
+    assert len(loads) == 1
+    assert first[0] == "v1"
+
+    config_path.write_text('{"version": "v2", "custom_variables": {"station": "DGN"}}', encoding="utf-8")
+    second = service._resolve_prompt_profile()
+
+    assert len(loads) == 2
+    assert second[0] == "v2"
+    assert second[2] != first[2]
+
+
+def test_save_prompt_variables_invalidates_prompt_profile_snapshot(tmp_path) -> None:
+    config_path = tmp_path / "prompt_variables.json"
+    service = AIInferenceService(prompt_variables_path=config_path)
+    assert service._resolve_prompt_profile()[0] == "default"
+
+    service.save_prompt_variables({"version": "v3", "variable_settings": {}, "custom_variables": {}})
+
+    assert service._resolve_prompt_profile()[0] == "v3"
+
+
+def test_timed_out_inference_is_abandoned_and_holds_its_bulkhead_permit() -> None:
+    service = AIInferenceService(timeout_seconds=0.05, bulkhead_limits={"host_script": 1})
+    release = threading.Event()
+
+    def _stuck_invoke(*_args, **_kwargs):
+        release.wait(2)
+        return HostScriptResult(script="late", safety_flags=[])
+
+    service._invoke_model = _stuck_invoke  # type: ignore[method-assign]
+    request = HostScriptRequest(
+        message_type="intro",
+        prompt="bulkhead test",
+        persona_name="DGN",
+        persona_style="neutral",
+        voice="bass",
+    )
+
+    started = time.monotonic()
+    first = service.generate_host_script(request, correlation_id="bulkhead-1")
+    second = service.generate_host_script(request, correlation_id="bulkhead-2")
+    elapsed = time.monotonic() - started
+    gauges = service.inference_gauges()["host_script"]
+    release.set()
+
+    assert first[3] == "degraded"
+    assert second[3] == "degraded"
+    assert elapsed < 0.5
+    assert gauges == {"limit": 1, "in_flight": 1, "queue_depth": 0, "abandoned": 1, "rejected": 1}
+    service.close()
+
+
+def test_inference_metrics_route_reports_bulkhead_gauges() -> None:
+    client = TestClient(app)
+    response = client.get("/api/v1/ai/inference-metrics", headers={"X-API-Key": TEST_API_KEY})
+
+    assert response.status_code == 200
+    assert set(response.json()) == {"track_analysis", "host_script"}
+    assert response.json()["track_analysis"]["limit"] == 8
+
+
+def _analysis_request(idx: int) -> TrackAnalysisRequest:
+    return TrackAnalysisRequest(
+        track_id=f"trk-lru-{idx}",
+        metadata={"title": f"Track {idx}", "artist": "Bytewave", "genre_hint": "house", "duration_seconds": 200},
+        audio_features={"bpm": 120},
+    )
+
+
+def test_analysis_cache_evicts_least_recently_used_by_entry_count() -> None:
+    service = AIInferenceService(cache_max_entries=2)
+
+    service.analyze_track(_analysis_request(1), correlation_id="lru-1")
+    service.analyze_track(_analysis_request(2), correlation_id="lru-2")
+    service.analyze_track(_analysis_request(1), correlation_id="lru-3")
+    service.analyze_track(_analysis_request(3), correlation_id="lru-4")
+
+    assert service.analyze_track(_analysis_request(1), correlation_id="lru-5")[3] is True
+    assert service.analyze_track(_analysis_request(2), correlation_id="lru-6")[3] is False
+    metrics = service.analysis_cache_metrics()
+    assert metrics["size"] == 2
+    assert metrics["hits"] == 2
+    assert metrics["evictions"] == 2
+
+
+def test_analysis_cache_bounds_serialized_bytes_and_expires_entries(monkeypatch) -> None:
+    import backend.ai_service as ai_service
+
+    entry_bytes = len(AIInferenceService()._invoke_model("track_analysis", _analysis_request(1)).model_dump_json())
+    service = AIInferenceService(cache_max_bytes=entry_bytes * 2 + 10, cache_ttl_seconds=30)
+    for idx in range(1, 4):
+        service.analyze_track(_analysis_request(idx), correlation_id=f"bytes-{idx}")
+
+    metrics = service.analysis_cache_metrics()
+    assert metrics["size"] == 2
+    assert metrics["bytes"] <= entry_bytes * 2 + 10
+
+    now = time.monotonic()
+    monkeypatch.setattr(ai_service.time, "monotonic", lambda: now + 31)
+    assert service.analyze_track(_analysis_request(3), correlation_id="bytes-expired")[3] is False
+    assert service.analysis_cache_metrics()["expirations"] == 1
+
+
+def test_degraded_analysis_is_not_cached() -> None:
+    service = AIInferenceService(timeout_seconds=0.05, bulkhead_limits={"track_analysis": 1})
+    calls = []
+    real_invoke = service._invoke_model
+
+    def _counting_invoke(mode, request):
+        calls.append(request.track_id)
+        return real_invoke(mode, request)
+
+    service._invoke_model = _counting_invoke  # type: ignore[method-assign]
+    bulkhead = service._bulkheads["track_analysis"]
+    assert bulkhead.acquire(timeout=0)
+    rejected = service.analyze_track(_analysis_request(1), correlation_id="spike-1")
+    bulkhead.release()
+
+    recovered = service.analyze_track(_analysis_request(1), correlation_id="spike-2")
+
+    assert (rejected[0].track_id, rejected[3], rejected[4]) == ("fallback-track", False, "degraded")
+    assert (recovered[0].track_id, recovered[3], recovered[4]) == ("trk-lru-1", False, "success")
+    assert calls == ["trk-lru-1"]
+    assert service.analysis_cache_metrics()["size"] == 1
+    service.close()
+
+
+def test_concurrent_identical_analyses_share_one_inference() -> None:
+    service = AIInferenceService(timeout_seconds=1.0)
+    real_invoke = service._invoke_model
+    calls = []
+    release = threading.Event()
+
+    def _slow_invoke(mode, request):
+        calls.append(mode)
+        release.wait(1)
+        return real_invoke(mode, request)
+
+    service._invoke_model = _slow_invoke  # type: ignore[method-assign]
+    request = _analysis_request(42)
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        futures = [executor.submit(service.analyze_track, request, f"flight-{idx}") for idx in range(6)]
+        while not calls:
+            time.sleep(0.001)
+        time.sleep(0.05)
+        release.set()
+        outcomes = [future.result() for future in futures]
+
+    assert calls == ["track_analysis"]
+    assert sorted(outcome[3] for outcome in outcomes) == [False] + [True] * 5
+    assert len({outcome[0].model_dump_json() for outcome in outcomes}) == 1
+    assert sum(outcome[2] for outcome in outcomes) == max(outcome[2] for outcome in outcomes)
+    assert service._analysis_in_flight == {}
+
+
+def test_coalesced_followers_receive_the_leaders_failure() -> None:
+    service = AIInferenceService(timeout_seconds=1.0)
+    started = threading.Event()
+    release = threading.Event()
+
+    def _failing_invoke(*_args, **_kwargs):
+        started.set()
+        release.wait(1)
+        raise RuntimeError("model exploded")
+
+    service._invoke_model = _failing_invoke  # type: ignore[method-assign]
+    request = _analysis_request(43)
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        leader = executor.submit(service.analyze_track, request, "fail-leader")
+        started.wait(1)
+        followers = [executor.submit(service.analyze_track, request, f"fail-{idx}") for idx in range(2)]
+        time.sleep(0.05)
+        release.set()
+        for future in [leader, *followers]:
+            with pytest.raises(AIServiceError, match="model exploded"):
+                future.result()
+
+    assert service._analysis_in_flight == {}
+
+
+def test_analyze_tracks_reuses_cache_and_coalesces_duplicates_within_a_batch() -> None:
+    service = AIInferenceService()
+    real_invoke = service._invoke_model
+    calls = []
+
+    def _counting_invoke(mode, request):
+        calls.append(request.track_id)
+        return real_invoke(mode, request)
+
+    service._invoke_model = _counting_invoke  # type: ignore[method-assign]
+    service.analyze_track(_analysis_request(1), correlation_id="warm")
+
+    _, outcomes = service.analyze_tracks(
+        [_analysis_request(1), _analysis_request(2), _analysis_request(2), _analysis_request(3)],
+        correlation_id="batch",
+        max_concurrency=2,
+    )
+
+    assert sorted(calls) == ["trk-lru-1", "trk-lru-2", "trk-lru-3"]
+    assert [outcome[3] for outcome in outcomes] == [True, False, True, False]
+    assert [outcome[0].track_id for outcome in outcomes] == ["trk-lru-1", "trk-lru-2", "trk-lru-2", "trk-lru-3"]
+
+
+def test_async_batch_fan_out_is_capped_at_the_bulkhead_limit() -> None:
+    service = AIInferenceService(timeout_seconds=0.15, bulkhead_limits={"track_analysis": 8})
+    running = []
+    peak = []
+
+    async def _slow_invoke(mode, request):
+        running.append(request.track_id)
+        peak.append(len(running))
+        await asyncio.sleep(0.05)
+        running.remove(request.track_id)
+        return service._invoke_model(mode, request)
+
+    service._invoke_model_async = _slow_invoke  # type: ignore[method-assign]
+
+    _, outcomes = asyncio.run(
+        service.analyze_tracks_async(
+            [_analysis_request(idx) for idx in range(32)], correlation_id="wide-batch", max_concurrency=32
+        )
+    )
+
+    # Four waves of 0.05 s: items queue in the batch, not on the bulkhead against their own timeout.
+    assert [outcome[4] for outcome in outcomes] == ["success"] * 32
+    assert max(peak) == 8
+    assert service.inference_gauges()["track_analysis"]["rejected"] == 0
+
+
+def test_track_analysis_batch_route_reports_per_item_failures() -> None:
+    def _fail_one(mode, request):
+        if request.track_id == "trk-lru-2":
+            raise RuntimeError("model exploded")
+        return AIInferenceService._invoke_model(service, mode, request)
+
+    service = AIInferenceService(circuit_breaker=AICircuitBreaker(failure_threshold=10))
+    service._invoke_model = _fail_one  # type: ignore[method-assign]
+    client = TestClient(app)
+    with mock.patch("backend.ai_api._service", service):
+        response = client.post(
+            "/api/v1/ai/track-analysis:batch",
+            json={"items": [_analysis_request(idx).model_dump(mode="json") for idx in (1, 2, 3)]},
+            headers={"X-Correlation-ID": "corr-batch", "X-API-Key": TEST_API_KEY},
+        )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["correlation_id"], body["succeeded"], body["failed"]) == ("corr-batch", 2, 1)
+    assert [item["status"] for item in body["items"]] == ["success", "failed", "success"]
+    assert body["items"][1]["error"] == "model exploded"
+    assert body["items"][2]["correlation_id"] == "corr-batch:2"
+
+
+def test_async_inference_waits_for_a_permit_then_sheds_and_times_out() -> None:
+    service = AIInferenceService(timeout_seconds=0.05, bulkhead_limits={"host_script": 1})
+
+    async def _stuck_invoke(*_args, **_kwargs):
+        await asyncio.sleep(1)
+
+    service._invoke_model_async = _stuck_invoke  # type: ignore[method-assign]
+    request = HostScriptRequest(
+        message_type="intro",
+        prompt="async bulkhead test",
+        persona_name="DGN",
+        persona_style="neutral",
+        voice="bass",
+    )
+    bulkhead = service._bulkheads["host_script"]
+
+    assert bulkhead.acquire(timeout=0)
+    started = time.monotonic()
+    shed = asyncio.run(service.generate_host_script_async(request, correlation_id="async-1"))
+    waited = time.monotonic() - started
+    bulkhead.release()
+    timed_out = asyncio.run(service.generate_host_script_async(request, correlation_id="async-2"))
+
+    assert (shed[3], timed_out[3]) == ("degraded", "degraded")
+    assert "fallback" in shed[0].safety_flags
+    assert 0.04 <= waited < 0.5
+    assert service.inference_gauges()["host_script"] == {
+        "limit": 1,
+        "in_flight": 0,
+        "queue_depth": 0,
+        "abandoned": 0,
+        "rejected": 1,
+    }
+
+
+def test_async_analyses_run_concurrently_without_threads_and_coalesce() -> None:
+    service = AIInferenceService(timeout_seconds=1.0, bulkhead_limits={"track_analysis": 100})
+    calls = []
+
+    async def _slow_invoke(mode, request):
+        calls.append(request.track_id)
+        await asyncio.sleep(0.1)
+        return service._invoke_model(mode, request)
+
+    service._invoke_model_async = _slow_invoke  # type: ignore[method-assign]
+    requests = [_analysis_request(idx % 100) for idx in range(200)]
+
+    async def _run():
+        return await asyncio.gather(
+            *(service.analyze_track_async(request, f"async-{idx}") for idx, request in enumerate(requests))
+        )
+
+    started = time.monotonic()
+    outcomes = asyncio.run(_run())
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 1.0
+    assert not service._executor._threads
+    assert sorted(calls) == sorted(f"trk-lru-{idx}" for idx in range(100))
+    assert sum(1 for outcome in outcomes if outcome[3]) == 100
+    assert [outcome[0].track_id for outcome in outcomes] == [request.track_id for request in requests]
+    assert service._analysis_in_flight == {}
+
+
+def test_default_async_model_call_runs_off_the_event_loop_and_shares_the_bulkhead() -> None:
+    service = AIInferenceService(timeout_seconds=1.0, bulkhead_limits={"track_analysis": 1})
+    loop_threads = []
+    model_threads = []
+
+    def _slow_invoke(mode, request):
+        model_threads.append(threading.get_ident())
+        time.sleep(0.2)
+        return AIInferenceService._invoke_model(service, mode, request)
+
+    service._invoke_model = _slow_invoke  # type: ignore[method-assign]
+
+    async def _heartbeat():
+        loop_threads.append(threading.get_ident())
+        started = time.monotonic()
+        await asyncio.sleep(0.01)
+        return time.monotonic() - started
+
+    async def _run():
+        return await asyncio.gather(
+            service.analyze_track_async(_analysis_request(1), "offload-1"),
+            service.analyze_track_async(_analysis_request(2), "offload-2"),
+            _heartbeat(),
+        )
+
+    started = time.monotonic()
+    first, second, heartbeat = asyncio.run(_run())
+
+    assert heartbeat < 0.1
+    assert len(model_threads) == 2 and loop_threads[0] not in model_threads
+    # One permit: the second call waits for the first instead of being shed.
+    assert (first[4], second[4]) == ("success", "success")
+    assert time.monotonic() - started >= 0.4
+    assert service.inference_gauges()["track_analysis"]["rejected"] == 0
+
+
+def test_async_timeout_keeps_the_permit_until_the_worker_finishes() -> None:
+    service = AIInferenceService(timeout_seconds=0.05, bulkhead_limits={"track_analysis": 1})
+
+    def _slow_invoke(mode, request):
+        time.sleep(0.3)
+        return AIInferenceService._invoke_model(service, mode, request)
+
+    service._invoke_model = _slow_invoke  # type: ignore[method-assign]
+
+    async def _run():
+        outcome = await service.analyze_track_async(_analysis_request(1), "abandon-1")
+        await asyncio.sleep(0.01)  # let the cancelled attempt observe its cancellation
+        during = service.inference_gauges()["track_analysis"]
+        await asyncio.sleep(0.4)
+        return outcome, during, service.inference_gauges()["track_analysis"]
+
+    outcome, during, after = asyncio.run(_run())
+
+    assert outcome[4] == "degraded"
+    assert (during["in_flight"], during["abandoned"]) == (1, 1)
+    assert after["in_flight"] == 0
+
+
+def test_async_path_shares_the_circuit_breaker() -> None:
+    breaker = AICircuitBreaker(failure_threshold=1, reset_timeout_seconds=60)
+    service = AIInferenceService(circuit_breaker=breaker)
+
+    async def _raise(*_args, **_kwargs):
+        raise RuntimeError("boom")
+
+    service._invoke_model_async = _raise  # type: ignore[method-assign]
+
+    with pytest.raises(AIServiceError, match="boom"):
+        asyncio.run(service.analyze_track_async(_analysis_request(7), correlation_id="async-cb-1"))
+    with pytest.raises(AICircuitOpenError):
+        service.analyze_track(_analysis_request(8), correlation_id="sync-cb-2")
+    assert service._analysis_in_flight == {}
+
+
+def _host_script_request() -> HostScriptRequest:
+    return HostScriptRequest(
+        message_type="intro",
+        prompt="hedging test",
+        persona_name="DGN",
+        persona_style="neutral",
+        voice="bass",
+    )
+
+
+def _warm_latency(service: AIInferenceService, mode: str, seconds: float = 0.01) -> None:
+    for _ in range(50):
+        service._latency[mode].record(seconds)
+
+
+def test_slow_host_script_is_hedged_after_p95_and_hedge_wins() -> None:
+    breaker = AICircuitBreaker(failure_threshold=1)
+    service = AIInferenceService(timeout_seconds=2.0, circuit_breaker=breaker, hedge_modes=("host_script",))
+    _warm_latency(service, "host_script")
+    release = threading.Event()
+    calls = []
+
+    def _first_call_stalls(mode, request):
+        calls.append(mode)
+        if len(calls) == 1:
+            release.wait(2)
+        return AIInferenceService._invoke_model(service, mode, request)
+
+    service._invoke_model = _first_call_stalls  # type: ignore[method-assign]
+    request = _host_script_request()
+
+    started = time.monotonic()
+    result, _latency_ms, cost_usd, status, _ = service.generate_host_script(request, correlation_id="hedge-1")
+    elapsed = time.monotonic() - started
+    release.set()
+
+    assert status == "success"
+    assert "fallback" not in result.safety_flags
+    assert elapsed < 0.5
+    assert cost_usd == round(service._estimate_cost(request) * 2, 6)
+    gauges = service.latency_gauges()["host_script"]
+    assert (gauges["calls"], gauges["hedges"], gauges["hedge_wins"]) == (1, 1, 1)
+    assert breaker.allow()
+    service.close()
+
+
+def test_hedged_call_that_fails_on_both_attempts_counts_one_breaker_failure() -> None:
+    breaker = AICircuitBreaker(failure_threshold=2)
+    service = AIInferenceService(timeout_seconds=2.0, circuit_breaker=breaker, hedge_modes=("host_script",))
+    _warm_latency(service, "host_script")
+
+    def _slow_failure(*_args, **_kwargs):
+        time.sleep(0.1)
+        raise RuntimeError("model exploded")
+
+    service._invoke_model = _slow_failure  # type: ignore[method-assign]
+
+    with pytest.raises(AIServiceError, match="model exploded"):
+        service.generate_host_script(_host_script_request(), correlation_id="hedge-fail")
+
+    assert service.latency_gauges()["host_script"]["hedges"] == 1
+    assert breaker._consecutive_failures == 1
+    assert breaker.allow()
+
+
+def test_async_hedge_cancels_the_losing_attempt() -> None:
+    service = AIInferenceService(timeout_seconds=2.0, hedge_modes=("host_script",))
+    _warm_latency(service, "host_script")
+    calls = []
+    cancelled = []
+
+    async def _first_call_stalls(mode, request):
+        calls.append(mode)
+        if len(calls) == 1:
+            try:
+                await asyncio.sleep(2)
+            except asyncio.CancelledError:
+                cancelled.append(mode)
+                raise
+        return service._invoke_model(mode, request)
+
+    service._invoke_model_async = _first_call_stalls  # type: ignore[method-assign]
+
+    async def _run():
+        outcome = await service.generate_host_script_async(_host_script_request(), correlation_id="hedge-async")
+        await asyncio.sleep(0)
+        return outcome
+
+    started = time.monotonic()
+    _, _, _, status, _ = asyncio.run(_run())
+
+    assert status == "success"
+    assert time.monotonic() - started < 0.5
+    assert cancelled == ["host_script"]
+    assert service.inference_gauges()["host_script"]["in_flight"] == 0
+
+
+def test_adaptive_timeout_tracks_observed_p99() -> None:
+    import backend.ai_service as ai_service
+
+    service = AIInferenceService(timeout_seconds=2.0, adaptive_timeouts=True)
+    assert service.latency_gauges()["host_script"]["timeout_ms"] == 2000
+
+    _warm_latency(service, "host_script")
+    floor_ms = round(ai_service._ADAPTIVE_TIMEOUT_FLOOR_SECONDS * 1000)
+    assert service.latency_gauges()["host_script"]["timeout_ms"] == floor_ms
+
+    _warm_latency(service, "host_script", seconds=0.3)
+    p99 = service._latency["host_script"].quantile(0.99)
+    assert service._timeout_for("host_script") == pytest.approx(p99 * ai_service._ADAPTIVE_TIMEOUT_MULTIPLIER)
+
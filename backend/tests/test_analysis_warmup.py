@@ -0,0 +1,167 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from backend.ai_service import AIInferenceService
+from backend.analysis_warmup import (
+    AnalysisWarmupRunner,
+    AnalysisWarmupTarget,
+    AnalysisWarmupTask,
+    InferenceWarmupTarget,
+    ManifestWarmupSource,
+    TrackAnalysisWarmupTarget,
+    TracksTableWarmupSource,
+    build_startup_warmup,
+)
+from backend.track_analysis_service import SQLiteAnalysisCacheStore, TrackAnalysisService
+
+
+def _create_tracks_db(db_path: Path, count: int) -> None:
+    with sqlite3.connect(db_path) as connection:
+        connection.execute(
+            """
+            CREATE TABLE tracks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT NOT NULL,
+                artist TEXT,
+                album TEXT,
+                genre TEXT,
+                bpm REAL,
+                duration_seconds REAL,
+                file_path TEXT NOT NULL DEFAULT ''
+            )
+            """
+        )
+        connection.executemany(
+            "INSERT INTO tracks (title, artist, album, genre, bpm, duration_seconds) VALUES (?, ?, ?, ?, ?, ?)",
+            [(f"Track {idx}", f"Artist {idx % 7}", None, "house", 118 + idx % 10, 180.0 + idx) for idx in range(count)],
+        )
+        connection.execute("INSERT INTO tracks (title, artist, duration_seconds) VALUES ('No Artist', NULL, 200)")
+
+
+class _StopAfterBatches(AnalysisWarmupTarget):
+    name = "stopper"
+
+    def __init__(self, stop_event: threading.Event, batches: int) -> None:
+        self._stop_event = stop_event
+        self._remaining = batches
+
+    def warm_batch(self, requests):
+        self._remaining -= 1
+        if self._remaining == 0:
+            self._stop_event.set()
+        return [False] * len(requests)
+
+
+def test_warmup_fills_persistent_cache_and_reports_coverage(tmp_path: Path):
+    db_path = tmp_path / "library.db"
+    _create_tracks_db(db_path, 25)
+    service = TrackAnalysisService(cache_store=SQLiteAnalysisCacheStore(tmp_path / "cache.db"))
+    runner = AnalysisWarmupRunner([TrackAnalysisWarmupTarget(service, max_concurrency=4)], batch_size=10)
+
+    first = runner.run(TracksTableWarmupSource(db_path))
+    second = runner.run(TracksTableWarmupSource(db_path))
+    runner.close()
+
+    assert (first.scanned, first.invalid, first.warmed, first.already_cached, first.failed) == (26, 1, 25, 0, 0)
+    assert first.completed and first.coverage == 1.0
+    assert first.tracks_per_second > 0
+    assert (second.warmed, second.already_cached) == (0, 25)
+    assert service.cache_metrics()["size"] == 25
+
+
+def test_warmup_resumes_from_checkpoint_after_being_stopped(tmp_path: Path):
+    db_path = tmp_path / "library.db"
+    _create_tracks_db(db_path, 25)
+    checkpoint_path = tmp_path / "warmup_checkpoint.json"
+    service = TrackAnalysisService()
+    stop_event = threading.Event()
+
+    stopped = AnalysisWarmupRunner(
+        [TrackAnalysisWarmupTarget(service), _StopAfterBatches(stop_event, batches=2)],
+        batch_size=10,
+        checkpoint_path=checkpoint_path,
+    ).run(TracksTableWarmupSource(db_path), stop_event=stop_event)
+
+    assert not stopped.completed
+    assert (stopped.scanned, stopped.last_position) == (20, 20)
+    assert json.loads(checkpoint_path.read_text())["last_position"] == 20
+
+    resumed = AnalysisWarmupRunner(
+        [TrackAnalysisWarmupTarget(service)],
+        batch_size=10,
+        checkpoint_path=checkpoint_path,
+    ).run(TracksTableWarmupSource(db_path))
+
+    assert resumed.completed
+    assert (resumed.resumed_from, resumed.scanned, resumed.invalid, resumed.warmed) == (20, 6, 1, 5)
+
+
+def test_warmup_rate_limit_paces_batches(tmp_path: Path):
+    db_path = tmp_path / "library.db"
+    _create_tracks_db(db_path, 20)
+    runner = AnalysisWarmupRunner(
+        [TrackAnalysisWarmupTarget(TrackAnalysisService())],
+        batch_size=5,
+        rate_limit_per_second=100,
+    )
+
+    started = time.monotonic()
+    report = runner.run(TracksTableWarmupSource(db_path))
+    elapsed = time.monotonic() - started
+
+    assert report.completed
+    # Four batches of five at 100 tracks/sec: the first starts at once, the next three wait 50 ms each.
+    assert elapsed >= 0.15
+    assert report.tracks_per_second <= 150
+
+
+def test_manifest_warmup_fills_inference_cache(tmp_path: Path):
+    manifest = tmp_path / "manifest.jsonl"
+    lines = [
+        json.dumps(
+            {
+                "track_id": f"trk-{idx}",
+                "metadata": {"title": f"Track {idx}", "artist": "Bytewave", "duration_seconds": 200},
+                "audio_features": {"bpm": 120},
+            }
+        )
+        for idx in range(6)
+    ]
+    manifest.write_text("\n".join([*lines, '{"track_id": ""}']) + "\n", encoding="utf-8")
+    service = AIInferenceService()
+
+    report = AnalysisWarmupRunner([InferenceWarmupTarget(service)], batch_size=4).run(ManifestWarmupSource(manifest))
+
+    assert (report.scanned, report.invalid, report.warmed) == (7, 1, 6)
+    assert service.analysis_cache_metrics()["size"] == 6
+    _, first_request = next(ManifestWarmupSource(manifest).iter_items())
+    assert service.analyze_track(first_request, correlation_id="after-warmup")[3] is True
+
+
+def test_inference_warmup_leaves_bulkhead_permits_for_live_requests():
+    service = AIInferenceService(bulkhead_limits={"track_analysis": 8})
+
+    assert InferenceWarmupTarget(service)._max_concurrency == 4
+    assert InferenceWarmupTarget(service, max_concurrency=32)._max_concurrency == 7
+    assert InferenceWarmupTarget(AIInferenceService(bulkhead_limits={"track_analysis": 1}))._max_concurrency == 1
+
+
+def test_startup_warmup_requires_the_persistent_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("ROBODJ_ANALYSIS_WARMUP", "1")
+    monkeypatch.delenv("ROBODJ_TRACK_ANALYSIS_CACHE_DB", raising=False)
+    targets = [TrackAnalysisWarmupTarget(TrackAnalysisService())]
+
+    assert build_startup_warmup(targets) is None
+
+    monkeypatch.setenv("ROBODJ_TRACK_ANALYSIS_CACHE_DB", str(tmp_path / "cache.db"))
+    assert isinstance(build_startup_warmup(targets), AnalysisWarmupTask)
+
+
+def test_runner_requires_a_target():
+    with pytest.raises(ValueError):
+        AnalysisWarmupRunner([])
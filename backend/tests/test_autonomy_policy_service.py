@@ -1,5 +1,6 @@
 import json
 import unittest.mock
+from datetime import datetime, timedelta
 from pathlib import Path
 
 import pytest
@@ -342,3 +343,79 @@ def _test_get_policy_logs_warning_when_stat_fails_and_continues(tmp_path, monkey
         "error_type": "OSError",
         "error_message": "permission denied",
     }
+
+
+def _timed_policy() -> AutonomyPolicy:
+    return AutonomyPolicy.model_validate(
+        {
+            "station_default_mode": "manual_assist",
+            "show_overrides": [{"show_id": "show-1", "mode": "auto_with_human_override"}],
+            "timeslot_overrides": [
+                {
+                    "id": "slot-overnight",
+                    "day_of_week": "sunday",
+                    "start_time": "22:00",
+                    "end_time": "06:00",
+                    "mode": "lights_out_overnight",
+                },
+                {
+                    "id": "slot-news",
+                    "day_of_week": "monday",
+                    "start_time": "09:00",
+                    "end_time": "10:00",
+                    "show_id": "show-2",
+                    "mode": "semi_auto",
+                },
+            ],
+        }
+    )
+
+
+def test_time_based_resolution_uses_minute_table(tmp_path):
+    service = AutonomyPolicyService(
+        policy_path=tmp_path / "autonomy_policy.json",
+        audit_log_path=tmp_path / "audit.jsonl",
+    )
+    service.event_log_path = tmp_path / "scheduler_events.jsonl"
+    service.update_policy(_timed_policy(), enforce_approval=False)
+    monday = datetime(2026, 3, 2)
+
+    overnight = service.resolve_effective_policy(at=monday + timedelta(hours=5, minutes=59))
+    assert (overnight.source, overnight.timeslot_id) == ("timeslot_override", "slot-overnight")
+    assert service.resolve_effective_policy(at=monday + timedelta(hours=6)).source == "station_default"
+
+    news = monday + timedelta(hours=9, minutes=30)
+    assert service.resolve_effective_policy(show_id="show-2", at=news).mode == GlobalMode.semi_auto
+    assert service.resolve_effective_policy(show_id="show-1", at=news).source == "show_override"
+    assert service.resolve_effective_policy(show_id="show-2", timeslot_id="slot-overnight", at=news).mode == (
+        GlobalMode.lights_out_overnight
+    )
+
+    day = service.resolve_many([monday + timedelta(minutes=15 * step) for step in range(96)], show_id="show-2")
+    assert [decision.source for decision in day].count("timeslot_override") == 24 + 4
+    assert {decision.timeslot_id for decision in day} == {"slot-overnight", "slot-news", None}
+
+
+def test_resolution_reuses_compiled_policy_between_refreshes(tmp_path):
+    service = AutonomyPolicyService(
+        policy_path=tmp_path / "autonomy_policy.json",
+        audit_log_path=tmp_path / "audit.jsonl",
+        policy_refresh_seconds=60,
+    )
+    service.event_log_path = tmp_path / "scheduler_events.jsonl"
+    service.update_policy(_timed_policy(), enforce_approval=False)
+
+    with unittest.mock.patch.object(service, "get_policy", wraps=service.get_policy) as get_policy:
+        for _ in range(100):
+            service.resolve_effective_policy(show_id="show-1")
+        get_policy.assert_not_called()
+
+        service.update_policy(
+            AutonomyPolicy(station_default_mode=GlobalMode.full_auto_guardrailed),
+            enforce_approval=False,
+        )
+        assert service.resolve_effective_policy(show_id="show-1").mode == GlobalMode.full_auto_guardrailed
+
+        service.policy_refresh_seconds = 0
+        service.resolve_effective_policy()
+        get_policy.assert_called_once()
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from backend.scheduling.dispatch_calendar import DispatchCalendar
+from backend.scheduling.scheduler_models import (
+    ContentRef,
+    ScheduleRecord,
+    ScheduleSpec,
+    ScheduleWindow,
+    UiState,
+)
+from backend.scheduling.scheduler_ui_service import SchedulerUiService
+
+BASE_CONTENT = [ContentRef(type="script", ref_id="script:top_hour", weight=100)]
+NOW = datetime(2026, 3, 2, 12, 0, tzinfo=timezone.utc)  # a Monday
+
+
+def _schedule(schedule_id: str, spec: ScheduleSpec, *, priority: int = 50, tz: str = "UTC", **fields) -> ScheduleRecord:
+    defaults = {
+        "enabled": True,
+        "ui_state": UiState.active,
+        "start_window": ScheduleWindow(value="2026-01-01T00:00:00Z"),
+        "end_window": ScheduleWindow(value="2026-12-31T23:59:59Z"),
+    }
+    return ScheduleRecord(
+        id=schedule_id,
+        name=f"Show {schedule_id}",
+        timezone=tz,
+        priority=priority,
+        content_refs=BASE_CONTENT,
+        schedule_spec=spec,
+        **{**defaults, **fields},
+    )
+
+
+def _cron(expression: str) -> ScheduleSpec:
+    return ScheduleSpec(mode="cron", cron=expression)
+
+
+def _rrule(rule: str) -> ScheduleSpec:
+    return ScheduleSpec(mode="rrule", rrule=rule)
+
+
+def test_next_after_merges_specs_in_start_order() -> None:
+    calendar = DispatchCalendar(clock=lambda: NOW)
+    calendar.update(
+        [
+            _schedule("sch_cron", _cron("0 9 * * 1-5")),
+            _schedule("sch_once", ScheduleSpec(mode="one_off", run_at="2026-03-03T10:30:00+00:00")),
+            _schedule("sch_rule", _rrule("FREQ=WEEKLY;INTERVAL=1;BYDAY=TU;BYHOUR=7;BYMINUTE=15;BYSECOND=0")),
+        ]
+    )
+
+    upcoming = calendar.next_after(NOW, 5)
+
+    assert [(item.schedule_id, item.starts_at.isoformat()) for item in upcoming] == [
+        ("sch_rule", "2026-03-03T07:15:00+00:00"),
+        ("sch_cron", "2026-03-03T09:00:00+00:00"),
+        ("sch_once", "2026-03-03T10:30:00+00:00"),
+        ("sch_cron", "2026-03-04T09:00:00+00:00"),
+        ("sch_cron", "2026-03-05T09:00:00+00:00"),
+    ]
+    assert upcoming[0].ends_at - upcoming[0].starts_at == timedelta(minutes=60)
+
+
+def test_rrule_keeps_local_wall_clock_across_dst() -> None:
+    calendar = DispatchCalendar(clock=lambda: NOW)
+    calendar.update(
+        [_schedule("sch_ny", _rrule("FREQ=DAILY;BYHOUR=9;BYMINUTE=0;DURATION_MINUTES=30"), tz="America/New_York")]
+    )
+
+    occurrences = calendar.between(NOW, NOW + timedelta(days=10))
+    starts = {item.starts_at.date().isoformat(): item.starts_at.hour for item in occurrences}
+
+    assert starts["2026-03-07"] == 14
+    assert starts["2026-03-09"] == 13
+
+
+def test_active_at_orders_by_priority_and_respects_windows() -> None:
+    calendar = DispatchCalendar(clock=lambda: NOW)
+    calendar.update(
+        [
+            _schedule("sch_low", _rrule("FREQ=DAILY;BYHOUR=11;BYMINUTE=0;DURATION_MINUTES=120"), priority=20),
+            _schedule("sch_high", _rrule("FREQ=DAILY;BYHOUR=11;BYMINUTE=30;DURATION_MINUTES=60"), priority=80),
+            _schedule(
+                "sch_expired",
+                _rrule("FREQ=DAILY;BYHOUR=11;BYMINUTE=0;DURATION_MINUTES=120"),
+                end_window=ScheduleWindow(value="2026-03-01T23:59:59Z"),
+            ),
+            _schedule("sch_paused", _rrule("FREQ=DAILY;BYHOUR=11;DURATION_MINUTES=120"), ui_state=UiState.paused),
+        ]
+    )
+
+    assert [item.schedule_id for item in calendar.active_at(NOW)] == ["sch_high", "sch_low"]
+    assert [item.schedule_id for item in calendar.active_at(NOW + timedelta(minutes=45))] == ["sch_low"]
+    assert calendar.active_at(NOW + timedelta(hours=1)) == []
+
+
+def test_update_reexpands_only_changed_schedules() -> None:
+    calendar = DispatchCalendar(clock=lambda: NOW)
+    schedules = [_schedule(f"sch_{hour}", _cron(f"0 {hour} * * *")) for hour in range(6)]
+
+    assert calendar.update(schedules) == 6
+    assert calendar.update([schedule.model_copy() for schedule in schedules]) == 0
+
+    moved = _schedule("sch_5", _cron("30 5 * * *"))
+    assert calendar.update([*schedules[:4], moved]) == 1
+
+    tomorrow = NOW.replace(hour=0) + timedelta(days=1)
+    occurrences = calendar.between(tomorrow, tomorrow + timedelta(hours=6))
+    assert [(item.schedule_id, item.starts_at.strftime("%H:%M")) for item in occurrences] == [
+        ("sch_0", "00:00"),
+        ("sch_1", "01:00"),
+        ("sch_2", "02:00"),
+        ("sch_3", "03:00"),
+        ("sch_5", "05:30"),
+    ]
+
+
+def test_malformed_rrule_skips_only_that_schedule() -> None:
+    calendar = DispatchCalendar(clock=lambda: NOW)
+    calendar.update(
+        [
+            _schedule("sch_bad", _rrule("FREQ=WEEKLY;BYDAY=MON;BYHOUR=9")),
+            _schedule("sch_good", _rrule("FREQ=WEEKLY;BYDAY=TU;BYHOUR=9")),
+        ]
+    )
+
+    assert [item.schedule_id for item in calendar.next_after(NOW, 2)] == ["sch_good", "sch_good"]
+
+
+def test_horizon_rolls_forward_with_the_clock() -> None:
+    now = [NOW]
+    calendar = DispatchCalendar(horizon=timedelta(days=2), clock=lambda: now[0])
+    calendar.update([_schedule("sch_daily", _cron("0 6 * * *"))])
+
+    with pytest.raises(ValueError, match="outside the dispatch calendar horizon"):
+        calendar.next_after(NOW + timedelta(days=5))
+
+    now[0] = NOW + timedelta(days=5)
+    upcoming = calendar.next_after(now[0], 3)
+
+    assert [item.starts_at.day for item in upcoming] == [8]
+    assert calendar.horizon()[0] == datetime(2026, 3, 6, tzinfo=timezone.utc)
+
+
+def test_service_serves_calendar_from_persisted_schedules(tmp_path) -> None:
+    service = SchedulerUiService(
+        schedules_path=tmp_path / "schedules.json",
+        audit_log_path=tmp_path / "audit.ndjson",
+    )
+    service.update_schedules(
+        [_schedule("sch_morning", _cron("0 9 * * 1"), end_window=ScheduleWindow(value="9999-12-31T23:59:59Z"))]
+    )
+
+    upcoming = service.next_dispatches(limit=2)
+    assert [(item.starts_at.weekday(), item.starts_at.hour) for item in upcoming] == [(0, 9), (0, 9)]
+    assert upcoming[1].starts_at - upcoming[0].starts_at == timedelta(days=7)
+
+    fresh = SchedulerUiService(schedules_path=tmp_path / "schedules.json", audit_log_path=tmp_path / "audit.ndjson")
+    assert fresh.calendar_occurrences() == upcoming[:1]
+
+
+def test_service_calendar_survives_schedule_with_malformed_byday(tmp_path) -> None:
+    service = SchedulerUiService(
+        schedules_path=tmp_path / "schedules.json",
+        audit_log_path=tmp_path / "audit.ndjson",
+    )
+    far_end = ScheduleWindow(value="9999-12-31T23:59:59Z")
+    service.update_schedules(
+        [
+            _schedule("sch_bad", _rrule("FREQ=WEEKLY;BYDAY=MON;BYHOUR=9"), end_window=far_end),
+            _schedule("sch_good", _cron("0 9 * * 1"), end_window=far_end),
+        ]
+    )
+
+    assert [item.schedule_id for item in service.next_dispatches(limit=1)] == ["sch_good"]
+    fresh = SchedulerUiService(schedules_path=tmp_path / "schedules.json", audit_log_path=tmp_path / "audit.ndjson")
+    assert [item.schedule_id for item in fresh.calendar_occurrences()] == ["sch_good"]
+
+
+@pytest.mark.parametrize(
+    ("start", "end"),
+    [
+        (NOW, NOW.replace(tzinfo=None) + timedelta(days=1)),
+        (NOW.replace(tzinfo=None), NOW + timedelta(days=1)),
+        (NOW, NOW - timedelta(hours=1)),
+    ],
+)
+def test_service_rejects_naive_or_reversed_calendar_bounds(tmp_path, start: datetime, end: datetime) -> None:
+    service = SchedulerUiService(schedules_path=tmp_path / "schedules.json", audit_log_path=tmp_path / "audit.ndjson")
+
+    with pytest.raises(ValueError, match="timezone-aware|end must be after start"):
+        service.calendar_occurrences(start, end)
@@ -1,3 +1,4 @@
+import json
 import os
 from unittest import mock
 
@@ -145,3 +146,77 @@ def test_generate_playlist_returns_422_on_infeasible_constraints():
     assert body["data"] is None
     assert body["error"]["code"] == "playlist_constraints_infeasible"
     assert set(body["error"]["blocked_constraints"]) >= {"bpm_delta", "genre_run_length"}
+
+
+def test_stream_playlist_emits_ndjson_entries_and_error_frame():
+    app.dependency_overrides[get_playlist_service] = lambda: PlaylistGenerationService()
+    client = TestClient(app)
+    payload = {
+        "tracks": [
+            {
+                "id": track_id,
+                "title": track_id.title(),
+                "artist": track_id,
+                "genre": "house",
+                "mood": "energetic",
+                "energy": 7,
+                "bpm": bpm,
+                "duration_seconds": 180,
+            }
+            for track_id, bpm in (("a", 100), ("b", 104), ("c", 150))
+        ],
+        "desired_count": 3,
+        "max_bpm_delta": 10,
+        "max_consecutive_same_genre": 3,
+    }
+
+    try:
+        response = client.post(
+            "/api/v1/ai/generate-playlist/stream",
+            json=payload,
+            headers={"X-API-Key": TEST_API_KEY},
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    frames = [json.loads(line) for line in response.text.splitlines()]
+    assert [frame["type"] for frame in frames] == ["entry", "entry", "error"]
+    assert frames[-1]["error"]["code"] == "playlist_constraints_infeasible"
+    assert frames[-1]["error"]["slot"] == 2
+
+
+def test_generate_playlist_batch_returns_item_per_spec():
+    app.dependency_overrides[get_playlist_service] = lambda: PlaylistGenerationService()
+    client = TestClient(app)
+    payload = {
+        "tracks": [
+            {
+                "id": f"track_{idx}",
+                "title": f"Track {idx}",
+                "artist": f"Artist {idx % 4}",
+                "genre": ("house", "pop")[idx % 2],
+                "mood": "energetic",
+                "energy": 3 + idx % 6,
+                "bpm": 118 + idx % 7,
+                "duration_seconds": 180,
+            }
+            for idx in range(24)
+        ],
+        "specs": [{"start_hour": 7, "desired_count": 4}, {"start_hour": 8, "desired_count": 4}],
+    }
+
+    try:
+        response = client.post(
+            "/api/v1/ai/generate-playlist/batch",
+            json=payload,
+            headers={"X-API-Key": TEST_API_KEY},
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [item["start_hour"] for item in items] == [7, 8]
+    assert all(item["success"] and len(item["data"]["entries"]) == 4 for item in items)
@@ -1,6 +1,10 @@
+import random
+
 import pytest
 
 from backend.playlist_service import (
+    PlaylistBatchRequest,
+    PlaylistBatchSpec,
     PlaylistConstraintsInfeasibleError,
     PlaylistGenerationRequest,
     PlaylistGenerationService,
@@ -119,3 +123,202 @@ def test_raises_infeasible_error_with_blocked_constraints():
     assert "genre_run_length" in error.blocked_constraints
     assert error.blocked_counts["bpm_delta"] > 0
     assert error.blocked_counts["genre_run_length"] > 0
+
+
+def test_indexed_candidates_break_score_ties_in_request_order():
+    service = PlaylistGenerationService()
+    request = PlaylistGenerationRequest(
+        tracks=[
+            _track(1, "A", "house", "energetic", 7, 124),
+            _track(2, "B", "house", "energetic", 7, 130),
+            _track(3, "C", "house", "energetic", 7, 118),
+            _track(4, "D", "house", "energetic", 7, 130),
+            _track(5, "E", "house", "energetic", 7, 118),
+        ],
+        desired_count=2,
+        max_bpm_delta=6,
+        max_consecutive_same_genre=3,
+    )
+
+    result = service.generate_playlist(request)
+
+    assert [entry.track_id for entry in result.entries] == ["track_1", "track_2"]
+
+
+def _random_pool(seed: int, count: int) -> list[dict]:
+    rng = random.Random(seed)  # noqa: S311 - reproducible fixture data, not security
+    return [
+        _track(
+            idx,
+            rng.choice(["A", " a ", "B", "C", "D", "E"]),
+            rng.choice(["pop", "Rock", "house", "dance", "lofi"]),
+            rng.choice(["uplifting", "Energetic", "calm"]),
+            rng.randint(1, 10),
+            rng.randint(90, 140),
+            rng.randint(120, 300),
+        )
+        for idx in range(count)
+    ]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_numpy_engine_matches_python_engine(seed: int):
+    pytest.importorskip("numpy")
+    request = PlaylistGenerationRequest(
+        tracks=_random_pool(seed, 200),
+        desired_count=40,
+        start_hour=seed * 5,
+        preferred_genres=["house"] if seed % 2 else [],
+        max_bpm_delta=6,
+        avoid_recent_artist_window=seed % 3,
+        target_duration_seconds=40 * 260,
+    )
+
+    def _run(engine: str) -> str:
+        try:
+            return PlaylistGenerationService(engine=engine).generate_playlist(request).model_dump_json()
+        except PlaylistConstraintsInfeasibleError as exc:
+            return exc.error.model_dump_json()
+
+    assert _run("numpy") == _run("python")
+
+
+def _beam_rescue_tracks() -> list[dict]:
+    return [
+        _track(1, "B", "house", "energetic", 9, 120),
+        _track(2, "C", "pop", "energetic", 8, 120),
+        _track(3, "D", "house", "energetic", 6, 125),
+        _track(4, "E", "house", "energetic", 9, 120),
+    ]
+
+
+def test_beam_strategy_recovers_when_greedy_is_infeasible():
+    service = PlaylistGenerationService()
+    greedy_request = PlaylistGenerationRequest(tracks=_beam_rescue_tracks(), desired_count=4, max_bpm_delta=5)
+    with pytest.raises(PlaylistConstraintsInfeasibleError):
+        service.generate_playlist(greedy_request)
+
+    beam_request = greedy_request.model_copy(update={"strategy": "beam", "beam_width": 2})
+    result = service.generate_playlist(beam_request)
+
+    assert [entry.track_id for entry in result.entries] == ["track_3", "track_1", "track_2", "track_4"]
+
+
+def test_beam_width_one_matches_greedy():
+    service = PlaylistGenerationService(engine="python")
+    request = PlaylistGenerationRequest(tracks=_random_pool(11, 120), desired_count=30, max_bpm_delta=8)
+
+    greedy = service.generate_playlist(request)
+    beam = service.generate_playlist(request.model_copy(update={"strategy": "beam", "beam_width": 1}))
+
+    assert beam == greedy
+
+
+def test_beam_time_budget_still_returns_complete_playlist(monkeypatch):
+    import backend.playlist_service as playlist_service
+
+    clock = iter(range(0, 10_000, 5))
+    monkeypatch.setattr(playlist_service, "monotonic", lambda: next(clock) / 1000)
+    request = PlaylistGenerationRequest(
+        tracks=_random_pool(12, 120),
+        desired_count=30,
+        max_bpm_delta=8,
+        strategy="beam",
+        time_budget_ms=20,
+    )
+
+    result = PlaylistGenerationService().generate_playlist(request)
+
+    assert len(result.entries) == 30
+    assert len({entry.track_id for entry in result.entries}) == 30
+
+
+def test_stream_playlist_yields_entries_then_summary_matching_generate():
+    service = PlaylistGenerationService()
+    request = PlaylistGenerationRequest(tracks=_random_pool(21, 80), desired_count=12, max_bpm_delta=8)
+
+    frames = list(service.stream_playlist(request))
+    result = service.generate_playlist(request)
+
+    assert [frame.type for frame in frames] == ["entry"] * 12 + ["summary"]
+    assert [frame.entry for frame in frames[:-1]] == result.entries
+    assert frames[-1].average_transition_score == result.average_transition_score
+    assert frames[-1].energy_flow_score == result.energy_flow_score
+    assert frames[-1].total_duration_seconds == result.total_duration_seconds
+
+
+def test_stream_playlist_raises_after_entries_already_emitted():
+    service = PlaylistGenerationService()
+    request = PlaylistGenerationRequest(tracks=_beam_rescue_tracks(), desired_count=4, max_bpm_delta=5)
+
+    frames = service.stream_playlist(request)
+    emitted = []
+    with pytest.raises(PlaylistConstraintsInfeasibleError) as exc_info:
+        for frame in frames:
+            emitted.append(frame)
+
+    assert len(emitted) == exc_info.value.error.slot
+    assert all(frame.type == "entry" for frame in emitted)
+
+
+def test_generate_batch_matches_individual_requests_without_carry_over():
+    service = PlaylistGenerationService()
+    tracks = _random_pool(31, 80)
+    batch = PlaylistBatchRequest(
+        tracks=tracks,
+        specs=[
+            PlaylistBatchSpec(start_hour=6, desired_count=8, energy_curve="build"),
+            PlaylistBatchSpec(start_hour=18, desired_count=10, energy_curve="cooldown", preferred_genres=["house"]),
+        ],
+        max_bpm_delta=8,
+        carry_over_separation=False,
+    )
+
+    result = service.generate_batch(batch)
+
+    for spec, item in zip(batch.specs, result.items):
+        expected = service.generate_playlist(
+            PlaylistGenerationRequest(tracks=tracks, max_bpm_delta=8, **spec.model_dump())
+        )
+        assert item.start_hour == spec.start_hour
+        assert item.success
+        assert item.data == expected
+
+
+def test_generate_batch_carries_artist_and_track_separation_across_hours():
+    service = PlaylistGenerationService()
+    batch = PlaylistBatchRequest(
+        tracks=_random_pool(32, 60),
+        specs=[PlaylistBatchSpec(start_hour=hour, desired_count=6, energy_curve="steady") for hour in (8, 9, 10)],
+        avoid_recent_artist_window=2,
+        max_bpm_delta=10,
+    )
+
+    result = service.generate_batch(batch)
+
+    assert all(item.success for item in result.items)
+    for previous, current in zip(result.items, result.items[1:]):
+        tail = previous.data.entries[-2:]
+        opening = current.data.entries[0]
+        assert opening.track_id not in {entry.track_id for entry in tail}
+        assert service._normalize_artist(opening.artist) not in {
+            service._normalize_artist(entry.artist) for entry in tail
+        }
+
+
+def test_generate_batch_reports_infeasible_specs_per_item():
+    service = PlaylistGenerationService()
+    batch = PlaylistBatchRequest(
+        tracks=_beam_rescue_tracks(),
+        specs=[
+            PlaylistBatchSpec(start_hour=12, desired_count=2, energy_curve="steady"),
+            PlaylistBatchSpec(start_hour=13, desired_count=4, energy_curve="steady"),
+        ],
+        max_bpm_delta=5,
+        carry_over_separation=False,
+    )
+
+    result = service.generate_batch(batch)
+
+    assert [item.success for item in result.items] == [True, False]
+    assert result.items[1].error.code == "playlist_constraints_infeasible"
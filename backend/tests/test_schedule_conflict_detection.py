@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta, timezone
+
+from backend.scheduling.schedule_conflict_detection import (
+    _format_minutes,
+    _to_segments,
+    detect_schedule_conflicts,
+)
+from backend.scheduling.scheduler_models import (
+    WEEK_DAYS,
+    ConflictType,
+    ContentRef,
+    ScheduleRecord,
+    ScheduleSpec,
+    ScheduleWindow,
+    TimelineBlock,
+    UiState,
+)
+
+BASE_CONTENT = [ContentRef(type="script", ref_id="script:top_hour", weight=100)]
+EPOCH = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _schedule(schedule_id: str, *, cron: str, priority: int, start_day: int, end_day: int) -> ScheduleRecord:
+    return ScheduleRecord(
+        id=schedule_id,
+        name=f"Show {schedule_id}",
+        enabled=True,
+        timezone="UTC",
+        ui_state=UiState.active,
+        priority=priority,
+        start_window=ScheduleWindow(value=(EPOCH + timedelta(days=start_day)).isoformat()),
+        end_window=ScheduleWindow(value=(EPOCH + timedelta(days=end_day)).isoformat()),
+        content_refs=BASE_CONTENT,
+        schedule_spec=ScheduleSpec(mode="cron", cron=cron),
+    )
+
+
+def _random_station(seed: int, count: int) -> tuple[list[ScheduleRecord], list[TimelineBlock]]:
+    rng = random.Random(seed)  # noqa: S311 - reproducible fixture data, not security
+    schedules = []
+    timeline = []
+    for index in range(count):
+        start_day = rng.randint(0, 30)
+        schedules.append(
+            _schedule(
+                f"sch_{index:03d}",
+                cron=f"{rng.choice((0, 30))} {rng.randint(8, 10)} * * {rng.randint(1, 2)}",
+                priority=rng.choice((40, 50)),
+                start_day=start_day,
+                end_day=start_day + rng.choice((0, 3, 10)),
+            )
+        )
+        start = rng.randrange(0, 24 * 60, 15)
+        end = rng.randrange(0, 24 * 60, 15)
+        timeline.append(
+            TimelineBlock(
+                schedule_id=f"sch_{index:03d}",
+                day_of_week=rng.choice(WEEK_DAYS[:3]),
+                start_time=_format_minutes(start),
+                end_time=_format_minutes(end),
+                overnight=end < start,
+                mode_hint="cron",
+            )
+        )
+    return schedules, timeline
+
+
+def _pairwise_overlap_keys(schedules, timeline) -> list[tuple[str, tuple[str, ...], str]]:
+    """Every-pair reference for the timeline and dispatch detectors."""
+    keys = []
+    names = {schedule.id: schedule.name for schedule in schedules}
+    segments = sorted(
+        ((segment.day_of_week, segment.start_minute, segment.end_minute, segment.schedule_id)
+         for block in timeline for segment in _to_segments(block)),
+    )
+    for index, left in enumerate(segments):
+        for right in segments[index + 1 :]:
+            if left[0] != right[0] or right[1] >= left[2] or left[3] == right[3]:
+                continue
+            message = (
+                f"Overlap on {left[0].title()}: {names[left[3]]} conflicts with {names[right[3]]} during "
+                f"{_format_minutes(right[1])}-{_format_minutes(min(left[2], right[2]))}."
+            )
+            keys.append(("overlap", tuple(sorted((left[3], right[3]))), message))
+
+    for index, left in enumerate(schedules):
+        for right in schedules[index + 1 :]:
+            same_dispatch = (
+                left.effective_priority() == right.effective_priority()
+                and left.effective_schedule_spec() == right.effective_schedule_spec()
+            )
+            overlapping = (
+                left.start_window.value <= right.end_window.value and right.start_window.value <= left.end_window.value
+            )
+            if same_dispatch and overlapping:
+                keys.append(("ambiguous_dispatch", tuple(sorted((left.id, right.id))), ""))
+    return sorted(keys)
+
+
+def test_sweep_matches_pairwise_reference_on_random_stations() -> None:
+    for seed in range(5):
+        schedules, timeline = _random_station(seed, 120)
+
+        conflicts = detect_schedule_conflicts(schedules, timeline)
+
+        found = sorted(
+            (
+                item.conflict_type.value,
+                tuple(item.schedule_ids),
+                item.message if item.conflict_type == ConflictType.overlap else "",
+            )
+            for item in conflicts
+        )
+        assert found == _pairwise_overlap_keys(schedules, timeline)
+        assert conflicts == sorted(
+            conflicts, key=lambda item: (item.conflict_type.value, tuple(item.schedule_ids), item.message)
+        )
+
+
+def test_blocks_touching_at_a_boundary_do_not_overlap_but_windows_do() -> None:
+    schedules = [
+        _schedule("sch_a", cron="0 9 * * 1", priority=50, start_day=0, end_day=5),
+        _schedule("sch_b", cron="0 9 * * 1", priority=50, start_day=5, end_day=9),
+    ]
+    timeline = [
+        TimelineBlock(
+            schedule_id="sch_a", day_of_week="monday", start_time="09:00", end_time="10:00", mode_hint="cron"
+        ),
+        TimelineBlock(
+            schedule_id="sch_b", day_of_week="monday", start_time="10:00", end_time="11:00", mode_hint="cron"
+        ),
+    ]
+
+    conflicts = detect_schedule_conflicts(schedules, timeline)
+
+    assert [(item.conflict_type, item.schedule_ids) for item in conflicts] == [
+        (ConflictType.ambiguous_dispatch, ["sch_a", "sch_b"]),
+    ]
+
+
+def test_overnight_block_overlaps_next_morning() -> None:
+    schedules = [
+        _schedule("sch_late", cron="0 22 * * 1", priority=50, start_day=0, end_day=1),
+        _schedule("sch_early", cron="0 5 * * 2", priority=50, start_day=0, end_day=1),
+    ]
+    timeline = [
+        TimelineBlock(
+            schedule_id="sch_late",
+            day_of_week="monday",
+            start_time="22:00",
+            end_time="06:00",
+            overnight=True,
+            mode_hint="cron",
+        ),
+        TimelineBlock(
+            schedule_id="sch_early", day_of_week="tuesday", start_time="05:00", end_time="07:00", mode_hint="cron"
+        ),
+    ]
+
+    conflicts = detect_schedule_conflicts(schedules, timeline)
+
+    assert [item.message for item in conflicts] == [
+        "Overlap on Tuesday: Show sch_late conflicts with Show sch_early during 05:00-06:00.",
+    ]
+
+
+def test_inverted_window_is_still_checked_for_dispatch_overlap() -> None:
+    valid = _schedule("sch_valid", cron="0 9 * * 1", priority=50, start_day=3, end_day=12)
+    inverted = ScheduleRecord.model_construct(
+        **{
+            **valid.model_dump(),
+            "id": "sch_inverted",
+            "name": "Inverted",
+            "start_window": ScheduleWindow(value=(EPOCH + timedelta(days=10)).isoformat()),
+            "end_window": ScheduleWindow(value=(EPOCH + timedelta(days=5)).isoformat()),
+            "schedule_spec": valid.schedule_spec,
+            "ui_state": UiState.active,
+        }
+    )
+
+    conflicts = detect_schedule_conflicts([valid, inverted], [])
+
+    assert [item.conflict_type for item in conflicts] == [ConflictType.ambiguous_dispatch, ConflictType.invalid_window]
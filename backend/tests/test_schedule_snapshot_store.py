@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from backend.scheduling.schedule_snapshot_store import (
+    ScheduleSnapshotStore,
+    get_snapshot_store,
+)
+from backend.scheduling.scheduler_models import (
+    ContentRef,
+    ScheduleEnvelope,
+    ScheduleRecord,
+    ScheduleSpec,
+    ScheduleWindow,
+    UiState,
+)
+from backend.scheduling.scheduler_ui_service import SchedulerUiService
+
+
+def _schedule(schedule_id: str, cron: str) -> ScheduleRecord:
+    return ScheduleRecord(
+        id=schedule_id,
+        name=f"Show {schedule_id}",
+        enabled=True,
+        timezone="UTC",
+        ui_state=UiState.active,
+        priority=50,
+        start_window=ScheduleWindow(value="2026-01-01T00:00:00Z"),
+        end_window=ScheduleWindow(value="2026-12-31T23:59:59Z"),
+        content_refs=[ContentRef(type="script", ref_id="script:top_hour", weight=100)],
+        schedule_spec=ScheduleSpec(mode="cron", cron=cron),
+    )
+
+
+def _parser(calls: list[str]):
+    def _parse(content: str) -> tuple[ScheduleEnvelope, str]:
+        calls.append(content)
+        return ScheduleEnvelope.model_validate(json.loads(content)), content
+
+    return _parse
+
+
+def _empty() -> tuple[ScheduleEnvelope, str]:
+    return ScheduleEnvelope(schema_version=2, schedules=[]), '{"schema_version": 2, "schedules": []}'
+
+
+def test_services_on_one_file_share_parsed_snapshots(tmp_path) -> None:
+    paths = {"schedules_path": tmp_path / "schedules.json", "audit_log_path": tmp_path / "audit.ndjson"}
+    writer, reader = SchedulerUiService(**paths), SchedulerUiService(**paths)
+    writer.update_schedules([_schedule("sch_a", "0 9 * * 1")])
+
+    with patch.object(reader, "_parse_schedule_file", wraps=reader._parse_schedule_file) as parse:
+        first = reader.get_ui_state()
+        assert reader.get_ui_state() is first
+        parse.assert_not_called()
+
+    assert first.schedule_file is writer.get_ui_state().schedule_file
+    assert get_snapshot_store(tmp_path / "." / "schedules.json") is get_snapshot_store(tmp_path / "schedules.json")
+
+
+def test_store_reparses_only_when_content_changes(tmp_path) -> None:
+    path = tmp_path / "schedules.json"
+    store = ScheduleSnapshotStore(path)
+    calls: list[str] = []
+    created = store.read(_parser(calls), _empty)
+    assert (created.generation, calls) == (1, [])
+
+    content = path.read_text(encoding="utf-8")
+    path.write_text(content, encoding="utf-8")
+    os.utime(path, ns=(1, 1))
+    assert store.read(_parser(calls), _empty) is created
+    assert calls == []
+
+    path.write_text(content.replace("[]", "[ ]"), encoding="utf-8")
+    changed = store.read(_parser(calls), _empty)
+    assert (changed.generation, len(calls)) == (2, 1)
+
+
+def test_failed_parse_keeps_previous_snapshot(tmp_path) -> None:
+    path = tmp_path / "schedules.json"
+    store = ScheduleSnapshotStore(path)
+    snapshot = store.read(_parser([]), _empty)
+
+    path.write_text("{not json", encoding="utf-8")
+    with pytest.raises(json.JSONDecodeError):
+        store.read(_parser([]), _empty)
+
+    assert store.generation == 1
+    path.write_text(snapshot.envelope.model_dump_json(), encoding="utf-8")
+    assert store.read(_parser([]), _empty).generation == 2
+
+
+def test_interrupted_write_leaves_file_and_snapshot_intact(tmp_path) -> None:
+    path = tmp_path / "schedules.json"
+    store = ScheduleSnapshotStore(path)
+    before = store.read(_parser([]), _empty)
+    content = path.read_text(encoding="utf-8")
+
+    with (
+        patch("backend.scheduling.schedule_snapshot_store.os.replace", side_effect=OSError("disk full")),
+        pytest.raises(OSError, match="disk full"),
+    ):
+        store.write(ScheduleEnvelope(schema_version=2, schedules=[_schedule("sch_a", "0 9 * * 1")]), "{}")
+
+    assert path.read_text(encoding="utf-8") == content
+    assert sorted(item.name for item in tmp_path.iterdir()) == ["schedules.json"]
+    assert store.read(_parser([]), _empty) is before
+
+
+def test_writes_keep_the_file_mode_instead_of_mkstemps_0600(tmp_path) -> None:
+    path = tmp_path / "schedules.json"
+    store = ScheduleSnapshotStore(path)
+    store.read(_parser([]), _empty)
+    assert path.stat().st_mode & 0o777 == 0o644
+    path.chmod(0o640)
+
+    store.write(ScheduleEnvelope(schema_version=2, schedules=[_schedule("sch_a", "0 9 * * 1")]), "{}")
+
+    assert path.stat().st_mode & 0o777 == 0o640
@@ -88,6 +88,29 @@ def test_update_schedules_validates_schema_before_write(tmp_path) -> None:
         service.update_schedules([bad])
 
 
+def test_update_schedules_only_rechecks_edited_records(tmp_path) -> None:
+    service = SchedulerUiService(
+        schedules_path=tmp_path / "schedules.json",
+        audit_log_path=tmp_path / "audit.ndjson",
+    )
+    schedules = [_schedule(f"sch_{hour}", f"Show {hour}", cron=f"0 {hour} * * 1") for hour in range(12)]
+    service.update_schedules(schedules)
+
+    with patch.object(service, "_build_timeline_blocks", wraps=service._build_timeline_blocks) as build_blocks:
+        moved = _schedule("sch_11", "Show 11", cron="30 11 * * 2")
+        state = service.update_schedules([*schedules[:11], moved])
+        assert [call.args[0][0].id for call in build_blocks.call_args_list] == ["sch_11"]
+        assert state.timeline_blocks[-1].day_of_week == "tuesday"
+
+        service.get_ui_state()
+        assert build_blocks.call_count == 1
+
+        with pytest.raises(ValueError, match="Cannot save/publish schedules"):
+            service.update_schedules([*schedules[:11], moved, _schedule("sch_12", "Show 12", cron="0 3 * * 1")])
+
+    assert service.validate_schedules([*schedules[:11], moved]) == []
+
+
 
 
 def test_build_timeline_blocks_supports_numeric_cron() -> None:
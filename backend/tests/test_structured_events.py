@@ -0,0 +1,116 @@
+import json
+import logging
+import threading
+import time
+
+from backend.ai.contracts.track_analysis import TrackAnalysisRequest
+from backend.structured_events import StructuredEventEmitter, ThrottledSnapshot
+from backend.track_analysis_service import (
+    InMemoryAnalysisCacheStore,
+    TrackAnalysisService,
+)
+
+
+def _request(idx: int = 1) -> TrackAnalysisRequest:
+    return TrackAnalysisRequest(
+        track_id=f"evt-{idx}",
+        metadata={"title": f"Track {idx}", "artist": "Bytewave", "duration_seconds": 200, "genre_hint": "house"},
+    )
+
+
+def test_emitter_writes_json_payloads_on_background_thread(caplog):
+    emitter = StructuredEventEmitter()
+    logger = logging.getLogger("test.structured_events.write")
+    writer_threads = []
+
+    class _ThreadRecorder(logging.Handler):
+        def emit(self, record):
+            writer_threads.append(threading.current_thread().name)
+
+    logger.addHandler(_ThreadRecorder())
+    with caplog.at_level(logging.INFO, logger=logger.name):
+        assert emitter.emit(logger, {"event": "ai_inference_success", "latency_ms": 12})
+        assert emitter.flush(timeout=2)
+    emitter.close()
+
+    assert json.loads(caplog.records[-1].getMessage()) == {"event": "ai_inference_success", "latency_ms": 12}
+    assert writer_threads == ["structured-events"]
+
+
+def test_emitter_samples_high_volume_events(caplog):
+    emitter = StructuredEventEmitter(sample_every={"ai_analysis_cache_hit": 10})
+    logger = logging.getLogger("test.structured_events.sampling")
+
+    with caplog.at_level(logging.INFO, logger=logger.name):
+        for idx in range(100):
+            emitter.emit(logger, {"event": "ai_analysis_cache_hit", "idx": idx})
+        emitter.emit(logger, {"event": "ai_analysis_cache_miss"})
+        emitter.flush(timeout=2)
+    emitter.close()
+
+    hits = [json.loads(record.getMessage()) for record in caplog.records if "cache_hit" in record.getMessage()]
+    assert [hit["idx"] for hit in hits] == list(range(0, 100, 10))
+    assert all(hit["sample_every"] == 10 for hit in hits)
+    assert emitter.stats()["sampled_out"] == 90
+
+
+def test_emitter_drops_instead_of_blocking_when_queue_is_full():
+    emitter = StructuredEventEmitter(max_queue_size=5)
+    logger = logging.getLogger("test.structured_events.overflow")
+    logger.setLevel(logging.INFO)
+    release = threading.Event()
+
+    class _StuckHandler(logging.Handler):
+        def emit(self, record):
+            release.wait(2)
+
+    handler = _StuckHandler()
+    logger.addHandler(handler)
+    try:
+        started = time.monotonic()
+        accepted = sum(emitter.emit(logger, {"event": "ai_inference_success", "idx": idx}) for idx in range(200))
+        elapsed = time.monotonic() - started
+        stats = emitter.stats()
+    finally:
+        release.set()
+        emitter.close()
+        logger.removeHandler(handler)
+
+    assert elapsed < 0.5
+    assert accepted <= 6
+    assert stats["dropped"] == 200 - accepted
+
+
+def test_throttled_snapshot_reads_at_most_once_per_interval(monkeypatch):
+    from backend import structured_events
+
+    now = 100.0
+    monkeypatch.setattr(structured_events.time, "monotonic", lambda: now)
+    reads = []
+    snapshot = ThrottledSnapshot(lambda: reads.append(now) or {"size": len(reads)}, interval_seconds=5.0)
+
+    assert [snapshot.get()["size"] for _ in range(3)] == [1, 1, 1]
+    now = 105.0
+    assert snapshot.get()["size"] == 2
+    assert reads == [100.0, 105.0]
+
+
+def test_track_analysis_cache_events_share_one_metrics_snapshot(caplog):
+    store = InMemoryAnalysisCacheStore()
+    metrics_calls = []
+    real_metrics = store.metrics
+    store.metrics = lambda: metrics_calls.append(1) or real_metrics()  # type: ignore[method-assign]
+    emitter = StructuredEventEmitter(sample_every={})
+    service = TrackAnalysisService(cache_store=store, event_emitter=emitter, metrics_interval_seconds=60)
+
+    with caplog.at_level(logging.INFO, logger="backend.track_analysis_service"):
+        for _ in range(3):
+            for idx in range(10):
+                service.analyze(_request(idx))
+        emitter.flush(timeout=2)
+    emitter.close()
+
+    events = [json.loads(record.getMessage())["event"] for record in caplog.records]
+    assert events.count("track_analysis_cache_hit") == 20
+    assert events.count("track_analysis_cache_write") == 10
+    assert len(metrics_calls) == 1
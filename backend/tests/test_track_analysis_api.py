@@ -5,9 +5,11 @@ from unittest import mock
 import pytest
 from fastapi.testclient import TestClient
 
-from backend.ai.contracts.track_analysis import AnalysisStatus
+from backend.ai.contracts.track_analysis import AnalysisStatus, TrackAnalysisRequest
 from backend.app import app
 from backend.ai_api import get_legacy_analyze_track_telemetry
+from backend.track_analysis_api import get_track_analysis_service
+from backend.track_analysis_service import InMemoryAnalysisCacheStore, TrackAnalysisService
 
 TEST_API_KEY = os.environ.get("TEST_API_KEY", "valid_api_key_for_testing")
 
@@ -160,3 +162,34 @@ def test_track_analysis_rejects_invalid_api_key() -> None:
         headers={"X-API-Key": "wrong"},
     )
     assert response.status_code == 401
+
+
+def test_track_analysis_service_dependency_is_shared_across_requests() -> None:
+    assert get_track_analysis_service() is get_track_analysis_service()
+
+
+def test_track_analysis_cache_metrics_route_reports_hit_rate() -> None:
+    service = TrackAnalysisService(cache_store=InMemoryAnalysisCacheStore(max_entries=4))
+    request = TrackAnalysisRequest(**_canonical_payload())
+    service.analyze(request)
+    service.analyze(request)
+    app.dependency_overrides[get_track_analysis_service] = lambda: service
+    client = TestClient(app)
+
+    try:
+        unauthorized = client.get("/api/v1/ai/track-analysis/cache-metrics")
+        response = client.get("/api/v1/ai/track-analysis/cache-metrics", headers={"X-API-Key": TEST_API_KEY})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert unauthorized.status_code == 401
+    assert response.status_code == 200
+    assert response.json() == {
+        "size": 1,
+        "max_entries": 4,
+        "hits": 1,
+        "misses": 1,
+        "evictions": 0,
+        "expirations": 0,
+        "hit_rate": 0.5,
+    }
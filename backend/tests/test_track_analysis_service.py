@@ -1,8 +1,16 @@
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 from datetime import datetime, timedelta, timezone
 from unittest.mock import patch
 
 from backend.ai.contracts.track_analysis import AnalysisStatus, TrackAnalysisRequest
-from backend.track_analysis_service import InMemoryAnalysisCacheStore, TrackAnalysisService
+from backend.track_analysis_service import (
+    InMemoryAnalysisCacheStore,
+    SQLiteAnalysisCacheStore,
+    TieredAnalysisCacheStore,
+    TrackAnalysisService,
+)
 
 
 def _request(**overrides: object) -> TrackAnalysisRequest:
@@ -170,3 +178,99 @@ def test_track_analysis_fingerprint_changes_when_schema_or_model_version_changes
 
     assert fingerprint_a != fingerprint_b
     assert fingerprint_a != fingerprint_c
+
+
+def test_in_memory_cache_counts_stay_consistent_across_threads() -> None:
+    store = InMemoryAnalysisCacheStore(max_entries=8)
+    service = TrackAnalysisService(cache_store=store)
+    requests = [
+        _request(
+            track_id=f"trk_thread_{idx % 12}",
+            metadata={"title": f"Thread {idx % 12}", "artist": "Nova", "duration_seconds": 210},
+        )
+        for idx in range(240)
+    ]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(service.analyze, requests))
+
+    assert [result.track_id for result in results] == [request.track_id for request in requests]
+    metrics = store.metrics()
+    assert metrics["hits"] + metrics["misses"] == len(requests)
+    assert metrics["size"] <= 8
+    assert metrics["size"] + metrics["evictions"] <= metrics["misses"]
+
+
+def test_in_memory_cache_purges_in_write_order_and_returns_stored_result(monkeypatch) -> None:
+    baseline = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    store = InMemoryAnalysisCacheStore(ttl_seconds=10, max_entries=10)
+    result = TrackAnalysisService().analyze(_request(track_id="trk_order"))
+
+    monkeypatch.setattr(InMemoryAnalysisCacheStore, "_now", staticmethod(lambda: baseline))
+    store.set("first", result)
+    store.set("second", result)
+    monkeypatch.setattr(InMemoryAnalysisCacheStore, "_now", staticmethod(lambda: baseline + timedelta(seconds=5)))
+    store.set("first", result)
+
+    monkeypatch.setattr(InMemoryAnalysisCacheStore, "_now", staticmethod(lambda: baseline + timedelta(seconds=11)))
+    assert store.get("second") is None
+    assert store.get("first") is result
+    assert store.metrics()["expirations"] == 1
+
+
+def test_sqlite_cache_round_trips_results_between_store_instances(tmp_path) -> None:
+    db_path = tmp_path / "analysis_cache.db"
+    service = TrackAnalysisService(cache_store=SQLiteAnalysisCacheStore(db_path))
+    request = _request(track_id="trk_disk")
+    result = service.analyze(request)
+
+    other_worker = SQLiteAnalysisCacheStore(db_path)
+
+    assert other_worker.get(service._fingerprint(request)) == result
+    assert other_worker.metrics()["hits"] == 1
+    with closing(sqlite3.connect(db_path)) as connection:
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_sqlite_cache_expires_and_evicts_rows(tmp_path, monkeypatch) -> None:
+    baseline = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    store = SQLiteAnalysisCacheStore(tmp_path / "analysis_cache.db", ttl_seconds=10, max_entries=2)
+    result = TrackAnalysisService().analyze(_request(track_id="trk_disk_ttl"))
+
+    for offset, fingerprint in enumerate(("a", "b", "c")):
+        monkeypatch.setattr(
+            SQLiteAnalysisCacheStore, "_now", staticmethod(lambda offset=offset: baseline + timedelta(seconds=offset))
+        )
+        store.set(fingerprint, result)
+    assert store.get("a") is None
+    assert store.get("b") == result
+
+    monkeypatch.setattr(SQLiteAnalysisCacheStore, "_now", staticmethod(lambda: baseline + timedelta(seconds=11)))
+    assert store.get("b") is None
+
+    metrics = store.metrics()
+    assert metrics["evictions"] == 1
+    assert metrics["expirations"] == 1
+    assert metrics["size"] == 1
+
+
+def test_tiered_cache_promotes_disk_hits_into_memory(tmp_path) -> None:
+    db_path = tmp_path / "analysis_cache.db"
+    request = _request(track_id="trk_tiered")
+    writer = TrackAnalysisService(
+        cache_store=TieredAnalysisCacheStore(
+            memory=InMemoryAnalysisCacheStore(),
+            disk=SQLiteAnalysisCacheStore(db_path),
+        )
+    )
+    result = writer.analyze(request)
+
+    memory = InMemoryAnalysisCacheStore()
+    reader = TieredAnalysisCacheStore(memory=memory, disk=SQLiteAnalysisCacheStore(db_path))
+    fingerprint = writer._fingerprint(request)
+
+    assert reader.get(fingerprint) == result
+    assert reader.get(fingerprint) == result
+    metrics = reader.metrics()
+    assert (metrics["hits"], metrics["misses"], metrics["disk_hits"]) == (2, 0, 1)
+    assert memory.metrics()["size"] == 1
@@ -0,0 +1,167 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from backend.playlist_service import (
+    PlaylistCandidateShortageError,
+    PlaylistGenerationRequest,
+    PlaylistGenerationService,
+    TrackLibraryFilter,
+)
+from backend.track_library import (
+    SQLiteTrackLibrary,
+    TrackLibraryError,
+    TrackLibraryStore,
+    UnknownTrackLibraryError,
+)
+
+
+def _create_library(db_path: Path, rows: list[tuple]) -> None:
+    with sqlite3.connect(db_path) as connection:
+        connection.execute(
+            """
+            CREATE TABLE tracks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT NOT NULL,
+                artist TEXT,
+                genre TEXT,
+                mood TEXT,
+                energy REAL,
+                bpm REAL,
+                duration_seconds REAL,
+                file_path TEXT NOT NULL DEFAULT '',
+                updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        connection.executemany(
+            "INSERT INTO tracks (title, artist, genre, mood, energy, bpm, duration_seconds, updated_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+
+def _row(title: str, genre: str, energy: float, bpm: float, updated_at: str = "2026-01-01 00:00:00") -> tuple:
+    return (title, f"{title} Artist", genre, "energetic", energy, bpm, 180.0, updated_at)
+
+
+@pytest.fixture()
+def library_db(tmp_path: Path) -> Path:
+    db_path = tmp_path / "library.db"
+    _create_library(
+        db_path,
+        [
+            _row("One", "house", 7, 124),
+            _row("Two", "house", 8, 126.4),
+            _row("Three", "pop", 6, 120),
+            ("Unusable", "Nobody", None, "calm", 5, 100, 180.0, "2026-01-01 00:00:00"),
+        ],
+    )
+    return db_path
+
+
+def test_snapshot_skips_rows_that_are_not_playlist_eligible(library_db: Path):
+    library = SQLiteTrackLibrary("default", library_db)
+
+    snapshot = library.snapshot()
+
+    assert [track.title for track in snapshot.tracks] == ["One", "Two", "Three"]
+    assert snapshot.tracks[1].bpm == 126
+
+
+def test_snapshot_refreshes_incrementally_on_updated_at(library_db: Path):
+    library = SQLiteTrackLibrary("default", library_db, refresh_interval_seconds=0)
+    first = library.snapshot()
+    assert library.snapshot().version == first.version
+
+    with sqlite3.connect(library_db) as connection:
+        connection.execute("UPDATE tracks SET energy = 9, updated_at = '2026-01-02 00:00:00' WHERE title = 'One'")
+        connection.execute("DELETE FROM tracks WHERE title = 'Three'")
+        connection.execute(
+            "INSERT INTO tracks (title, artist, genre, mood, energy, bpm, duration_seconds, updated_at)"
+            " VALUES ('Four', 'Four Artist', 'dance', 'energetic', 7, 128, 200, '2026-01-02 00:00:00')"
+        )
+
+    second = library.snapshot()
+
+    assert second.version > first.version
+    assert [(track.title, track.energy) for track in second.tracks] == [("One", 9), ("Two", 8), ("Four", 7)]
+
+
+def test_missing_library_database_raises_library_error(tmp_path: Path):
+    store = TrackLibraryStore({"default": SQLiteTrackLibrary("default", tmp_path / "missing.db")})
+
+    with pytest.raises(TrackLibraryError):
+        store.snapshot("default")
+    with pytest.raises(UnknownTrackLibraryError):
+        store.snapshot("other")
+
+
+def test_generate_playlist_from_library_with_filter(library_db: Path):
+    store = TrackLibraryStore({"default": SQLiteTrackLibrary("default", library_db)})
+    service = PlaylistGenerationService(library_store=store)
+    request = PlaylistGenerationRequest(
+        library_id="default",
+        library_filter=TrackLibraryFilter(genres=["HOUSE"]),
+        desired_count=2,
+    )
+
+    result = service.generate_playlist(request)
+
+    assert sorted(entry.title for entry in result.entries) == ["One", "Two"]
+    assert {entry.track_id for entry in result.entries} == {"1", "2"}
+
+
+def test_library_requests_fork_one_pool_per_snapshot_version(library_db: Path):
+    store = TrackLibraryStore({"default": SQLiteTrackLibrary("default", library_db)})
+    service = PlaylistGenerationService(engine="numpy", library_store=store)
+    house = TrackLibraryFilter(genres=["house"])
+
+    unfiltered = service._library_candidates("default", None)
+    filtered = service._library_candidates("default", house)
+
+    assert service._library_candidates("default", None) is unfiltered
+    assert filtered.base_pool is unfiltered.base_pool is not None
+    assert filtered.alive.tolist() == [candidate.genre_lower == "house" for candidate in unfiltered.base_pool._tracks]
+
+    request = PlaylistGenerationRequest(library_id="default", library_filter=house, desired_count=2)
+    first = service.generate_playlist(request)
+    assert service.generate_playlist(request) == first
+    assert sorted(entry.title for entry in first.entries) == ["One", "Two"]
+    assert int(filtered.alive.sum()) == 2
+
+
+def test_library_request_rejects_desired_count_beyond_filtered_tracks(library_db: Path):
+    store = TrackLibraryStore({"default": SQLiteTrackLibrary("default", library_db)})
+    service = PlaylistGenerationService(library_store=store)
+    request = PlaylistGenerationRequest(
+        library_id="default",
+        library_filter=TrackLibraryFilter(genres=["house"]),
+        desired_count=3,
+    )
+
+    with pytest.raises(PlaylistCandidateShortageError, match="exceeds the 2 tracks"):
+        service.generate_playlist(request)
+
+
+def test_request_requires_exactly_one_candidate_source():
+    with pytest.raises(ValueError):
+        PlaylistGenerationRequest(desired_count=1)
+    with pytest.raises(ValueError):
+        PlaylistGenerationRequest(
+            tracks=[
+                {
+                    "id": "a",
+                    "title": "A",
+                    "artist": "A",
+                    "genre": "pop",
+                    "mood": "calm",
+                    "energy": 5,
+                    "bpm": 100,
+                    "duration_seconds": 180,
+                }
+            ],
+            library_id="default",
+            desired_count=1,
+        )
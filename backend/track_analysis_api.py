@@ -5,6 +5,9 @@ Legacy compatibility endpoint: POST /api/v1/ai/analyze-track
 """
 from __future__ import annotations
 
+import os
+from pathlib import Path
+
 from fastapi import APIRouter, Depends
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, ValidationError
@@ -12,7 +15,13 @@ from pydantic import BaseModel, ValidationError
 from backend.ai.contracts.track_analysis import TrackAnalysisRequest, TrackAnalysisResult
 from backend.ai_service import AICircuitOpenError, AIServiceError, AITimeoutError
 from backend.security.auth import verify_api_key
-from backend.track_analysis_service import TrackAnalysisService
+from backend.track_analysis_service import (
+    AnalysisCacheStore,
+    InMemoryAnalysisCacheStore,
+    SQLiteAnalysisCacheStore,
+    TieredAnalysisCacheStore,
+    TrackAnalysisService,
+)
 
 router = APIRouter(prefix="/api/v1/ai", tags=["track-analysis"])
 
@@ -23,6 +32,27 @@ class TrackAnalysisEnvelope(BaseModel):
     data: TrackAnalysisResult | None
     error: str | None
 
+
+class TrackAnalysisCacheMetrics(BaseModel):
+    size: int
+    max_entries: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    hit_rate: float
+    disk_size: int | None = None
+    disk_max_entries: int | None = None
+    disk_hits: int | None = None
+    disk_evictions: int | None = None
+    disk_expirations: int | None = None
+
+    @classmethod
+    def from_store_metrics(cls, metrics: dict[str, int]) -> TrackAnalysisCacheMetrics:
+        lookups = metrics["hits"] + metrics["misses"]
+        return cls(**metrics, hit_rate=round(metrics["hits"] / lookups, 4) if lookups else 0.0)
+
+
 _FAILED_STATUS_CODE_BY_EXCEPTION: dict[str, int] = {
     "TimeoutError": 504,
     "AITimeoutError": 504,
@@ -32,8 +62,22 @@ _FAILED_STATUS_CODE_BY_EXCEPTION: dict[str, int] = {
 }
 
 
+def _build_cache_store() -> AnalysisCacheStore:
+    """Memory-only by default; ROBODJ_TRACK_ANALYSIS_CACHE_DB adds a shared SQLite tier behind it."""
+    memory = InMemoryAnalysisCacheStore(ttl_seconds=900, max_entries=512)
+    db_path = os.environ.get("ROBODJ_TRACK_ANALYSIS_CACHE_DB", "").strip()
+    if not db_path:
+        return memory
+    return TieredAnalysisCacheStore(memory=memory, disk=SQLiteAnalysisCacheStore(Path(db_path)))
+
+
+# One process-wide store so cached analyses survive between requests.
+_cache_store = _build_cache_store()
+_service = TrackAnalysisService(cache_store=_cache_store)
+
+
 def get_track_analysis_service() -> TrackAnalysisService:
-    return TrackAnalysisService()
+    return _service
 
 
 @router.post("/analyze-track", response_model=TrackAnalysisEnvelope)
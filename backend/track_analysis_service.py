@@ -3,9 +3,13 @@ from __future__ import annotations
 import hashlib
 import json
 import logging
+import sqlite3
+import threading
+from contextlib import closing
 from dataclasses import dataclass
 from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
+from pathlib import Path
 
 from backend.ai.contracts.track_analysis import (
     TrackAnalysis,
@@ -18,6 +22,7 @@ from typing import Literal
 
 from pydantic import BaseModel
 
+from backend.structured_events import StructuredEventEmitter, ThrottledSnapshot, get_event_emitter
 
 logger = logging.getLogger(__name__)
 
@@ -71,7 +76,14 @@ class _CacheEntry:
 
 
 class InMemoryAnalysisCacheStore(AnalysisCacheStore):
-    """Process-local cache store for analysis responses."""
+    """Process-local cache store for analysis responses.
+
+    Safe to share between request threads: every read-modify-write of the
+    ordered dicts and counters happens under one lock. Every entry gets the same
+    TTL, so expiry order is write order; ``_expiry_queue`` keeps that order and
+    purges stop at the first live entry. Results are frozen models and are
+    stored and returned without copying.
+    """
 
     def __init__(
         self,
@@ -91,71 +103,274 @@ class InMemoryAnalysisCacheStore(AnalysisCacheStore):
         self._max_entries = max_entries
         self._eviction_policy = eviction_policy
         self._cache: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._expiry_queue: OrderedDict[str, datetime] = OrderedDict()
         self._hits = 0
         self._misses = 0
         self._evictions = 0
         self._expirations = 0
+        self._lock = threading.Lock()
 
     @staticmethod
     def _now() -> datetime:
         return datetime.now(timezone.utc)
 
     def _purge_expired(self, now: datetime) -> None:
-        # Create a list of keys to avoid RuntimeError during iteration
-        expired_keys = [key for key, entry in list(self._cache.items()) if entry.expires_at <= now]
-        for key in expired_keys:
-            # Use pop with a default value to avoid KeyError if already deleted
-            self._cache.pop(key, None)
-        self._expirations += len(expired_keys)
+        while self._expiry_queue:
+            key, expires_at = next(iter(self._expiry_queue.items()))
+            if expires_at > now:
+                break
+            del self._expiry_queue[key]
+            del self._cache[key]
+            self._expirations += 1
 
     def get(self, fingerprint: str) -> TrackAnalysisResult | None:
         now = self._now()
-        self._purge_expired(now)
-        cached_entry = self._cache.get(fingerprint)
-        if cached_entry is None:
-            self._misses += 1
-            return None
+        with self._lock:
+            self._purge_expired(now)
+            cached_entry = self._cache.get(fingerprint)
+            if cached_entry is None:
+                self._misses += 1
+                return None
+
+            self._hits += 1
+            if self._eviction_policy == "lru":
+                self._cache.move_to_end(fingerprint)
+            return cached_entry.value
 
-        self._hits += 1
-        if self._eviction_policy == "lru":
+    def set(self, fingerprint: str, result: TrackAnalysisResult) -> None:
+        now = self._now()
+        with self._lock:
+            self._purge_expired(now)
+
+            expires_at = now + self._ttl
+            self._cache[fingerprint] = _CacheEntry(value=result, expires_at=expires_at)
             self._cache.move_to_end(fingerprint)
-        return cached_entry.value.model_copy(deep=True)
+            self._expiry_queue.pop(fingerprint, None)
+            self._expiry_queue[fingerprint] = expires_at
+
+            while len(self._cache) > self._max_entries:
+                evicted_key, _ = self._cache.popitem(last=False)
+                del self._expiry_queue[evicted_key]
+                self._evictions += 1
+
+    def metrics(self) -> dict[str, int]:
+        now = self._now()
+        with self._lock:
+            self._purge_expired(now)
+            return {
+                "size": len(self._cache),
+                "max_entries": self._max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+            }
+
+
+class SQLiteAnalysisCacheStore(AnalysisCacheStore):
+    """Disk-backed cache store shared by every worker process that opens the same file.
+
+    The database runs in WAL mode so readers never block the single writer.
+    Rows are serialized ``TrackAnalysisResult`` JSON keyed by the request
+    fingerprint. Expired rows are deleted on write; once the table exceeds
+    ``max_entries``, the rows closest to expiry are evicted first. Hit and miss
+    counters are per process.
+    """
+
+    def __init__(self, db_path: Path, *, ttl_seconds: int = 86_400, max_entries: int = 50_000) -> None:
+        if ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be greater than zero")
+        if max_entries <= 0:
+            raise ValueError("max_entries must be greater than zero")
+
+        self._db_path = db_path
+        self._ttl = timedelta(seconds=ttl_seconds)
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._initialize()
+
+    @staticmethod
+    def _now() -> datetime:
+        return datetime.now(timezone.utc)
+
+    def get(self, fingerprint: str) -> TrackAnalysisResult | None:
+        now = self._now().timestamp()
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT payload, expires_at FROM analysis_cache WHERE fingerprint = ?",
+                (fingerprint,),
+            ).fetchone()
+            if row is not None and row["expires_at"] <= now:
+                with connection:
+                    connection.execute(
+                        "DELETE FROM analysis_cache WHERE fingerprint = ? AND expires_at <= ?",
+                        (fingerprint, now),
+                    )
+                self._count(expirations=1)
+                row = None
+
+        if row is None:
+            self._count(misses=1)
+            return None
+        self._count(hits=1)
+        return TrackAnalysisResult.model_validate_json(row["payload"])
 
     def set(self, fingerprint: str, result: TrackAnalysisResult) -> None:
         now = self._now()
-        self._purge_expired(now)
+        with closing(self._connect()) as connection, connection:
+            expired = connection.execute(
+                "DELETE FROM analysis_cache WHERE expires_at <= ?",
+                (now.timestamp(),),
+            ).rowcount
+            connection.execute(
+                """
+                INSERT INTO analysis_cache (fingerprint, payload, created_at, expires_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(fingerprint) DO UPDATE SET
+                    payload = excluded.payload,
+                    created_at = excluded.created_at,
+                    expires_at = excluded.expires_at
+                """,
+                (fingerprint, result.model_dump_json(), now.timestamp(), (now + self._ttl).timestamp()),
+            )
+            evicted = connection.execute(
+                """
+                DELETE FROM analysis_cache WHERE fingerprint IN (
+                    SELECT fingerprint FROM analysis_cache ORDER BY expires_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self._max_entries,),
+            ).rowcount
+        self._count(expirations=expired, evictions=evicted)
 
-        self._cache[fingerprint] = _CacheEntry(value=result.model_copy(deep=True), expires_at=now + self._ttl)
-        self._cache.move_to_end(fingerprint)
+    def metrics(self) -> dict[str, int]:
+        with closing(self._connect()) as connection:
+            (size,) = connection.execute(
+                "SELECT COUNT(*) FROM analysis_cache WHERE expires_at > ?",
+                (self._now().timestamp(),),
+            ).fetchone()
+        with self._lock:
+            return {
+                "size": size,
+                "max_entries": self._max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+            }
+
+    def _count(self, *, hits: int = 0, misses: int = 0, evictions: int = 0, expirations: int = 0) -> None:
+        with self._lock:
+            self._hits += hits
+            self._misses += misses
+            self._evictions += evictions
+            self._expirations += expirations
+
+    def _initialize(self) -> None:
+        self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as connection, connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS analysis_cache (
+                    fingerprint TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+                """
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_analysis_cache_expires_at ON analysis_cache (expires_at)"
+            )
 
-        while len(self._cache) > self._max_entries:
-            try:
-                self._cache.popitem(last=False)
-                self._evictions += 1
-            except KeyError:
-                break
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self._db_path, timeout=5.0)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+
+class TieredAnalysisCacheStore(AnalysisCacheStore):
+    """Memory tier in front of a shared disk tier.
+
+    Misses in memory fall through to disk and disk hits are promoted, so each
+    worker warms its memory tier from results other workers already computed.
+    Writes go to both tiers.
+    """
+
+    def __init__(self, memory: AnalysisCacheStore, disk: AnalysisCacheStore) -> None:
+        self._memory = memory
+        self._disk = disk
+
+    def get(self, fingerprint: str) -> TrackAnalysisResult | None:
+        result = self._memory.get(fingerprint)
+        if result is not None:
+            return result
+        result = self._disk.get(fingerprint)
+        if result is not None:
+            self._memory.set(fingerprint, result)
+        return result
+
+    def set(self, fingerprint: str, result: TrackAnalysisResult) -> None:
+        self._memory.set(fingerprint, result)
+        self._disk.set(fingerprint, result)
 
     def metrics(self) -> dict[str, int]:
-        self._purge_expired(self._now())
+        memory = self._memory.metrics()
+        disk = self._disk.metrics()
+        # A request hits if either tier answers; it only misses once disk misses too.
         return {
-            "size": len(self._cache),
-            "hits": self._hits,
-            "misses": self._misses,
-            "evictions": self._evictions,
-            "expirations": self._expirations,
+            "size": memory["size"],
+            "max_entries": memory["max_entries"],
+            "hits": memory["hits"] + disk["hits"],
+            "misses": disk["misses"],
+            "evictions": memory["evictions"],
+            "expirations": memory["expirations"],
+            "disk_size": disk["size"],
+            "disk_max_entries": disk["max_entries"],
+            "disk_hits": disk["hits"],
+            "disk_evictions": disk["evictions"],
+            "disk_expirations": disk["expirations"],
         }
 
 
 class TrackAnalysisService:
-    def __init__(self, cache_store: AnalysisCacheStore | None = None) -> None:
+    def __init__(
+        self,
+        cache_store: AnalysisCacheStore | None = None,
+        *,
+        event_emitter: StructuredEventEmitter | None = None,
+        metrics_interval_seconds: float = 5.0,
+    ) -> None:
         self._cache_store = cache_store or InMemoryAnalysisCacheStore()
+        self._events = event_emitter or get_event_emitter()
+        # Cache events carry store metrics; reading them purges expired entries (or runs
+        # COUNT(*) on SQLite), so events share one snapshot per interval.
+        self._event_metrics = ThrottledSnapshot(self._cache_store.metrics, metrics_interval_seconds)
+
+    def cache_metrics(self) -> dict[str, int]:
+        return self._cache_store.metrics()
 
     def analyze(self, request: TrackAnalysisRequest) -> TrackAnalysisResult:
+        result, _ = self._analyze(request)
+        return result
+
+    def warm(self, request: TrackAnalysisRequest) -> bool:
+        """Make sure the analysis for ``request`` is cached; True when it had to be computed."""
+        _, computed = self._analyze(request)
+        return computed
+
+    def _analyze(self, request: TrackAnalysisRequest) -> tuple[TrackAnalysisResult, bool]:
         fingerprint = self._fingerprint(request)
         cached_result = self._cache_store.get(fingerprint)
         if cached_result is not None:
             self._log_cache_event(event="track_analysis_cache_hit", fingerprint=fingerprint, request=request)
-            return cached_result
+            return cached_result, False
 
         self._log_cache_event(event="track_analysis_cache_miss", fingerprint=fingerprint, request=request)
         genre = self._resolve_genre(request.metadata.genre_hint)
@@ -186,14 +401,14 @@ class TrackAnalysisService:
             bpm_estimate=bpm_estimate,
             vocal_style=VocalStyle(vocal_style),
             best_for_time=best_for_time,
-            tags=list(profile.tags),
+            tags=profile.tags,
             confidence_score=confidence,
             reasoning=reasoning,
         )
         result = TrackAnalysisResult(track_id=request.track_id, analysis=analysis)
         self._cache_store.set(fingerprint, result)
         self._log_cache_event(event="track_analysis_cache_write", fingerprint=fingerprint, request=request)
-        return result
+        return result, True
 
     @staticmethod
     def _fingerprint(request: TrackAnalysisRequest) -> str:
@@ -212,24 +427,24 @@ class TrackAnalysisService:
         return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
 
     def _log_cache_event(self, *, event: str, fingerprint: str, request: TrackAnalysisRequest) -> None:
-        cache_metrics = self._cache_store.metrics()
-        logger.info(
-            json.dumps(
-                {
-                    "event": event,
-                    "track_id": request.track_id,
-                    "fingerprint": fingerprint,
-                    "model_version": request.model_version,
-                    "prompt_profile_version": request.prompt_profile_version,
-                    "schema_version": request.schema_version,
-                    "cache_size": cache_metrics["size"],
-                    "cache_hits": cache_metrics["hits"],
-                    "cache_misses": cache_metrics["misses"],
-                    "cache_evictions": cache_metrics["evictions"],
-                    "cache_expirations": cache_metrics["expirations"],
-                },
-                sort_keys=True,
-            )
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        cache_metrics = self._event_metrics.get()
+        self._events.emit(
+            logger,
+            {
+                "event": event,
+                "track_id": request.track_id,
+                "fingerprint": fingerprint,
+                "model_version": request.model_version,
+                "prompt_profile_version": request.prompt_profile_version,
+                "schema_version": request.schema_version,
+                "cache_size": cache_metrics["size"],
+                "cache_hits": cache_metrics["hits"],
+                "cache_misses": cache_metrics["misses"],
+                "cache_evictions": cache_metrics["evictions"],
+                "cache_expirations": cache_metrics["expirations"],
+            },
         )
 
 
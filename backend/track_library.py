@@ -0,0 +1,169 @@
+"""Warm, in-process snapshots of the ``tracks`` table for library-backed playlist generation.
+
+Clients name a library instead of POSTing every ``TrackCandidate``; the snapshot is
+validated once when rows change and refreshed incrementally on ``updated_at``.
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+
+from pydantic import ValidationError
+
+from backend.playlist_service import TrackCandidate
+
+DEFAULT_LIBRARY_ID = "default"
+DEFAULT_LIBRARY_DB_PATH = Path("config/robodj_runtime.db")
+
+_SELECT_TRACKS = "SELECT id, title, artist, genre, mood, energy, bpm, duration_seconds, updated_at FROM tracks"
+_SELECT_TRACKS_SINCE = (
+    "SELECT id, title, artist, genre, mood, energy, bpm, duration_seconds, updated_at FROM tracks"
+    " WHERE updated_at >= ?"
+)
+
+
+def resolve_library_db_path() -> Path:
+    """SQLite path from ``ROBODJ_DATABASE_URL`` (``sqlite:///...``), else the runtime default."""
+    database_url = os.environ.get("ROBODJ_DATABASE_URL", "")
+    if database_url.startswith("sqlite:///"):
+        return Path(database_url.removeprefix("sqlite:///"))
+    return DEFAULT_LIBRARY_DB_PATH
+
+
+class TrackLibraryError(RuntimeError):
+    pass
+
+
+class UnknownTrackLibraryError(TrackLibraryError):
+    pass
+
+
+@dataclass(frozen=True)
+class TrackLibrarySnapshot:
+    library_id: str
+    version: int
+    tracks: tuple[TrackCandidate, ...]
+
+
+class SQLiteTrackLibrary:
+    """Playlist-eligible rows of one ``tracks`` table, kept warm between requests.
+
+    Every ``refresh_interval_seconds`` the snapshot re-reads only rows whose
+    ``updated_at`` is at or after the last watermark. Deletions are detected by
+    comparing ``COUNT(*)``/``SUM(id)`` with the ids already seen. Rows that cannot
+    form a valid ``TrackCandidate`` (missing genre, mood, energy, ...) are skipped.
+    """
+
+    def __init__(self, library_id: str, db_path: Path, refresh_interval_seconds: float = 5.0) -> None:
+        self.library_id = library_id
+        self._db_path = db_path
+        self._refresh_interval_seconds = refresh_interval_seconds
+        self._lock = threading.Lock()
+        self._rows: dict[int, TrackCandidate | None] = {}
+        self._watermark: str | None = None
+        self._version = 0
+        self._snapshot: TrackLibrarySnapshot | None = None
+        self._refreshed_at = 0.0
+
+    def snapshot(self) -> TrackLibrarySnapshot:
+        with self._lock:
+            now = time.monotonic()
+            if self._snapshot is not None and now - self._refreshed_at < self._refresh_interval_seconds:
+                return self._snapshot
+            snapshot = self._refresh()
+            self._refreshed_at = now
+            return snapshot
+
+    def _refresh(self) -> TrackLibrarySnapshot:
+        try:
+            with closing(self._connect()) as connection:
+                changed = self._apply_changed_rows(connection)
+                changed = self._drop_deleted_rows(connection) or changed
+        except sqlite3.Error as exc:
+            raise TrackLibraryError(f"Track library '{self.library_id}' is unavailable: {exc}") from exc
+
+        if changed or self._snapshot is None:
+            self._version += 1
+            self._snapshot = TrackLibrarySnapshot(
+                library_id=self.library_id,
+                version=self._version,
+                tracks=tuple(track for _, track in sorted(self._rows.items()) if track is not None),
+            )
+        return self._snapshot
+
+    def _apply_changed_rows(self, connection: sqlite3.Connection) -> bool:
+        # ">=" re-reads rows stamped in the same second as the watermark, which keeps
+        # second-granularity CURRENT_TIMESTAMP values from hiding late writes.
+        if self._watermark is None:
+            rows = connection.execute(_SELECT_TRACKS).fetchall()
+        else:
+            rows = connection.execute(_SELECT_TRACKS_SINCE, (self._watermark,)).fetchall()
+
+        changed = False
+        for row in rows:
+            track = self._row_to_candidate(row)
+            if row["id"] not in self._rows or self._rows[row["id"]] != track:
+                self._rows[row["id"]] = track
+                changed = True
+            if row["updated_at"] is not None and (self._watermark is None or row["updated_at"] > self._watermark):
+                self._watermark = row["updated_at"]
+        return changed
+
+    def _drop_deleted_rows(self, connection: sqlite3.Connection) -> bool:
+        count, id_sum = connection.execute("SELECT COUNT(*), COALESCE(SUM(id), 0) FROM tracks").fetchone()
+        if count == len(self._rows) and id_sum == sum(self._rows):
+            return False
+
+        live_ids = {row[0] for row in connection.execute("SELECT id FROM tracks")}
+        deleted = [track_id for track_id in self._rows if track_id not in live_ids]
+        for track_id in deleted:
+            del self._rows[track_id]
+        return bool(deleted)
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._db_path.exists():
+            raise sqlite3.OperationalError(f"database file not found: {self._db_path}")
+        connection = sqlite3.connect(f"file:{self._db_path}?mode=ro", uri=True)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    @staticmethod
+    def _row_to_candidate(row: sqlite3.Row) -> TrackCandidate | None:
+        energy, bpm, duration = row["energy"], row["bpm"], row["duration_seconds"]
+        if energy is None or bpm is None or duration is None:
+            return None
+        try:
+            return TrackCandidate(
+                id=str(row["id"]),
+                title=row["title"] or "",
+                artist=row["artist"] or "",
+                genre=row["genre"] or "",
+                mood=row["mood"] or "",
+                energy=round(energy),
+                bpm=round(bpm),
+                duration_seconds=round(duration),
+            )
+        except ValidationError:
+            return None
+
+
+class TrackLibraryStore:
+    """Registry of warm track libraries addressable by ``library_id``."""
+
+    def __init__(self, libraries: dict[str, SQLiteTrackLibrary]) -> None:
+        self._libraries = libraries
+
+    @classmethod
+    def from_environment(cls) -> TrackLibraryStore:
+        return cls({DEFAULT_LIBRARY_ID: SQLiteTrackLibrary(DEFAULT_LIBRARY_ID, resolve_library_db_path())})
+
+    def snapshot(self, library_id: str) -> TrackLibrarySnapshot:
+        library = self._libraries.get(library_id)
+        if library is None:
+            raise UnknownTrackLibraryError(f"Unknown track library '{library_id}'")
+        return library.snapshot()